@@ -8,12 +8,14 @@ See http://www.gnu.org/licenses/gpl-3.0.html
 '''
 import pygame
 import sys
-#import math   # Un-comment if needed
+import math
 import random
 
 # -- Game classes ------------------------------------------------------
+import pygame_template_bootstrap as bootstrap
 import pygame_template_colors as color
 import pygame_template_objects as objects
+import pygame_template_log as gamelog
 
 # -- Game window properties --------------------------------------------
 DISPLAY_WIDTH = 800           # pixels
@@ -22,9 +24,15 @@ WINDOW_TITLE = 'Detecting and handling collisions'
 SCREEN_BG_COLOR = color.black # From pygame_template_colors.py
 FPS = 60                      # Frames per second
 
+# -- Logging -----------------------------------------------------------
+# Set the environment variable PYGAME_TEMPLATE_LOG=DEBUG to log the events
+log = gamelog.setup()
+event_log = gamelog.GameEventLog()
+
 # -- Preparing game window ---------------------------------------------
+# Start only the pygame subsystems the game uses, faster than pygame.init()
 # https://www.pygame.org/docs/ref/display.html?highlight=init#pygame.display.init
-pygame.init() 
+bootstrap.init('display')
 # https://www.pygame.org/docs/ref/time.html#pygame.time.Clock
 clock = pygame.time.Clock() 
 # https://www.pygame.org/docs/ref/display.html#pygame.display.set_mode
@@ -36,7 +44,9 @@ running = True # The program will run as long as this variable is true
 
 # -- Preparing game objects --------------------------------------------
 NUM_DISCS = 6
-discs = pygame.sprite.Group()
+discs = objects.GameSpatialGroup(cell_size=64) # grid broadphase for collide()
+# Disc color is a function of mass, from blue (1) to white (10, most massive)
+mass_colors = color.GamePalette.gradient([(25, 25, 255), (250, 250, 255)], 10)
 c = 0
 while c < NUM_DISCS:
     x = random.randint(0, 700) # x start pos
@@ -44,14 +54,16 @@ while c < NUM_DISCS:
     dx = random.randint(-2, 2) # initial speed in x direction
     dy = random.randint(-2, 2) # initial speed in y direction
     m = random.randint(1, 10)  # mass
-    color = (m*25, m*25, 255)  # color is a function of mass (white is most massive)
-    d = objects.GameCircle(radius=25, fill=color, top=y, left=x, dx=dx, dy=dy, mass=m)
+    fill = mass_colors[mass_colors.lookup(m, 1, 10)] # (red, green, blue)
+    d = objects.GameCircle(radius=25, fill=fill, top=y, left=x, dx=dx, dy=dy, mass=m)
     if not d.collide(discs): # Making sure that we don't create overlapping discs
         discs.add(d)
         c += 1
 
 NUM_SPIDERS = 25
-spiders = pygame.sprite.Group()
+SPIDER_SCALE = 0.1
+objects.image_cache.preload(['spider.png']) # decode the image file once
+spiders = objects.GameSweepGroup() # sweep and prune broadphase
 c = 0
 while c < NUM_SPIDERS:
     # Creating spiders with random start position and random speed/direction
@@ -59,10 +71,16 @@ while c < NUM_SPIDERS:
     y = random.randint(0, 500) # y start pos
     dx = random.randint(-3, 3) # initial speed in x direction
     dy = random.randint(-3, 3) # initial speed in y direction
-    s = objects.GameImage(imagefile='spider.png', scale=0.1, top=y, left=x, dx=dx, dy=dy)
+    s = objects.GameImage(imagefile='spider.png', scale=SPIDER_SCALE, top=y, left=x, dx=dx, dy=dy)
     if not s.collide(spiders): # Making sure that we don't create overlapping spiders
         spiders.add(s)
         c += 1
+# Rotate the spider image to every direction once, spiders turn every frame
+width, height = objects.image_cache.load('spider.png').get_size()
+objects.image_cache.precompute('spider.png', (int(width * SPIDER_SCALE), 
+                                              int(height * SPIDER_SCALE)))
+
+batch = objects.GameRenderBatch() # draws both groups with one blits call
 
 while running: # Main loop
     for event in pygame.event.get(): # https://www.pygame.org/docs/ref/event.html
@@ -70,54 +88,44 @@ while running: # Main loop
             running = False # Exiting the main loop
         elif event.type == pygame.KEYDOWN:
             key = pygame.key.get_pressed()
-            print('Key pressed: ', key)
+            log.debug('Key pressed: %s', key)
         elif event.type == pygame.KEYUP:
-            print('Key released')
+            log.debug('Key released')
         elif event.type == pygame.MOUSEMOTION:
             mouse = pygame.mouse.get_pos()
-            print('Mouse pos: ', mouse)
+            event_log.log(event, 'Mouse pos') # summed up once a second
         elif event.type == pygame.MOUSEBUTTONUP:
-            print('Mouse button released')
+            log.debug('Mouse button released')
         else:
-            print('Unhandled event', event)
+            event_log.log(event, 'Unhandled event')
 
     screen.fill(SCREEN_BG_COLOR)  # Blanking the screen
 
     # -- Implement game code here --------------------------------------
-    for d in discs: # Loop through all disks to find collisions
+    for d in discs: # Loop through all disks to find window edge collisions
         if d.collide_horiz_window_edge(DISPLAY_HEIGHT):
             d.dy *= -1 # Hit top/bottom window edge, flip horiz direction
         if d.collide_vert_window_edge(DISPLAY_WIDTH):
             d.dx *= -1 # Hit left/right window edge, flip vert direction
-        discs.remove(d)  # remove disc from group
-        d.collide(discs, circle=True) # check for collision with objects in group
-        disc_hits = d.collide(discs, circle=True) # check for collision with objects in group
-        if disc_hits:
-            d.rewind()
-            disc_hits[0].rewind()
-            d.transfer_momentum(disc_hits[0])
-        discs.add(d)     # add disc back into group
+    discs.resolve_contacts(circle=True) # bounce each colliding pair once
     discs.update()
 
-    for s in spiders: # Loop through all spiders to find collisions
+    for s in spiders: # Loop through all spiders to find window edge collisions
         if s.collide_horiz_window_edge(DISPLAY_HEIGHT):
             s.dy *= -1 # Hit top/bottom window edge, flip horiz direction
         if s.collide_vert_window_edge(DISPLAY_WIDTH):
             s.dx *= -1 # Hit left/right window edge, flip vert direction
-        spiders.remove(s)  # remove spider from group
-        spider_hits = s.collide(spiders, ratio=0.6) # check for collision with objects in group
-        if spider_hits:
-            s.rewind()
-            spider_hits[0].rewind()
-            s.transfer_momentum(spider_hits[0])
-        spiders.add(s)     # add spider back into group
+    spiders.resolve_contacts(mask=True) # pixel perfect, each pair once
     spiders.update()
+    for s in spiders: # The spider image faces up, turn it to face dx, dy
+        if s.dx or s.dy:
+            s.rotate(s.get_angle() - math.pi/2)
 
     # -- Drawing game objects ------------------------------------------
     # screen.blit() your game objects here
     # https://www.pygame.org/docs/ref/surface.html?highlight=blit#pygame.Surface.blit
-    discs.draw(screen)
-    spiders.draw(screen)
+    batch.add(discs, spiders)
+    batch.draw(screen)
 
     # Update the full display Surface to the screen
     # https://www.pygame.org/docs/ref/display.html#pygame.display.flip
@@ -12,8 +12,10 @@ import sys
 #import random # Un-comment if needed
 
 # -- Game classes ------------------------------------------------------
+import pygame_template_bootstrap as bootstrap
 import pygame_template_colors as color
 import pygame_template_objects as objects
+import pygame_template_log as gamelog
 
 # -- Game window properties --------------------------------------------
 DISPLAY_WIDTH = 800           # pixels
@@ -22,9 +24,15 @@ WINDOW_TITLE = 'Responding to keyboard events'
 SCREEN_BG_COLOR = color.black # From pygame_template_colors.py
 FPS = 60                      # Frames per second
 
+# -- Logging -----------------------------------------------------------
+# Set the environment variable PYGAME_TEMPLATE_LOG=DEBUG to log the events
+log = gamelog.setup()
+event_log = gamelog.GameEventLog()
+
 # -- Preparing game window ---------------------------------------------
+# Start only the pygame subsystems the game uses, faster than pygame.init()
 # https://www.pygame.org/docs/ref/display.html?highlight=init#pygame.display.init
-pygame.init() 
+bootstrap.init('display')
 # https://www.pygame.org/docs/ref/time.html#pygame.time.Clock
 clock = pygame.time.Clock() 
 # https://www.pygame.org/docs/ref/display.html#pygame.display.set_mode
@@ -64,11 +72,11 @@ while running: # Main loop
             pad.dx = 0 # stop the pad
         elif event.type == pygame.MOUSEMOTION:
             mouse = pygame.mouse.get_pos()
-            print('Mouse pos: ', mouse)
+            event_log.log(event, 'Mouse pos') # summed up once a second
         elif event.type == pygame.MOUSEBUTTONUP:
-            print('Mouse button released')
+            log.debug('Mouse button released')
         else:
-            print('Unhandled event', event)
+            event_log.log(event, 'Unhandled event')
 
     screen.fill(SCREEN_BG_COLOR)  # Blanking the screen
 
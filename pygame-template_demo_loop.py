@@ -0,0 +1,89 @@
+''' Pygame template demo
+
+A pygame template demo - fixed simulation steps with interpolated drawing
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import pygame
+import sys
+#import math   # Un-comment if needed
+import random
+
+# -- Game classes ------------------------------------------------------
+import pygame_template_bootstrap as bootstrap
+import pygame_template_colors as color
+import pygame_template_objects as objects
+import pygame_template_loop as loop
+import pygame_template_profiler as profiler
+
+# -- Game window properties --------------------------------------------
+DISPLAY_WIDTH = 800           # pixels
+DISPLAY_HEIGHT = 600          # pixels
+WINDOW_TITLE = 'Fixed steps, interpolated drawing'
+SCREEN_BG_COLOR = color.black # From pygame_template_colors.py
+STEPS_PER_SECOND = 30         # Simulation steps per second
+FPS = 60                      # Frames per second
+SAVE_TRACE = False            # Save frame timings to trace.json on exit
+
+# -- Preparing game window ---------------------------------------------
+# Start only the pygame subsystems the game uses, faster than pygame.init()
+# https://www.pygame.org/docs/ref/display.html?highlight=init#pygame.display.init
+bootstrap.init('display', 'font')
+# https://www.pygame.org/docs/ref/display.html#pygame.display.set_mode
+screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+# https://www.pygame.org/docs/ref/display.html#pygame.display.set_caption
+pygame.display.set_caption(WINDOW_TITLE)
+
+# -- Preparing game objects --------------------------------------------
+# Timing of each part of the frame, shown in the top left corner
+frame_profiler = profiler.GameProfiler(trace=SAVE_TRACE)
+overlay = profiler.GameProfileOverlay(frame_profiler, color=color.white)
+
+balls = objects.GameSpatialGroup()
+for i in range(10):
+    ball = objects.GameCircle(radius=20, fill=color.indianred,
+                              top=random.randint(0, 500),
+                              left=random.randint(0, 700),
+                              dx=random.randint(-6, 6),
+                              dy=random.randint(-6, 6))
+    balls.add(ball)
+
+def update(): # Called STEPS_PER_SECOND times per second
+    balls.update() # Move the balls by dx and dy pixels
+    for ball in balls: # Check for collision with screen edges
+        if ball.collide_horiz_window_edge(DISPLAY_HEIGHT):
+            ball.dy *= -1 # Hit top/bottom window edge, flip horizontal direction
+        if ball.collide_vert_window_edge(DISPLAY_WIDTH):
+            ball.dx *= -1 # Hit left/right window edge, flip vertical direction
+    with frame_profiler.scope('collisions'):
+        hits = balls.resolve_contacts(circle=True) # Bounce colliding balls
+    frame_profiler.count('collisions tested', balls.tested)
+    frame_profiler.count('collisions hit', len(hits))
+
+def draw(alpha): # Called once per frame, alpha is the time between steps
+    screen.fill(SCREEN_BG_COLOR)  # Blanking the screen
+    # Draw the balls between their previous and current positions
+    loop.draw_interpolated(screen, balls, alpha)
+    frame_profiler.count('blits', len(balls))
+    overlay.draw(screen)
+    # https://www.pygame.org/docs/ref/display.html#pygame.display.flip
+    with frame_profiler.scope('flip'):
+        pygame.display.flip()
+
+def handle_event(event): # https://www.pygame.org/docs/ref/event.html
+    if event.type == pygame.KEYDOWN:
+        game.stop() # Any key exits the main loop
+
+# Runs update() and draw() until the window is closed
+game = loop.GameLoop(update=update, draw=draw, handle_event=handle_event,
+                     steps_per_second=STEPS_PER_SECOND, max_fps=FPS,
+                     profiler=frame_profiler)
+game.run()
+if SAVE_TRACE:
+    frame_profiler.dump_trace('trace.json') # Open in https://www.speedscope.app
+
+# -- Exiting... --------------------------------------------------------
+pygame.quit() # https://www.pygame.org/docs/ref/pygame.html#pygame.quit
+sys.exit()    # https://docs.python.org/3.8/library/sys.html#sys.exit
@@ -12,8 +12,11 @@ import sys
 #import random # Un-comment if needed
 
 # -- Game classes ------------------------------------------------------
+import pygame_template_bootstrap as bootstrap
 import pygame_template_colors as color
 import pygame_template_objects as objects
+import pygame_template_log as gamelog
+import pygame_template_assets as assets
 
 # -- Game window properties --------------------------------------------
 DISPLAY_WIDTH = 800           # pixels
@@ -22,9 +25,15 @@ WINDOW_TITLE = 'Playing sound'
 SCREEN_BG_COLOR = color.darkred # From pygame_template_colors.py
 FPS = 60                      # Frames per second
 
+# -- Logging -----------------------------------------------------------
+# Set the environment variable PYGAME_TEMPLATE_LOG=DEBUG to log the events
+log = gamelog.setup()
+event_log = gamelog.GameEventLog()
+
 # -- Preparing game window ---------------------------------------------
+# Start only the pygame subsystems the game uses, faster than pygame.init()
 # https://www.pygame.org/docs/ref/display.html?highlight=init#pygame.display.init
-pygame.init() 
+bootstrap.init('display', 'font', 'mixer')
 # https://www.pygame.org/docs/ref/time.html#pygame.time.Clock
 clock = pygame.time.Clock() 
 # https://www.pygame.org/docs/ref/display.html#pygame.display.set_mode
@@ -36,8 +45,9 @@ running = True # The program will run as long as this variable is true
 
 # -- Preparing game objects --------------------------------------------
 # https://www.pygame.org/docs/ref/music.html
-pygame.mixer.music.load('song.mp3')
-pygame.mixer.music.play()
+# The song is read in the background and starts playing when it is loaded
+loader = assets.GameAssetLoader()
+loader.music('song.mp3', play=True)
 playing = True
 helptext = objects.GameTextElement(text='Mouse click to pause/resume',
                                    color=color.white, top=100, left=100)
@@ -48,12 +58,12 @@ while running: # Main loop
             running = False # Exiting the main loop
         elif event.type == pygame.KEYDOWN:
             key = pygame.key.get_pressed()
-            print('Key pressed: ', key)
+            log.debug('Key pressed: %s', key)
         elif event.type == pygame.KEYUP:
-            print('Key released')
+            log.debug('Key released')
         elif event.type == pygame.MOUSEMOTION:
             mouse = pygame.mouse.get_pos()
-            print('Mouse pos: ', mouse)
+            event_log.log(event, 'Mouse pos') # summed up once a second
         elif event.type == pygame.MOUSEBUTTONUP:
             if playing: # pause playback
                 playing = False
@@ -62,8 +72,9 @@ while running: # Main loop
                 playing = True 
                 pygame.mixer.music.unpause()
         else:
-            print('Unhandled event', event)
+            event_log.log(event, 'Unhandled event')
 
+    loader.poll() # Start the music when it is loaded
     screen.fill(SCREEN_BG_COLOR)  # Blanking the screen
 
     # -- Implement game code here --------------------------------------
@@ -0,0 +1,105 @@
+''' Pygame template demo
+
+A pygame template demo - particle effects, click to set off fireworks
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license 
+See http://www.gnu.org/licenses/gpl-3.0.html 
+'''
+import pygame
+import sys
+import math
+#import random # Un-comment if needed
+
+# -- Game classes ------------------------------------------------------
+import pygame_template_bootstrap as bootstrap
+import pygame_template_colors as color
+import pygame_template_objects as objects
+import pygame_template_particles as particles
+import pygame_template_log as gamelog
+
+# -- Game window properties --------------------------------------------
+DISPLAY_WIDTH = 800           # pixels
+DISPLAY_HEIGHT = 600          # pixels
+WINDOW_TITLE = 'Particles, click to set off fireworks'
+SCREEN_BG_COLOR = color.black # From pygame_template_colors.py
+FPS = 60                      # Frames per second
+
+# -- Logging -----------------------------------------------------------
+# Set the environment variable PYGAME_TEMPLATE_LOG=DEBUG to log the events
+log = gamelog.setup()
+event_log = gamelog.GameEventLog()
+
+# -- Preparing game window ---------------------------------------------
+# Start only the pygame subsystems the game uses, faster than pygame.init()
+# https://www.pygame.org/docs/ref/display.html?highlight=init#pygame.display.init
+bootstrap.init('display', 'font')
+# https://www.pygame.org/docs/ref/time.html#pygame.time.Clock
+clock = pygame.time.Clock() 
+# https://www.pygame.org/docs/ref/display.html#pygame.display.set_mode
+screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+# https://www.pygame.org/docs/ref/display.html#pygame.display.set_caption
+pygame.display.set_caption(WINDOW_TITLE)
+
+running = True # The program will run as long as this variable is true
+
+# -- Preparing game objects --------------------------------------------
+# Sparks fade from white to red and gray as they burn out
+sparks = particles.GameParticleEmitter(capacity=50000, gravity=0.05, 
+                                       drag=0.01,
+                                       colors=[color.white, 
+                                               color.greenyellow, 
+                                               color.orangered, color.red, 
+                                               color.dimgray])
+# A fountain of bigger drops at the bottom of the window
+fountain = particles.GameParticleEmitter(capacity=5000, size=3, 
+                                         gravity=0.15,
+                                         colors=[color.lightblue, 
+                                                 color.steelblue])
+counter = objects.GameTextElement(fontsize=24, color=color.white, 
+                                  top=10, left=10)
+
+while running: # Main loop
+    for event in pygame.event.get(): # https://www.pygame.org/docs/ref/event.html
+        if event.type == pygame.QUIT: 
+            running = False # Exiting the main loop
+        elif event.type == pygame.KEYDOWN:
+            key = pygame.key.get_pressed()
+            log.debug('Key pressed: %s', key)
+        elif event.type == pygame.KEYUP:
+            log.debug('Key released')
+        elif event.type == pygame.MOUSEMOTION:
+            event_log.log(event, 'Mouse pos') # summed up once a second
+        elif event.type == pygame.MOUSEBUTTONUP:
+            sparks.emit(5000, pos=event.pos, speed=(0.5, 6), life=(40, 120))
+        else:
+            event_log.log(event, 'Unhandled event')
+
+    screen.fill(SCREEN_BG_COLOR)  # Blanking the screen
+
+    # -- Implement game code here --------------------------------------
+    fountain.emit(40, pos=(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT), 
+                  speed=(5, 9), angle=(0.45*math.pi, 0.55*math.pi), 
+                  life=(60, 80))
+    sparks.step()
+    fountain.step()
+    counter.render('Particles: ' + str(len(sparks) + len(fountain)))
+
+    # -- Drawing game objects ------------------------------------------
+    # screen.blit() your game objects here
+    # https://www.pygame.org/docs/ref/surface.html?highlight=blit#pygame.Surface.blit
+    fountain.draw(screen)
+    sparks.draw(screen)
+    screen.blit(counter.image, counter.rect)
+
+    # Update the full display Surface to the screen
+    # https://www.pygame.org/docs/ref/display.html#pygame.display.flip
+    pygame.display.flip()
+
+    # Limit the frame rate
+    # https://www.pygame.org/docs/ref/time.html#pygame.time.Clock.tick
+    clock.tick(FPS)
+
+# -- Exiting... --------------------------------------------------------
+pygame.quit() # https://www.pygame.org/docs/ref/pygame.html#pygame.quit
+sys.exit()    # https://docs.python.org/3.8/library/sys.html#sys.exit
@@ -0,0 +1,117 @@
+''' Pygame template demo
+
+A pygame template demo - a scrolling world larger than the window, use 
+the arrow keys to look around
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license 
+See http://www.gnu.org/licenses/gpl-3.0.html 
+'''
+import pygame
+import sys
+#import math   # Un-comment if needed
+import random
+
+# -- Game classes ------------------------------------------------------
+import pygame_template_bootstrap as bootstrap
+import pygame_template_colors as color
+import pygame_template_objects as objects
+import pygame_template_tiles as tiles
+import pygame_template_log as gamelog
+
+# -- Game window properties --------------------------------------------
+DISPLAY_WIDTH = 800           # pixels
+DISPLAY_HEIGHT = 600          # pixels
+WINDOW_TITLE = 'Scrolling world, use the arrow keys'
+SCREEN_BG_COLOR = pygame.Color(196, 225, 178) # RGB color code
+FPS = 60                      # Frames per second
+WORLD_WIDTH = 8000            # pixels
+WORLD_HEIGHT = 6000           # pixels
+SCROLL_SPEED = 10             # pixels per frame
+
+# -- Logging -----------------------------------------------------------
+# Set the environment variable PYGAME_TEMPLATE_LOG=DEBUG to log the events
+log = gamelog.setup()
+event_log = gamelog.GameEventLog()
+
+# -- Preparing game window ---------------------------------------------
+# Start only the pygame subsystems the game uses, faster than pygame.init()
+# https://www.pygame.org/docs/ref/display.html?highlight=init#pygame.display.init
+bootstrap.init('display')
+# https://www.pygame.org/docs/ref/time.html#pygame.time.Clock
+clock = pygame.time.Clock() 
+# https://www.pygame.org/docs/ref/display.html#pygame.display.set_mode
+screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+# https://www.pygame.org/docs/ref/display.html#pygame.display.set_caption
+pygame.display.set_caption(WINDOW_TITLE)
+
+running = True # The program will run as long as this variable is true
+
+# -- Preparing game objects --------------------------------------------
+# The camera shows the part of the world that fits in the window
+camera = objects.GameCamera()
+world = pygame.Rect(0, 0, WORLD_WIDTH, WORLD_HEIGHT)
+
+# The background repeats the unit circle image all over the world, only
+# the tiles in view are drawn
+background = tiles.GameTileLayer(image='unit-circle.png', tile_size=200,
+                                 fill=SCREEN_BG_COLOR, repeat=True)
+
+balls = objects.GameSpatialGroup() # grid for finding the balls in view
+for i in range(2000):
+    balls.add(objects.GameCircle(radius=15, fill=color.indianred,
+                                 top=random.randint(0, WORLD_HEIGHT - 30),
+                                 left=random.randint(0, WORLD_WIDTH - 30),
+                                 dx=random.randint(-3, 3),
+                                 dy=random.randint(-3, 3)))
+
+while running: # Main loop
+    for event in pygame.event.get(): # https://www.pygame.org/docs/ref/event.html
+        if event.type == pygame.QUIT: 
+            running = False # Exiting the main loop
+        elif event.type == pygame.KEYDOWN:
+            key = pygame.key.get_pressed()
+            log.debug('Key pressed: %s', key)
+        elif event.type == pygame.KEYUP:
+            log.debug('Key released')
+        elif event.type == pygame.MOUSEMOTION:
+            event_log.log(event, 'Mouse pos') # summed up once a second
+        elif event.type == pygame.MOUSEBUTTONUP:
+            log.debug('Mouse button released at %s in the world', 
+                      camera.to_world(event.pos))
+        else:
+            event_log.log(event, 'Unhandled event')
+
+    screen.fill(SCREEN_BG_COLOR)  # Blanking the screen
+
+    # -- Implement game code here --------------------------------------
+    # Scroll while the arrow keys are held down, but not out of the world
+    key = pygame.key.get_pressed()
+    camera.rect.move_ip(SCROLL_SPEED * (key[pygame.K_RIGHT] - key[pygame.K_LEFT]),
+                        SCROLL_SPEED * (key[pygame.K_DOWN] - key[pygame.K_UP]))
+    camera.rect.clamp_ip(world)
+
+    # Only the balls near the view move, the others wait for the camera
+    for ball in camera.update(balls, margin=200):
+        if ball.collide_horiz_window_edge(WORLD_HEIGHT):
+            ball.dy *= -1 # Hit top/bottom world edge
+        if ball.collide_vert_window_edge(WORLD_WIDTH):
+            ball.dx *= -1 # Hit left/right world edge
+
+    # -- Drawing game objects ------------------------------------------
+    # screen.blit() your game objects here
+    # https://www.pygame.org/docs/ref/surface.html?highlight=blit#pygame.Surface.blit
+    background.draw(screen, camera)
+    camera.draw(screen, balls)
+
+    # Update the full display Surface to the screen
+    # https://www.pygame.org/docs/ref/display.html#pygame.display.flip
+    pygame.display.flip()
+
+    # Limit the frame rate
+    # https://www.pygame.org/docs/ref/time.html#pygame.time.Clock.tick
+    clock.tick(FPS)
+
+# -- Exiting... --------------------------------------------------------
+pygame.quit() # https://www.pygame.org/docs/ref/pygame.html#pygame.quit
+sys.exit()    # https://docs.python.org/3.8/library/sys.html#sys.exit
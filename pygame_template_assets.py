@@ -0,0 +1,328 @@
+''' Pygame Template Assets
+
+Images, fonts, sounds and music loaded on background threads, so the game
+starts at once and new levels load without stalling the frames. Objects
+show a placeholder until their asset is ready, and the real asset is put
+in place on the main thread between two frames.
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import io
+import os
+import time
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+import pygame_template_objects as objects
+import pygame_template_bootstrap as bootstrap
+
+log = logging.getLogger('pygame_template.assets')
+
+# ----------------------------------------------------------------------
+class GameAsset():
+    '''Handle of an asset loaded by GameAssetLoader
+
+    value is the placeholder until the asset has been loaded and put in
+    place by GameAssetLoader.poll(), then the loaded asset. If loading
+    fails, the placeholder is kept and error tells why.
+
+    Args:
+        path (str): Asset path/filename
+        placeholder: Value to use until the asset is loaded
+
+    Attributes:
+        path (str): Asset path/filename
+        value: The placeholder or the loaded asset
+        ready (bool): True when value is the loaded asset
+        error (Exception): Why loading failed, None if it did not
+    '''
+    def __init__(self, path, placeholder):
+        self.path = path
+        self.value = placeholder
+        self.ready = False
+        self.error = None
+        self._callbacks = []
+
+    def __repr__(self):
+        state = 'ready' if self.ready else 'failed' if self.error else 'loading'
+        return '<GameAsset {:s} {:s}>'.format(self.path, state)
+
+    def on_ready(self, callback):
+        '''Call callback with this handle on the main thread when loaded
+
+        Called at once if the asset is loaded already, and never if
+        loading fails.
+
+        Args:
+            callback (function): Called with the handle
+        '''
+        if self.ready:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+# ----------------------------------------------------------------------
+class GameAssetLoader():
+    '''Loads assets on a thread pool and puts them in place between frames
+
+    Files are read and decoded on the loader threads. Converting images
+    to the display format, and anything else touching the display or the
+    objects, is done by poll() on the main thread. Call poll() once per
+    frame, or give the loader to GameLoop, which does it before the
+    events of each frame. poll() puts in place as many finished assets as
+    it can within budget seconds, so a level full of images is spread
+    over a few frames instead of stalling one. Call wait() to finish all
+    loads at once, e.g. behind a loading screen.
+
+    Every asset is loaded once, asking again for the same file returns
+    the same handle. Images go into objects.image_cache, and GameImage
+    objects made after they are loaded do not wait at all.
+
+        assets = GameAssetLoader()
+        snake = assets.image_object(imagefile='snake.png', top=100)
+        title = assets.text_object(text='Hello', fontfile='some-time-later.ttf')
+        assets.music('song.mp3', play=True)
+        ...
+        assets.poll() # once per frame
+
+    Args:
+        workers (int): Number of loader threads (optional, default is 4)
+        placeholder (pygame.Color): Color of placeholder images (optional,
+                                    default is transparent)
+        budget (float): Seconds poll() may spend per call (optional,
+                        default is 0.004)
+
+    Attributes:
+        pending (int): Number of assets not yet loaded and put in place
+    '''
+    def __init__(self, **kwargs):
+        self.placeholder = kwargs.get('placeholder', (0, 0, 0, 0))
+        self.budget = kwargs.get('budget', 0.004)
+        self.pending = 0
+        self._pool = ThreadPoolExecutor(max_workers=kwargs.get('workers', 4),
+                                        thread_name_prefix='assets')
+        self._assets = {} # (kind, path, size) -> GameAsset
+        self._done = queue.SimpleQueue() # (handle, future, finish)
+
+    def __len__(self):
+        '''Returns the number of assets asked for'''
+        return len(self._assets)
+
+    def image(self, path, size=(32, 32)):
+        '''Returns the handle of an image file, loading it if needed
+
+        Until it is loaded, the value is a placeholder of size. The image
+        goes into the image cache only when it has been loaded, so
+        GameImage objects made from path meanwhile load the file
+        themselves.
+
+        Args:
+            path (str): Image path/filename
+            size (tuple(int)): Placeholder width and height (optional,
+                               default is 32x32)
+        '''
+        key = ('image', path, None)
+        handle = self._assets.get(key)
+        if handle is not None:
+            return handle
+        if path in objects.image_cache:
+            handle = self._assets[key] = GameAsset(path, None)
+            handle.value = objects.image_cache.load(path)
+            handle.ready = True
+            return handle
+
+        def finish(image):
+            objects.image_cache.replace(path, image) # converts it
+            return objects.image_cache.load(path)
+
+        def fail():
+            objects.image_cache.discard(path)
+        return self._submit(key, self._placeholder(size), pygame.image.load,
+                            finish, fail)
+
+    def image_object(self, **kwargs):
+        '''Returns a GameImage showing a placeholder until its file is loaded
+
+        The arguments are the same as for GameImage, the image is always
+        shared through the image cache. The placeholder has the width
+        and height asked for, or is 32x32. When the file is loaded, the
+        object is scaled and rotated as asked and keeps its top left
+        position.
+        '''
+        kwargs.pop('cache', None)
+        size = (kwargs.get('width', None) or 32,
+                kwargs.get('height', None) or 32)
+        handle = self.image(kwargs['imagefile'], size)
+        if handle.ready:
+            return objects.GameImage(**kwargs)
+
+        # Made around its own placeholder, without loading the file
+        obj = objects.GameImage.__new__(objects.GameImage)
+        objects.GameObject.__init__(obj, **kwargs)
+        obj._load(dict(kwargs, width=size[0], height=size[1], scale=None),
+                  self._placeholder(size))
+
+        def swap(handle):
+            obj._load(dict(kwargs, top=obj.rect.top, left=obj.rect.left,
+                           angle=obj.angle))
+            obj._relocate()
+        handle.on_ready(swap)
+        return obj
+
+    def font(self, path, size=24):
+        '''Returns the handle of a font file, loading it if needed
+
+        Until it is loaded, the value is the pygame default font.
+
+        Args:
+            path (str): Font path/filename
+            size (int): Font size (optional, default is 24)
+        '''
+        key = ('font', path, size)
+        if key in self._assets:
+            return self._assets[key]
+        bootstrap.require('font')
+        return self._submit(key, pygame.font.Font(None, size),
+                            lambda path: pygame.font.Font(path, size))
+
+    def text_object(self, **kwargs):
+        '''Returns a GameTextElement drawn with the default font at first
+
+        The arguments are the same as for GameTextElement. When fontfile
+        is loaded, the text is rendered again and keeps its top left
+        position.
+        '''
+        fontfile = kwargs.pop('fontfile', None)
+        obj = objects.GameTextElement(**kwargs)
+        if fontfile is None:
+            return obj
+
+        def swap(handle):
+            obj.fontfile = fontfile
+            obj._font = handle.value
+            obj._rendered = None
+            obj.render()
+            obj.rect = obj.image.get_rect(topleft=obj.rect.topleft)
+            obj._relocate()
+        self.font(fontfile, obj.fontsize).on_ready(swap)
+        return obj
+
+    def sound(self, path):
+        '''Returns the handle of a sound file, loading it if needed
+
+        The value is None until the sound is loaded.
+
+        Args:
+            path (str): Sound path/filename
+        '''
+        bootstrap.require('mixer')
+        return self._submit(('sound', path, None), None, pygame.mixer.Sound)
+
+    def music(self, path, play=False):
+        '''Read a music file and load it into pygame.mixer.music
+
+        The file is read on a loader thread, and handed to the mixer
+        by poll(). Returns the handle, its value is None until the music
+        is loaded.
+
+        Args:
+            path (str): Music path/filename
+            play (bool): Start playing when loaded (optional, default is
+                         False)
+        '''
+        bootstrap.require('mixer')
+
+        def read(path):
+            with open(path, 'rb') as f:
+                return f.read()
+
+        def finish(data):
+            pygame.mixer.music.load(io.BytesIO(data),
+                                    os.path.splitext(path)[1].lstrip('.'))
+            if play:
+                pygame.mixer.music.play()
+            return pygame.mixer.music
+        return self._submit(('music', path, None), None, read, finish)
+
+    def poll(self, budget=None):
+        '''Put loaded assets in place, returns the number put in place
+
+        Call on the main thread between frames. At least one asset is put
+        in place per call if any is loaded.
+
+        Args:
+            budget (float): Seconds to spend at most (optional, default is
+                            the loader budget)
+        '''
+        if budget is None:
+            budget = self.budget
+        start = time.perf_counter()
+        count = 0
+        while self.pending:
+            try:
+                done = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(*done)
+            count += 1
+            if time.perf_counter() - start >= budget:
+                break
+        return count
+
+    def wait(self):
+        '''Wait for every asset asked for and put them in place'''
+        while self.pending:
+            self._finish(*self._done.get())
+
+    def close(self):
+        '''Stop the loader threads after the loads already started'''
+        self._pool.shutdown(wait=True)
+
+    def _placeholder(self, size):
+        '''Returns a new placeholder image of size'''
+        placeholder = pygame.Surface(size, pygame.SRCALPHA)
+        placeholder.fill(self.placeholder)
+        return placeholder
+
+    def _submit(self, key, placeholder, load, finish=None, fail=None):
+        '''Returns the handle for key, starting load(path) for a new key
+
+        On the main thread, finish(value) is called with the loaded value
+        and returns the asset, or fail() is called if loading failed.
+        '''
+        handle = self._assets.get(key)
+        if handle is None:
+            handle = self._assets[key] = GameAsset(key[1], placeholder)
+            self.pending += 1
+            future = self._pool.submit(load, key[1])
+            future.add_done_callback(
+                lambda future: self._done.put((handle, future, finish, fail)))
+        return handle
+
+    def _finish(self, handle, future, finish, fail):
+        '''Put a loaded asset in place, on the main thread'''
+        self.pending -= 1
+        try:
+            value = future.result()
+            if finish is not None:
+                value = finish(value)
+        except (pygame.error, OSError) as e:
+            handle.error = e
+            log.warning('Could not load %s: %s', handle.path, e)
+            if fail is not None:
+                fail()
+            return
+        log.debug('Loaded %s', handle.path)
+        handle.value = value
+        handle.ready = True
+        callbacks, handle._callbacks = handle._callbacks, []
+        for callback in callbacks:
+            callback(handle)
+
+if __name__ == "__main__":
+    pass
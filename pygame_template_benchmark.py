@@ -0,0 +1,1034 @@
+''' Pygame Template Benchmarks
+
+Headless benchmarks for the template objects and demo scenes, using
+SDL's dummy video and audio drivers. Run one or more benchmarks by name,
+all of them if no name is given:
+
+    python pygame_template_benchmark.py blit
+    python pygame_template_benchmark.py scenes --counts 10,100,1000 --json out.json
+    python pygame_template_benchmark.py memory --count 100000
+    python pygame_template_benchmark.py startup # python -X importtime
+
+Save the JSON results from two commits to compare them.
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import sys
+import gc
+import json
+import math
+import time
+import itertools
+import random
+import argparse
+import platform
+import subprocess
+import tracemalloc
+import pygame
+
+import pygame_template_bootstrap as bootstrap
+import pygame_template_colors as color
+import pygame_template_objects as objects
+import pygame_template_tiles as tiles
+
+DISPLAY_WIDTH = 800  # pixels
+DISPLAY_HEIGHT = 600 # pixels
+
+def time_per_call(func, number, repeat=5):
+    '''Returns the best time per call in microseconds
+
+    Args:
+        func (function): Function to time, called without arguments
+        number (int): Number of calls per measurement
+        repeat (int): Number of measurements (optional, default is 5)
+    '''
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return 1e6 * best / number
+
+# ----------------------------------------------------------------------
+def bench_blit(number=2000, **options):
+    '''Blit object Surfaces as created and in the display pixel format
+
+    Args:
+        number (int): Number of blits per measurement
+    '''
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    # Image files straight from pygame.image.load, in the file format
+    surfaces = {
+        'image spider.png': pygame.image.load('spider.png'),
+        'image sword.png': pygame.image.load('sword.png'),
+        'GameTextElement antialias': objects.GameTextElement(
+            text='The FPS is: 60.0', fontsize=72).image,
+        'GameTextElement no antialias': objects.GameTextElement(
+            text='The FPS is: 60.0', fontsize=72, antialias=False).image,
+    }
+
+    results = {}
+    for name, surface in surfaces.items():
+        if (surface.get_bitsize() == screen.get_bitsize() and
+                surface.get_masks() == screen.get_masks()):
+            raise RuntimeError('{} is in the display format already, '
+                               'nothing to compare'.format(name))
+        converted = objects.display_format(surface)
+        before = time_per_call(lambda: screen.blit(surface, (0, 0)), number)
+        after = time_per_call(lambda: screen.blit(converted, (0, 0)), number)
+        results[name] = {'size': surface.get_size(),
+                         'unconverted_us': before,
+                         'converted_us': after,
+                         'speedup': before / after}
+    pygame.quit()
+
+    print('{:30s} {:>12s} {:>14s} {:>12s} {:>8s}'.format(
+          'Surface', 'size', 'as created', 'converted', 'speedup'))
+    for name, r in results.items():
+        print('{:30s} {:>12s} {:>11.1f} us {:>9.1f} us {:>7.2f}x'.format(
+              name, '{}x{}'.format(*r['size']), r['unconverted_us'],
+              r['converted_us'], r['speedup']))
+    return results
+
+# ----------------------------------------------------------------------
+def bench_dirty(frames=600, **options):
+    '''Ball and cursor demo scenes with full flip and dirty rect drawing
+
+    Args:
+        frames (int): Number of frames to draw in each mode
+    '''
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+
+    def ball_scene():
+        ball = objects.GameCircle(radius=20, fill=color.indianred,
+                                  top=280, left=380, dx=3, dy=2)
+        background = objects.GameImage(imagefile='unit-circle.png')
+        def move(frame):
+            ball.update()
+            if ball.collide_horiz_window_edge(DISPLAY_HEIGHT):
+                ball.dy *= -1
+            if ball.collide_vert_window_edge(DISPLAY_WIDTH):
+                ball.dx *= -1
+        return [background], [ball], move
+
+    def cursor_scene():
+        image = objects.GameImage(imagefile='sword.png', width=25, height=32)
+        def move(frame): # a mouse going round in circles
+            image.rect.center = (400 + int(200*math.cos(frame / 30)),
+                                 300 + int(200*math.sin(frame / 30)))
+        return [], [image], move
+
+    results = {}
+    for name, scene in (('ball', ball_scene), ('cursor', cursor_scene)):
+        # Full flip: blank the screen and draw everything every frame
+        backdrop, sprites, move = scene()
+        start = time.perf_counter()
+        for frame in range(frames):
+            move(frame)
+            screen.fill(color.black)
+            for obj in backdrop + sprites:
+                screen.blit(obj.image, obj.rect)
+            pygame.display.flip()
+        flip = time.perf_counter() - start
+
+        # Dirty rects: the backdrop is drawn once into the background
+        backdrop, sprites, move = scene()
+        background = pygame.Surface(screen.get_size())
+        background.fill(color.black)
+        for obj in backdrop:
+            background.blit(obj.image, obj.rect)
+        group = objects.GameDirtyGroup(*sprites, background=background)
+        pixels = 0
+        start = time.perf_counter()
+        for frame in range(frames):
+            move(frame)
+            rects = group.draw(screen)
+            pygame.display.update(rects)
+            pixels += sum(r.width * r.height for r in rects)
+        dirty = time.perf_counter() - start
+
+        results[name] = {'flip_ms': 1e3 * flip / frames,
+                         'dirty_ms': 1e3 * dirty / frames,
+                         'speedup': flip / dirty,
+                         'dirty_pixels': pixels / frames}
+    pygame.quit()
+
+    print('{:10s} {:>12s} {:>12s} {:>8s} {:>14s}'.format(
+          'Scene', 'full flip', 'dirty rects', 'speedup', 'pixels/frame'))
+    for name, r in results.items():
+        print('{:10s} {:>9.3f} ms {:>9.3f} ms {:>7.1f}x {:>14.0f}'.format(
+              name, r['flip_ms'], r['dirty_ms'], r['speedup'],
+              r['dirty_pixels']))
+    return results
+
+# ----------------------------------------------------------------------
+def bench_memory(count=100000, **options):
+    '''Memory and speed of plain and slotted objects
+
+    Creates count objects of each class, measures the memory they 
+    allocate with tracemalloc, and times creating them and moving them 
+    with update() in a sprite group.
+
+    Args:
+        count (int): Number of objects of each class
+    '''
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    classes = (
+        ('circle', objects.GameCircle, objects.GameSlotCircle,
+         {'radius': 2, 'fill': color.white}),
+        ('rectangle', objects.GameRectangle, objects.GameSlotRectangle,
+         {'width': 2, 'height': 6, 'fill': color.white}),
+    )
+
+    def create(cls, kwargs):
+        return [cls(top=i % DISPLAY_HEIGHT, left=i % DISPLAY_WIDTH, 
+                    dx=1, dy=-1, **kwargs) for i in range(count)]
+
+    results = {}
+    for name, plain, slotted, kwargs in classes:
+        for variant, cls in (('plain', plain), ('slotted', slotted)):
+            create(cls, kwargs) # the shared Surface is cached after this
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            objs = create(cls, kwargs)
+            nbytes = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+            del objs
+
+            start = time.perf_counter()
+            group = pygame.sprite.Group(create(cls, kwargs))
+            create_s = time.perf_counter() - start
+            start = time.perf_counter()
+            for frame in range(5):
+                group.update()
+            update_s = (time.perf_counter() - start) / 5
+            group.empty()
+
+            results[name + ' ' + variant] = {
+                'class': cls.__name__, 'count': count,
+                'bytes_per_object': nbytes / count,
+                'create_us': 1e6 * create_s / count,
+                'update_us': 1e6 * update_s / count}
+    pygame.quit()
+
+    print('{:20s} {:>18s} {:>10s} {:>12s} {:>12s}'.format(
+          'Objects', 'class', 'bytes', 'create', 'update'))
+    for name, r in results.items():
+        print('{:20s} {:>18s} {:>10.0f} {:>9.2f} us {:>9.3f} us'.format(
+              name, r['class'], r['bytes_per_object'], r['create_us'],
+              r['update_us']))
+    return results
+
+# ----------------------------------------------------------------------
+def bench_batch(count=5000, **options):
+    '''Draw sprites one blit at a time, with Group.draw and in a batch
+
+    count small circles and spider images in random order, a quarter of 
+    them outside the screen.
+
+    Args:
+        count (int): Number of sprites
+    '''
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    random.seed(options.get('seed', 1))
+    fills = (color.indianred, color.steelblue, color.white, color.dimgray)
+    sprites = pygame.sprite.Group()
+    for i in range(count):
+        top = random.randint(-DISPLAY_HEIGHT // 4, DISPLAY_HEIGHT)
+        left = random.randint(0, DISPLAY_WIDTH)
+        if i % 5 == 4:
+            sprites.add(objects.GameImage(imagefile='spider.png', scale=0.1,
+                                          top=top, left=left))
+        else:
+            sprites.add(objects.GameCircle(radius=4, fill=fills[i % 4],
+                                           top=top, left=left))
+    unsorted_batch = objects.GameRenderBatch()
+    sorted_batch = objects.GameRenderBatch(sort=True)
+
+    def one_by_one():
+        for s in sprites:
+            screen.blit(s.image, s.rect)
+
+    def batch(b):
+        b.add(sprites)
+        b.draw(screen)
+
+    methods = (('screen.blit', one_by_one),
+               ('Group.draw', lambda: sprites.draw(screen)),
+               ('batch', lambda: batch(unsorted_batch)),
+               ('batch, sorted', lambda: batch(sorted_batch)))
+    results = {}
+    for name, draw in methods:
+        results[name] = {'count': count, 
+                         'frame_ms': 1e-3 * time_per_call(draw, 20)}
+    pygame.quit()
+
+    base = results['screen.blit']['frame_ms']
+    print('{:20s} {:>12s} {:>8s}'.format('Drawing', 'per frame', 'speedup'))
+    for name, r in results.items():
+        print('{:20s} {:>9.3f} ms {:>7.2f}x'.format(
+              name, r['frame_ms'], base / r['frame_ms']))
+    return results
+
+# ----------------------------------------------------------------------
+def bench_camera(count=10000, frames=100, **options):
+    '''Update and draw a large world, all of it and through a GameCamera
+
+    count balls spread over a world with about 100 balls per screen, 
+    the camera shows one screen in the middle of it. The balls are 
+    updated but have no speed, so the same balls stay in view.
+
+    Args:
+        count (int): Number of balls in the world
+        frames (int): Number of frames in each mode
+    '''
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    random.seed(options.get('seed', 1))
+    scale = math.sqrt(max(1.0, count / 100.0))
+    width, height = int(DISPLAY_WIDTH * scale), int(DISPLAY_HEIGHT * scale)
+    balls = objects.GameSpatialGroup()
+    for i in range(count):
+        balls.add(objects.GameCircle(radius=10, fill=color.indianred,
+                                     top=random.randint(0, height - 20),
+                                     left=random.randint(0, width - 20)))
+    camera = objects.GameCamera()
+    camera.rect.center = (width // 2, height // 2)
+
+    def everything():
+        balls.update()
+        left, top = camera.rect.topleft
+        screen.blits([(s.image, s.rect.move(-left, -top)) for s in balls],
+                     doreturn=False)
+
+    def culled():
+        camera.update(balls, margin=100)
+        camera.draw(screen, balls)
+
+    results = {}
+    for name, frame in (('everything', everything), ('camera', culled)):
+        results[name] = {'count': count,
+                         'frame_ms': 1e-3 * time_per_call(frame, frames, 3)}
+    results['camera']['drawn'] = camera.drawn
+    pygame.quit()
+
+    base = results['everything']['frame_ms']
+    print('{:12s} {:>8s} {:>12s} {:>8s}'.format(
+          'Mode', 'objects', 'per frame', 'speedup'))
+    for name, r in results.items():
+        print('{:12s} {:>8d} {:>9.3f} ms {:>7.1f}x'.format(
+              name, r['count'], r['frame_ms'], base / r['frame_ms']))
+    print('The camera drew', camera.drawn, 'objects')
+    return results
+
+# ----------------------------------------------------------------------
+def bench_rotate(count=1000, frames=60, **options):
+    '''Turn count spiders a little every frame, rotating or from the cache
+
+    Args:
+        count (int): Number of spiders
+        frames (int): Number of frames in each mode
+    '''
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    results = {}
+    for name, cache in (('rotozoom per frame', False), ('variant cache', True)):
+        objects.image_cache.clear()
+        spiders = [objects.GameImage(imagefile='spider.png', scale=0.1,
+                                     cache=cache) for c in range(count)]
+        start = time.perf_counter()
+        for frame in range(frames):
+            for k, s in enumerate(spiders):
+                s.rotate(0.05 * (frame + k))
+        results[name] = {'count': count, 
+                         'frame_ms': 1e3 * (time.perf_counter() - start) / frames}
+    results['variant cache'].update(objects.image_cache.stats())
+    pygame.quit()
+
+    base = results['rotozoom per frame']['frame_ms']
+    print('{:20s} {:>8s} {:>12s} {:>8s}'.format(
+          'Rotating', 'objects', 'per frame', 'speedup'))
+    for name, r in results.items():
+        print('{:20s} {:>8d} {:>9.3f} ms {:>7.1f}x'.format(
+              name, r['count'], r['frame_ms'], base / r['frame_ms']))
+    return results
+
+# ----------------------------------------------------------------------
+def bench_mask(count=200, **options):
+    '''Pixel perfect collisions with masks made per test and cached
+
+    Tests every pair of count turned spiders in a small area, with 
+    pygame.sprite.collide_mask making both masks for each test, and with
+    collide(mask=True) using the cached masks after a rect test.
+
+    Args:
+        count (int): Number of spiders
+    '''
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    random.seed(options.get('seed', 1))
+    spiders = objects.GameCollisionGroup()
+    for c in range(count):
+        s = objects.GameImage(imagefile='spider.png', scale=0.1,
+                              top=random.randint(0, 200),
+                              left=random.randint(0, 200))
+        s.rotate(random.uniform(0, 2*math.pi))
+        spiders.add(s)
+
+    results = {}
+    for name, find in (
+            ('collide_mask', lambda: [(a, b) for a, b in 
+                itertools.combinations(spiders.sprites(), 2)
+                if pygame.sprite.collide_mask(a, b)]),
+            ('cached masks', lambda: spiders.find_contacts(mask=True)),
+            ('rects', lambda: spiders.find_contacts())):
+        start = time.perf_counter()
+        hits = len(find())
+        results[name] = {'count': count, 'hits': hits,
+                         'ms': 1e3 * (time.perf_counter() - start)}
+    pygame.quit()
+
+    print('{:15s} {:>8s} {:>8s} {:>12s}'.format(
+          'Collisions', 'objects', 'hits', 'time'))
+    for name, r in results.items():
+        print('{:15s} {:>8d} {:>8d} {:>9.2f} ms'.format(
+              name, r['count'], r['hits'], r['ms']))
+    return results
+
+# ----------------------------------------------------------------------
+def bench_ccd(count=200, frames=120, **options):
+    '''Fast balls above a thin wall, moved with update() and substeps
+
+    count balls with radius 5 move up to 40 pixels per step in the top 
+    half of the screen, above a 2 pixel wall across the middle. With 
+    update() a ball bounces if it overlaps the wall after its step, 
+    GameSubstepper moves fast balls in substeps with swept tests. Balls 
+    ending below the wall have tunnelled through it.
+
+    Args:
+        count (int): Number of balls
+        frames (int): Number of steps in each mode
+    '''
+    import pygame_template_ccd as ccd
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    middle = DISPLAY_HEIGHT // 2
+    wall = objects.GameLine(start_pos=(0, middle),
+                            end_pos=(DISPLAY_WIDTH, middle), line_width=2)
+    wall_rect = pygame.Rect(0, middle - 1, DISPLAY_WIDTH, 2)
+
+    def balls():
+        random.seed(options.get('seed', 1))
+        return objects.GameSpatialGroup(*[
+            objects.GameCircle(radius=5, top=random.randint(0, middle - 20),
+                               left=random.randint(0, DISPLAY_WIDTH - 10),
+                               dx=random.uniform(-10, 10),
+                               dy=random.uniform(-40, 40))
+            for c in range(count)])
+
+    def discrete(group):
+        group.update()
+        for b in group:
+            if b.collide_horiz_window_edge(DISPLAY_HEIGHT):
+                b.dy *= -1
+            if b.collide_vert_window_edge(DISPLAY_WIDTH):
+                b.dx *= -1
+            if b.rect.colliderect(wall_rect):
+                b.rewind()
+                b.dy *= -1
+        group.resolve_contacts(circle=True)
+
+    stepper = ccd.GameSubstepper(width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT,
+                                 walls=[wall], circle=True)
+    results = {}
+    for name, step in (('update', discrete), ('substeps', stepper.step)):
+        group = balls()
+        start = time.perf_counter()
+        for frame in range(frames):
+            step(group)
+        elapsed = time.perf_counter() - start
+        results[name] = {'count': count, 
+                         'frame_ms': 1e3 * elapsed / frames,
+                         'tunnelled': sum(1 for b in group 
+                                          if b.rect.centery > middle)}
+    pygame.quit()
+
+    print('{:10s} {:>8s} {:>12s} {:>10s}'.format(
+          'Moving', 'balls', 'per step', 'tunnelled'))
+    for name, r in results.items():
+        print('{:10s} {:>8d} {:>9.3f} ms {:>10d}'.format(
+              name, r['count'], r['frame_ms'], r['tunnelled']))
+    return results
+
+# ----------------------------------------------------------------------
+def bench_shards(count=20000, frames=50, **options):
+    '''Simulate a large world in one process and split into regions
+
+    count balls bounce around a 4000x4000 world without drawing, moved
+    with update(), the window edge checks and resolve_contacts() in one
+    process, and by a ShardedWorld of 2x2 and 4x4 regions with a worker
+    process per CPU core. Also counts the balls that end up where the
+    single process put them.
+
+    Args:
+        count (int): Number of balls
+        frames (int): Number of steps in each mode
+    '''
+    import pygame_template_shards as shards
+    size = 4000
+
+    def balls():
+        random.seed(options.get('seed', 1))
+        return [objects.GameCircle(radius=5, top=random.randint(0, size - 10),
+                                   left=random.randint(0, size - 10),
+                                   dx=random.randint(-4, 4),
+                                   dy=random.randint(-4, 4))
+                for c in range(count)]
+
+    results = {}
+    group = objects.GameSpatialGroup(*balls())
+    start = time.perf_counter()
+    for frame in range(frames):
+        group.update()
+        for b in group:
+            if b.collide_horiz_window_edge(size):
+                b.dy *= -1
+            if b.collide_vert_window_edge(size):
+                b.dx *= -1
+        group.resolve_contacts(circle=True)
+    elapsed = time.perf_counter() - start
+    expected = [b.rect.topleft for b in group]
+    results['1 process'] = {'count': count, 'frame_ms': 1e3 * elapsed / frames,
+                            'same': count}
+
+    processes = os.cpu_count() or 1
+    for regions in ((2, 2), (4, 4)):
+        moved = balls()
+        with shards.ShardedWorld(width=size, height=size, regions=regions,
+                                 processes=processes, capacity=count,
+                                 circle=True) as world:
+            for b in moved:
+                world.add(b)
+            start = time.perf_counter()
+            for frame in range(frames):
+                world.step()
+            elapsed = time.perf_counter() - start
+            world.sync()
+        name = '{:d}x{:d} regions'.format(*regions)
+        results[name] = {'count': count, 'processes': processes,
+                         'frame_ms': 1e3 * elapsed / frames,
+                         'same': sum(1 for b, pos in zip(moved, expected)
+                                     if b.rect.topleft == pos)}
+
+    print('{:14s} {:>8s} {:>12s} {:>8s}'.format(
+          'Simulated in', 'balls', 'per step', 'same'))
+    for name, r in results.items():
+        print('{:14s} {:>8d} {:>9.3f} ms {:>8d}'.format(
+              name, r['count'], r['frame_ms'], r['same']))
+    print('{:d} worker processes'.format(processes))
+    return results
+
+# ----------------------------------------------------------------------
+def bench_palette(count=100000, **options):
+    '''Color objects by mass with a pygame.Color each and with a palette
+
+    Finds the mapped pixel value of count objects with masses 1 to 10,
+    colored like the discs of the collisions demo. Per object a
+    pygame.Color is made and mapped, the palette looks up a list of
+    masses or a NumPy array of them in a 10 color gradient.
+
+    Args:
+        count (int): Number of objects
+    '''
+    import numpy as np
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    random.seed(options.get('seed', 1))
+    masses = [random.randint(1, 10) for k in range(count)]
+    mass_array = np.array(masses)
+
+    def per_object():
+        colors = [pygame.Color(m*25, m*25, 255) for m in masses]
+        return colors, [screen.map_rgb(c) for c in colors]
+
+    def palette_list():
+        palette = color.GamePalette.gradient([(25, 25, 255), (250, 250, 255)],
+                                             10)
+        mapped = palette.mapped(screen)
+        return palette, [mapped[k] for k in palette.lookup(masses, 1, 10)]
+
+    def palette_array():
+        palette = color.GamePalette.gradient([(25, 25, 255), (250, 250, 255)],
+                                             10)
+        mapped = np.array(palette.mapped(screen))
+        return palette, mapped[palette.lookup(mass_array, 1, 10)]
+
+    results = {}
+    expected = per_object()[1]
+    for name, func in (('pygame.Color', per_object), 
+                       ('palette, list', palette_list),
+                       ('palette, array', palette_array)):
+        gc.collect()
+        tracemalloc.start()
+        kept = func()
+        kept_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        same = list(kept[1]) == expected
+        del kept
+        results[name] = {'count': count,
+                         'ms': time_per_call(func, 1, repeat=3) / 1e3,
+                         'kb': kept_bytes / 1024.0, 'same': same}
+    pygame.quit()
+
+    print('{:16s} {:>8s} {:>10s} {:>12s} {:>6s}'.format(
+          'Colored with', 'objects', 'time', 'memory', 'same'))
+    for name, r in results.items():
+        print('{:16s} {:>8d} {:>7.2f} ms {:>9.0f} kB {:>6s}'.format(
+              name, r['count'], r['ms'], r['kb'], str(r['same'])))
+    return results
+
+STARTUP_MODULES = ('pygame', 'pygame_template_colors',
+                   'pygame_template_objects', 'pygame_template_loop', 'pygame_template_log',
+                   'pygame_template_assets', 'pygame_template_tiles')
+
+STARTUP_INIT = {
+    'pygame.init()': 'pygame.init()',
+    "init('display')": "bootstrap.init('display')",
+    "init('display', 'font')": "bootstrap.init('display', 'font')",
+}
+
+# ----------------------------------------------------------------------
+def import_times(module):
+    '''Returns the import time of module and of everything it imports
+
+    Runs python -X importtime in a new interpreter, so nothing has been
+    imported before. Returns a dict of module name -> cumulative import
+    time in ms.
+    '''
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             'import ' + module],
+                            stderr=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                            universal_newlines=True, check=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e3
+    return times
+
+def bench_startup(runs=5, **options):
+    '''Cold start: import times and starting pygame in new interpreters
+
+    The import time of each template module is split into the time spent
+    importing pygame, which the template can not change, and the rest.
+    Then pygame.init() is compared with starting only the subsystems a
+    game uses, timing the init call and the whole interpreter run up to
+    an open window. Each is the best of runs new interpreters.
+
+    Args:
+        runs (int): Number of interpreters started per measurement
+    '''
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    results = {'imports': {}, 'init': {}}
+    for module in STARTUP_MODULES:
+        times = [import_times(module) for run in range(runs)]
+        results['imports'][module] = {
+            'total_ms': min(t[module] for t in times),
+            'pygame_ms': min(t.get('pygame', 0.0) for t in times)}
+
+    for name, call in STARTUP_INIT.items():
+        code = ('import time; start = time.perf_counter(); import pygame; '
+                'import pygame_template_bootstrap as bootstrap; '
+                'middle = time.perf_counter(); {}; '
+                'end = time.perf_counter(); '
+                'pygame.display.set_mode((800, 600)); '
+                'print(1e3 * (end - middle), 1e3 * (time.perf_counter() - start))'
+                ).format(call)
+        init_ms, total_ms, wall_ms = [], [], []
+        for run in range(runs):
+            start = time.perf_counter()
+            output = subprocess.check_output([sys.executable, '-c', code],
+                                             universal_newlines=True)
+            wall_ms.append(1e3 * (time.perf_counter() - start))
+            init, total = output.split()
+            init_ms.append(float(init))
+            total_ms.append(float(total))
+        results['init'][name] = {'init_ms': min(init_ms),
+                                 'window_ms': min(total_ms),
+                                 'process_ms': min(wall_ms)}
+
+    print('{:28s} {:>10s} {:>10s} {:>10s}'.format(
+          'Import', 'total', 'pygame', 'template'))
+    for module, r in results['imports'].items():
+        print('{:28s} {:>7.1f} ms {:>7.1f} ms {:>7.1f} ms'.format(
+              module, r['total_ms'], r['pygame_ms'],
+              r['total_ms'] - r['pygame_ms']))
+    print()
+    print('{:28s} {:>10s} {:>10s} {:>10s}'.format(
+          'Start', 'init', 'window', 'process'))
+    for name, r in results['init'].items():
+        print('{:28s} {:>7.1f} ms {:>7.1f} ms {:>7.1f} ms'.format(
+              name, r['init_ms'], r['window_ms'], r['process_ms']))
+    return results
+
+# ----------------------------------------------------------------------
+# Demo scenes. Each scene function sets up the objects of a demo and
+# returns its update and draw functions, without the event loop.
+
+def scene_collisions(screen, count):
+    '''Discs and spiders bouncing off each other, see the collisions demo
+
+    count discs and count spiders share a world scaled to keep the 
+    density of the demo, the screen shows its top left corner.
+    '''
+    # The demo has 6 discs and 25 spiders on 800x600 pixels
+    scale = math.sqrt(max(1.0, count / 6.0))
+    width, height = int(DISPLAY_WIDTH * scale), int(DISPLAY_HEIGHT * scale)
+
+    # Like the demo, objects are not allowed to overlap when created
+    discs = objects.GameSpatialGroup(cell_size=64)
+    mass_colors = color.GamePalette.gradient([(25, 25, 255), (250, 250, 255)],
+                                             10)
+    while len(discs) < count:
+        m = random.randint(1, 10)
+        d = objects.GameCircle(radius=25,
+                               fill=mass_colors[mass_colors.lookup(m, 1, 10)],
+                               top=random.randint(0, height - 50),
+                               left=random.randint(0, width - 50),
+                               dx=random.randint(-2, 2),
+                               dy=random.randint(-2, 2), mass=m)
+        if not d.collide(discs):
+            discs.add(d)
+    placed = objects.GameSpatialGroup(cell_size=64)
+    while len(placed) < count:
+        s = objects.GameImage(imagefile='spider.png', scale=0.1,
+                              top=random.randint(0, height - 30),
+                              left=random.randint(0, width - 30),
+                              dx=random.randint(-3, 3),
+                              dy=random.randint(-3, 3))
+        if not s.collide(placed):
+            placed.add(s)
+    spiders = objects.GameSweepGroup(*placed)
+    placed.empty()
+    batch = objects.GameRenderBatch()
+
+    def update():
+        for group, kwargs in ((discs, {'circle': True}),
+                              (spiders, {'mask': True})):
+            for s in group:
+                if s.collide_horiz_window_edge(height):
+                    s.dy *= -1
+                if s.collide_vert_window_edge(width):
+                    s.dx *= -1
+            group.resolve_contacts(**kwargs)
+            group.update()
+        for s in spiders: # turn to face the direction, like the demo
+            if s.dx or s.dy:
+                s.rotate(s.get_angle() - math.pi/2)
+
+    def draw():
+        screen.fill(color.black)
+        batch.add(discs, spiders)
+        batch.draw(screen)
+        pygame.display.flip()
+
+    return update, draw
+
+def scene_ball(screen, count):
+    '''count balls bouncing over a background image, see the ball demo'''
+    background = tiles.GameTileLayer(image='unit-circle.png', 
+                                     fill=pygame.Color(196, 225, 178))
+    balls = pygame.sprite.Group()
+    for c in range(count):
+        balls.add(objects.GameCircle(radius=20, fill=color.indianred,
+                                     top=random.randint(0, 550),
+                                     left=random.randint(0, 750),
+                                     dx=random.randint(1, 3),
+                                     dy=random.randint(1, 3)))
+
+    def update():
+        for ball in balls:
+            ball.update()
+            if ball.collide_horiz_window_edge(DISPLAY_HEIGHT):
+                ball.dy *= -1
+            if ball.collide_vert_window_edge(DISPLAY_WIDTH):
+                ball.dx *= -1
+
+    def draw():
+        screen.fill(pygame.Color(196, 225, 178))
+        background.draw(screen)
+        balls.draw(screen)
+        pygame.display.flip()
+
+    return update, draw
+
+def scene_image(screen, count):
+    '''count snake images moving in circles, see the image demo'''
+    images = [objects.GameImage(imagefile='snake.png') for c in range(count)]
+    starts = [(random.randint(100, 500), random.randint(100, 300))
+              for c in range(count)]
+    n = [i/100 for i in range(-314, 314)]
+    frame = [0]
+
+    def update():
+        k = frame[0] % len(n)
+        frame[0] += 1
+        for image, (xstart, ystart) in zip(images, starts):
+            image.rect.left = int(xstart + math.sin(n[k])*100)
+            image.rect.top = int(ystart + math.cos(n[k])*100)
+
+    def draw():
+        screen.fill(color.black)
+        for image in images:
+            screen.blit(image.image, image.rect)
+        pygame.display.flip()
+
+    return update, draw
+
+def scene_keyboard(screen, count):
+    '''count pads steered left and right, see the keyboard demo'''
+    ellipse = objects.GameEllipse(width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT,
+                                  top=0, left=0, fill=color.darkslategray,
+                                  border=100)
+    line = objects.GameLine(start_pos=(0, DISPLAY_HEIGHT // 2),
+                            end_pos=(DISPLAY_WIDTH, DISPLAY_HEIGHT // 2),
+                            line_width=10, fill=color.slategray)
+    pads = [objects.GameRectangle(width=100, height=25,
+                                  top=random.randint(0, 575),
+                                  left=random.randint(0, 700),
+                                  fill=color.tomato)
+            for c in range(count)]
+    frame = [0]
+
+    def update():
+        frame[0] += 1
+        if frame[0] % 60 == 0: # a key press every second
+            speed = random.choice((-5, 0, 5))
+            for pad in pads:
+                pad.dx = speed
+        for pad in pads:
+            pad.update()
+            if pad.collide_vert_window_edge(DISPLAY_WIDTH):
+                pad.dx = 0
+
+    def draw():
+        screen.fill(color.black)
+        screen.blit(ellipse.image, ellipse.rect)
+        screen.blit(line.image, line.rect)
+        for pad in pads:
+            screen.blit(pad.image, pad.rect)
+        pygame.display.flip()
+
+    return update, draw
+
+def scene_text(screen, count):
+    '''count text elements showing a changing FPS, see the text demo'''
+    texts = [objects.GameTextElement(fontfile='some-time-later.ttf',
+                                     fontsize=72, antialias=False,
+                                     top=random.randint(0, 500),
+                                     left=random.randint(0, 400))
+             for c in range(count)]
+    frame = [0]
+
+    def update():
+        frame[0] += 1
+        t = 'The FPS is: ' + str(round(60 + math.sin(frame[0]), 2))
+        for text in texts:
+            text.render(text=t)
+
+    def draw():
+        screen.fill(color.black)
+        for text in texts:
+            screen.blit(text.image, text.rect)
+        pygame.display.flip()
+
+    return update, draw
+
+def scene_particles(screen, count):
+    '''A fountain of about count particles, see the particles demo'''
+    import pygame_template_particles as particles # needs NumPy
+    fountain = particles.GameParticleEmitter(capacity=count, gravity=0.15,
+                                             colors=[color.white, color.red],
+                                             seed=1)
+    def update():
+        fountain.emit(max(1, count // 60), pos=(DISPLAY_WIDTH // 2, 
+                                                DISPLAY_HEIGHT),
+                      speed=(5, 9), angle=(0.4*math.pi, 0.6*math.pi),
+                      life=(60, 60))
+        fountain.step()
+
+    def draw():
+        screen.fill(color.black)
+        fountain.draw(screen)
+        pygame.display.flip()
+
+    return update, draw
+
+SCENES = {
+    'collisions': scene_collisions,
+    'ball': scene_ball,
+    'image': scene_image,
+    'keyboard': scene_keyboard,
+    'text': scene_text,
+    'particles': scene_particles,
+}
+
+def percentile(values, p):
+    '''Returns the p-th percentile of values, nearest rank'''
+    values = sorted(values)
+    k = max(0, min(len(values) - 1, int(math.ceil(p / 100.0 * len(values))) - 1))
+    return values[k]
+
+def run_scene(scene, count, frames, seed):
+    '''Run a scene for a number of frames, returns the timings
+
+    The frames are run twice, the second time with tracemalloc on to 
+    measure memory allocated per frame without slowing the timed run.
+    '''
+    bootstrap.init('display')
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    random.seed(seed)
+    update, draw = SCENES[scene](screen, count)
+
+    update_ms, draw_ms, frame_ms = [], [], []
+    blocks = sys.getallocatedblocks()
+    for frame in range(frames):
+        start = time.perf_counter()
+        update()
+        middle = time.perf_counter()
+        draw()
+        end = time.perf_counter()
+        update_ms.append(1e3 * (middle - start))
+        draw_ms.append(1e3 * (end - middle))
+        frame_ms.append(1e3 * (end - start))
+    blocks = sys.getallocatedblocks() - blocks
+
+    tracemalloc.start()
+    allocated = 0
+    for frame in range(frames):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        update()
+        draw()
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    pygame.quit()
+
+    return {'scene': scene, 'count': count, 'frames': frames, 'seed': seed,
+            'update_ms': sum(update_ms) / frames,
+            'draw_ms': sum(draw_ms) / frames,
+            'frame_ms_p50': percentile(frame_ms, 50),
+            'frame_ms_p90': percentile(frame_ms, 90),
+            'frame_ms_p99': percentile(frame_ms, 99),
+            'frame_ms_max': max(frame_ms),
+            'alloc_kb_per_frame': allocated / 1024.0 / frames,
+            'blocks_per_frame': blocks / float(frames)}
+
+def bench_scenes(frames=300, counts=(10, 100, 1000), seed=1, scenes=None,
+                 **options):
+    '''Demo scenes with a growing number of sprites
+
+    Args:
+        frames (int): Number of frames to run each scene
+        counts (list(int)): Sprite counts to run each scene with
+        seed (int): Random seed, the same for every run
+        scenes (list(str)): Scenes to run (optional, default is all)
+    '''
+    results = []
+    print('{:10s} {:>6s} {:>10s} {:>10s} {:>10s} {:>10s} {:>10s} {:>11s}'.format(
+          'Scene', 'count', 'update ms', 'draw ms', 'p50 ms', 'p90 ms',
+          'p99 ms', 'alloc kB/f'))
+    for scene in scenes or list(SCENES):
+        for count in counts:
+            r = run_scene(scene, count, frames, seed)
+            results.append(r)
+            print('{:10s} {:>6d} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} '
+                  '{:>10.3f} {:>11.1f}'.format(
+                  scene, count, r['update_ms'], r['draw_ms'],
+                  r['frame_ms_p50'], r['frame_ms_p90'], r['frame_ms_p99'],
+                  r['alloc_kb_per_frame']))
+    return results
+
+BENCHMARKS = {
+    'blit': bench_blit,
+    'dirty': bench_dirty,
+    'memory': bench_memory,
+    'batch': bench_batch,
+    'camera': bench_camera,
+    'rotate': bench_rotate,
+    'mask': bench_mask,
+    'ccd': bench_ccd,
+    'shards': bench_shards,
+    'startup': bench_startup,
+    'palette': bench_palette,
+    'scenes': bench_scenes,
+}
+
+def git_commit():
+    '''Returns the current git commit hash, None outside a git checkout'''
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       stderr=subprocess.DEVNULL,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Pygame template benchmarks')
+    parser.add_argument('names', nargs='*', metavar='benchmark',
+                        help='benchmarks to run: ' + ', '.join(BENCHMARKS))
+    parser.add_argument('--frames', type=int, help='frames per run')
+    parser.add_argument('--counts', default='10,100,1000',
+                        help='comma separated sprite counts for scenes')
+    parser.add_argument('--scenes', help='comma separated scenes: ' +
+                        ', '.join(SCENES))
+    parser.add_argument('--count', type=int, 
+                        help='objects for memory, batch, camera, rotate, '
+                             'mask, ccd, shards and palette')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    parser.add_argument('--json', help='save the results to this JSON file')
+    args = parser.parse_args()
+
+    names = args.names or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark {}, choose from: {}'.format(
+                         name, ', '.join(BENCHMARKS)))
+    options = {'counts': [int(c) for c in args.counts.split(',')],
+               'seed': args.seed}
+    if args.frames:
+        options['frames'] = args.frames
+    if args.count:
+        options['count'] = args.count
+    if args.scenes:
+        options['scenes'] = args.scenes.split(',')
+
+    results = {}
+    for name in names:
+        print('--', name, '-' * (68 - len(name)))
+        results[name] = BENCHMARKS[name](**options)
+
+    if args.json:
+        report = {'commit': git_commit(),
+                  'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                  'python': platform.python_version(),
+                  'pygame': pygame.version.ver,
+                  'options': options,
+                  'results': results}
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('Results saved to', args.json)
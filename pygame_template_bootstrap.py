@@ -0,0 +1,66 @@
+''' Pygame Template Bootstrap
+
+Starts only the pygame subsystems a game uses. pygame.init() starts all
+of them, and opening the audio device or looking for game controllers
+can take longer than the rest of the start up. Short headless runs, like
+the benchmarks, then only pay for what they use:
+
+    import pygame_template_bootstrap as bootstrap
+    bootstrap.init('display')          # instead of pygame.init()
+    bootstrap.init('display', 'mixer') # a game with sound
+
+Subsystems that are not started are started on first use by the template
+objects, e.g. 'font' by the first GameTextElement.
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import logging
+
+import pygame
+
+log = logging.getLogger('pygame_template.bootstrap')
+
+# Subsystems started by pygame.init() that a game may need
+SUBSYSTEMS = ('display', 'font', 'mixer', 'joystick')
+
+def init(*subsystems):
+    '''Start the given pygame subsystems, returns (passed, failed)
+
+    Like pygame.init(), a subsystem that can not be started is counted
+    as failed and logged, instead of raising an error.
+
+    Args:
+        subsystems (str): Names from SUBSYSTEMS (optional, default is
+                          'display')
+    '''
+    passed = failed = 0
+    for name in subsystems or ('display',):
+        if name not in SUBSYSTEMS:
+            raise ValueError('unknown subsystem {}, choose from: {}'.format(
+                             name, ', '.join(SUBSYSTEMS)))
+        module = getattr(pygame, name)
+        if module.get_init():
+            passed += 1
+            continue
+        try:
+            module.init()
+            passed += 1
+        except pygame.error as e:
+            log.warning('Could not start %s: %s', name, e)
+            failed += 1
+    return passed, failed
+
+def require(name):
+    '''Start a pygame subsystem if it is not running yet
+
+    Args:
+        name (str): Name from SUBSYSTEMS
+    '''
+    if not getattr(pygame, name).get_init():
+        log.debug('Starting %s on first use', name)
+        getattr(pygame, name).init()
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,301 @@
+''' Pygame Template Continuous Collision Detection
+
+Swept collision tests that find when in a step two moving shapes first
+touch, and a substep scheduler that moves fast objects in smaller steps,
+so they do not pass through each other or through thin walls.
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import math
+
+import pygame
+
+import pygame_template_objects as objects
+
+# ----------------------------------------------------------------------
+# Swept tests. Each shape moves in a straight line over the step, from
+# its position at time 0 to position + speed at time 1. The tests return
+# (t, normal) for the first contact in the step, with normal the unit
+# vector pointing from the other shape towards the first one, or None
+# if they do not touch. Shapes already touching give t = 0.
+
+def circle_toi(p, v, r, q, u, s):
+    '''Time of impact of two moving circles
+
+    Args:
+        p, q (tuple(float)): Circle centers
+        v, u (tuple(float)): Circle movements over the step
+        r, s (float): Circle radii
+    '''
+    dx, dy = p[0] - q[0], p[1] - q[1]
+    wx, wy = v[0] - u[0], v[1] - u[1]
+    reach = r + s
+    c = dx*dx + dy*dy - reach*reach
+    if c <= 0:
+        return 0.0, _unit(dx, dy)
+    a = wx*wx + wy*wy
+    b = 2 * (dx*wx + dy*wy)
+    disc = b*b - 4*a*c
+    if a == 0 or b >= 0 or disc < 0: # not moving closer
+        return None
+    t = (-b - math.sqrt(disc)) / (2*a)
+    if t > 1:
+        return None
+    return t, _unit(dx + wx*t, dy + wy*t)
+
+def rect_toi(rect, v, other, u):
+    '''Time of impact of two moving rects (axis aligned boxes)
+
+    Args:
+        rect, other (Rect): The rects
+        v, u (tuple(float)): Rect movements over the step
+    '''
+    wx, wy = v[0] - u[0], v[1] - u[1]
+    x = _slab(rect.left, rect.right, other.left, other.right, wx)
+    y = _slab(rect.top, rect.bottom, other.top, other.bottom, wy)
+    if x is None or y is None:
+        return None
+    enter, leave = max(x[0], y[0]), min(x[1], y[1])
+    if enter > leave or enter > 1 or leave < 0:
+        return None
+    if enter < 0: # overlapping, push out along the shallowest side
+        dx = min(rect.right - other.left, other.right - rect.left)
+        dy = min(rect.bottom - other.top, other.bottom - rect.top)
+        if dx < dy:
+            return 0.0, (1.0 if rect.centerx >= other.centerx else -1.0, 0.0)
+        return 0.0, (0.0, 1.0 if rect.centery >= other.centery else -1.0)
+    if x[0] >= y[0]:
+        return enter, (-math.copysign(1.0, wx), 0.0)
+    return enter, (0.0, -math.copysign(1.0, wy))
+
+def _slab(low, high, other_low, other_high, w):
+    '''Returns when the span low-high enters and leaves the other span'''
+    if w > 0:
+        return (other_low - high) / w, (other_high - low) / w
+    if w < 0:
+        return (other_high - low) / w, (other_low - high) / w
+    if high <= other_low or low >= other_high:
+        return None # never overlapping on this axis
+    return -math.inf, math.inf
+
+def segment_toi(p, v, r, a, b):
+    '''Time of impact of a moving circle and a line segment
+
+    Args:
+        p (tuple(float)): Circle center
+        v (tuple(float)): Circle movement over the step
+        r (float): Circle radius, add half the line width for thick lines
+        a, b (tuple(float)): Segment ends
+    '''
+    ex, ey = b[0] - a[0], b[1] - a[1]
+    length = math.hypot(ex, ey)
+    if length == 0:
+        return circle_toi(p, v, r, a, (0, 0), 0)
+    ex, ey = ex / length, ey / length
+    nx, ny = -ey, ex # normal of the segment
+
+    # Distance from the line along its normal, now and after the step
+    dist = (p[0] - a[0])*nx + (p[1] - a[1])*ny
+    along = (p[0] - a[0])*ex + (p[1] - a[1])*ey
+    if abs(dist) <= r and 0 <= along <= length:
+        side = 1.0 if dist >= 0 else -1.0
+        return 0.0, (nx*side, ny*side)
+    speed = v[0]*nx + v[1]*ny
+    best = None
+    if speed != 0 and abs(dist) > r:
+        side = 1.0 if dist > 0 else -1.0
+        t = (dist - side*r) / -speed
+        if 0 <= t <= 1:
+            along_t = along + t*(v[0]*ex + v[1]*ey)
+            if 0 <= along_t <= length:
+                best = (t, (nx*side, ny*side))
+    # The rounded ends of the segment
+    for end in (a, b):
+        hit = circle_toi(p, v, r, end, (0, 0), 0)
+        if hit is not None and (best is None or hit[0] < best[0]):
+            best = hit
+    return best
+
+def _unit(x, y):
+    '''Returns x, y scaled to length 1, straight up if zero'''
+    length = math.hypot(x, y)
+    if length == 0:
+        return (0.0, -1.0)
+    return (x / length, y / length)
+
+def radius(obj):
+    '''Returns the radius used for obj in the swept circle tests'''
+    return objects._collide_radius(obj)
+
+def substeps(obj):
+    '''Returns the number of substeps obj needs to move less than its size
+
+    Objects moving less than their size per step need 1.
+    '''
+    size = min(obj.rect.width, obj.rect.height)
+    if getattr(obj, 'radius', None):
+        size = 2 * obj.radius
+    return max(1, int(math.ceil(math.hypot(obj.dx, obj.dy) / max(size, 1))))
+
+# ----------------------------------------------------------------------
+class GameSubstepper():
+    '''Moves a group of objects one step without tunnelling
+
+    Replaces group.update() followed by the window edge checks and
+    resolve_contacts(). Each object is moved in substeps() substeps, so
+    slow objects move once and only the fast ones are split up. After
+    every substep the moved objects are tested against the walls with a
+    swept test, against the window edges, and against the other objects
+    in the group. Colliding objects are placed where they first touched
+    instead of being rewound to the last position, and then bounce as
+    with resolve_contacts(). Use a GameSpatialGroup for large groups.
+
+        stepper = GameSubstepper(width=800, height=600, walls=[line])
+        stepper.step(balls) # instead of balls.update()
+
+    Args:
+        width (int): Bounce off the left and right edges at 0 and width
+                     (optional, no edges if missing)
+        height (int): Bounce off the top and bottom edges at 0 and height
+                      (optional, no edges if missing)
+        walls (list(GameLine)): Lines to bounce off (optional)
+        circle (bool): Collide objects as circles instead of rects
+                       (optional, default is False)
+        max_substeps (int): Max substeps per step (optional, default is 16)
+
+    Attributes:
+        substeps (int): Substeps used by the last step
+        contacts (list): Object pairs that collided in the last step
+    '''
+    def __init__(self, **kwargs):
+        self.width = kwargs.get('width', None)
+        self.height = kwargs.get('height', None)
+        self.walls = list(kwargs.get('walls', []))
+        self.circle = kwargs.get('circle', False)
+        self.max_substeps = kwargs.get('max_substeps', 16)
+        self.substeps = 0
+        self.contacts = []
+
+    def step(self, group):
+        '''Move every object in group by its dx and dy
+
+        Args:
+            group (sprite.Group): The objects to move
+        '''
+        plan = [(obj, min(substeps(obj), self.max_substeps)) for obj in group]
+        total = max([n for obj, n in plan] or [1])
+        # Float centers, so substeps do not lose fractions of a pixel
+        centers = {}
+        for obj, n in plan:
+            obj._top_prev, obj._left_prev = obj.rect.top, obj.rect.left
+            centers[obj] = list(obj.rect.center)
+        walls = [wall.segment() + (wall.line_width / 2.0,)
+                 for wall in self.walls]
+
+        self.substeps = total
+        self.contacts = []
+        for k in range(total):
+            moves = {}
+            for obj, n in plan:
+                # n of the total substeps, spread evenly
+                if (k + 1) * n // total > k * n // total:
+                    moves[obj] = self._advance(obj, centers[obj], 1.0 / n,
+                                               walls)
+            self._collide(group, moves, centers)
+
+    def _advance(self, obj, center, fraction, walls):
+        '''Move obj by a fraction of its speed, returns the movement'''
+        move = (obj.dx * fraction, obj.dy * fraction)
+        hit = None
+        if walls:
+            r = radius(obj)
+            for a, b, half_width in walls:
+                found = segment_toi(center, move, r + half_width, a, b)
+                if found is None or (hit is not None and found[0] >= hit[0]):
+                    continue
+                nx, ny = found[1]
+                if move[0]*nx + move[1]*ny < 0: # moving into the wall
+                    hit = found
+        if hit is not None: # stop at the wall and bounce off it
+            t, (nx, ny) = hit
+            move = (move[0] * t, move[1] * t)
+            along = obj.dx*nx + obj.dy*ny
+            obj.dx -= 2 * along * nx
+            obj.dy -= 2 * along * ny
+        center[0] += move[0]
+        center[1] += move[1]
+        self._place(obj, center)
+
+        if self.height is not None and obj.collide_horiz_window_edge(self.height):
+            obj.dy *= -1
+            center[1] = obj.rect.centery
+        if self.width is not None and obj.collide_vert_window_edge(self.width):
+            obj.dx *= -1
+            center[0] = obj.rect.centerx
+        return move
+
+    def _collide(self, group, moves, centers):
+        '''Place and bounce the objects that collided in this substep'''
+        spatial = isinstance(group, objects.GameSpatialGroup)
+        swept = {obj: self._swept(obj, move) for obj, move in moves.items()}
+        if spatial and moves:
+            # The others moved too, so look as far as the longest move
+            reach = max(max(abs(m[0]), abs(m[1])) for m in moves.values())
+            reach = 2 * int(math.ceil(reach + group.margin(1.0, self.circle)))
+        done = set()
+        for obj, move in moves.items():
+            area = swept[obj]
+            others = group.query(area.inflate(reach, reach)) if spatial else group
+            for other in others:
+                if other is obj or (other, obj) in done:
+                    continue
+                other_move = moves.get(other, (0, 0))
+                other_area = swept.get(other) or self._swept(other, other_move)
+                if not area.colliderect(other_area):
+                    continue
+                done.add((obj, other))
+                hit = self._toi(obj, move, other, other_move)
+                if hit is None:
+                    continue
+                t, (nx, ny) = hit
+                if (obj.dx - other.dx)*nx + (obj.dy - other.dy)*ny >= 0:
+                    continue # moving apart already
+                # Back to where they first touched in this substep
+                for o, m in ((obj, move), (other, other_move)):
+                    c = centers[o]
+                    c[0] -= m[0] * (1 - t)
+                    c[1] -= m[1] * (1 - t)
+                    self._place(o, c)
+                obj.transfer_momentum(other)
+                self.contacts.append((obj, other))
+
+    def _swept(self, obj, move):
+        '''Returns the area obj covered while it moved by move'''
+        rect = obj.rect
+        if self.circle:
+            r = int(math.ceil(radius(obj)))
+            rect = pygame.Rect(0, 0, 2*r, 2*r)
+            rect.center = obj.rect.center
+        return rect.union(rect.move(-move[0], -move[1]))
+
+    def _toi(self, obj, move, other, other_move):
+        '''Time of impact within the substep that just moved them'''
+        p, q = obj.rect.center, other.rect.center
+        p = (p[0] - move[0], p[1] - move[1])
+        q = (q[0] - other_move[0], q[1] - other_move[1])
+        if self.circle:
+            return circle_toi(p, move, radius(obj), q, other_move, radius(other))
+        rect = obj.rect.copy()
+        rect.center = p
+        start = other.rect.copy()
+        start.center = q
+        return rect_toi(rect, move, start, other_move)
+
+    def _place(self, obj, center):
+        obj.rect.center = (int(round(center[0])), int(round(center[1])))
+        obj._relocate()
+
+if __name__ == "__main__":
+    pass
@@ -1,88 +1,275 @@
 ''' Pygame Template Colors
 
+Named colors, e.g. color.black. Each pygame.Color is made the first time
+its name is used, so importing the module costs next to nothing.
+
+GamePalette keeps many colors in one packed array, for coloring large
+numbers of objects without a pygame.Color each. The named colors are in
+palette:
+
+    shades = GamePalette.gradient(['navy', 'white'], steps=10)
+    fill = shades[shades.lookup(mass, 1, 10)] # (red, green, blue)
+
 Copyright (C) 2020 BITJUNGLE Rune Mathisen
 This code is licensed under a GPLv3 license 
 See http://www.gnu.org/licenses/gpl-3.0.html 
 '''
-import pygame
-
-black = pygame.Color(0,0,0)
-white = pygame.Color(255,255,255)
-
-red = pygame.Color(255,0,0)
-green = pygame.Color(0,255,0)
-blue = pygame.Color(0,0,255)
-
-# https://www.rapidtables.com/web/color/gray-color.html
-gainsboro = pygame.Color(220,220,220)
-lightgray = pygame.Color(211,211,211)
-silver = pygame.Color(192,192,192)
-darkgray = pygame.Color(169,169,169)
-gray = pygame.Color(128,128,128)
-dimgray = pygame.Color(105,105,105)
-lightslategray = pygame.Color(119,136,153)
-slategray = pygame.Color(112,128,144)
-darkslategray = pygame.Color(47,79,79)
-
-# https://www.rapidtables.com/web/color/red-color.html
-lightsalmon = pygame.Color(255,160,122)
-salmon = pygame.Color(250,128,114)
-darksalmon = pygame.Color(233,150,122)
-lightcoral = pygame.Color(240,128,128)
-indianred = pygame.Color(205,92,92)
-crimson = pygame.Color(220,20,60)
-firebrick = pygame.Color(178,34,34)
-red = pygame.Color(255,0,0)
-darkred = pygame.Color(139,0,0)
-maroon = pygame.Color(128,0,0)
-tomato = pygame.Color(255,99,71)
-orangered = pygame.Color(255,69,0)
-palevioletred = pygame.Color(219,112,147)
-
-# https://www.rapidtables.com/web/color/green-color.html
-lawngreen = pygame.Color(124,252,0)
-chartreuse = pygame.Color(127,255,0)
-limegreen = pygame.Color(50,205,50)
-lime = pygame.Color(0,255,0)
-forestgreen = pygame.Color(34,139,34)
-darkgreen = pygame.Color(0,100,0)
-greenyellow = pygame.Color(173,255,47)
-yellowgreen = pygame.Color(154,205,50)
-springgreen = pygame.Color(0,255,127)
-mediumspringgreen = pygame.Color(0,250,154)
-lightgreen = pygame.Color(144,238,144)
-palegreen = pygame.Color(152,251,152)
-darkseagreen = pygame.Color(143,188,143)
-mediumseagreen = pygame.Color(60,179,113)
-lightseagreen = pygame.Color(32,178,170)
-seagreen = pygame.Color(46,139,87)
-olive = pygame.Color(128,128,0)
-darkolivegreen = pygame.Color(85,107,47)
-olivedrab = pygame.Color(107,142,35)
-
-# https://www.rapidtables.com/web/color/blue-color.html
-aliceblue = pygame.Color(240,248,255)
-lavender = pygame.Color(230,230,250)
-powderblue = pygame.Color(176,224,230)
-lightblue = pygame.Color(173,216,230)
-lightskyblue = pygame.Color(135,206,250)
-skyblue = pygame.Color(135,206,235)
-deepskyblue = pygame.Color(0,191,255)
-lightsteelblue = pygame.Color(176,196,222)
-dodgerblue = pygame.Color(30,144,255)
-cornflowerblue = pygame.Color(100,149,237)
-steelblue = pygame.Color(70,130,180)
-cadetblue = pygame.Color(95,158,160)
-mediumslateblue = pygame.Color(123,104,238)
-slateblue = pygame.Color(106,90,205)
-darkslateblue = pygame.Color(72,61,139)
-royalblue = pygame.Color(65,105,225)
-mediumblue = pygame.Color(0,0,205)
-darkblue = pygame.Color(0,0,139)
-navy = pygame.Color(0,0,128)
-midnightblue = pygame.Color(25,25,112)
-blueviolet = pygame.Color(138,43,226)
-indigo = pygame.Color(75,0,130)
+
+# name -> (red, green, blue)
+_RGB = {
+    'black': (0,0,0),
+    'white': (255,255,255),
+
+    'red': (255,0,0),
+    'green': (0,255,0),
+    'blue': (0,0,255),
+
+    # https://www.rapidtables.com/web/color/gray-color.html
+    'gainsboro': (220,220,220),
+    'lightgray': (211,211,211),
+    'silver': (192,192,192),
+    'darkgray': (169,169,169),
+    'gray': (128,128,128),
+    'dimgray': (105,105,105),
+    'lightslategray': (119,136,153),
+    'slategray': (112,128,144),
+    'darkslategray': (47,79,79),
+
+    # https://www.rapidtables.com/web/color/red-color.html
+    'lightsalmon': (255,160,122),
+    'salmon': (250,128,114),
+    'darksalmon': (233,150,122),
+    'lightcoral': (240,128,128),
+    'indianred': (205,92,92),
+    'crimson': (220,20,60),
+    'firebrick': (178,34,34),
+    'darkred': (139,0,0),
+    'maroon': (128,0,0),
+    'tomato': (255,99,71),
+    'orangered': (255,69,0),
+    'palevioletred': (219,112,147),
+
+    # https://www.rapidtables.com/web/color/green-color.html
+    'lawngreen': (124,252,0),
+    'chartreuse': (127,255,0),
+    'limegreen': (50,205,50),
+    'lime': (0,255,0),
+    'forestgreen': (34,139,34),
+    'darkgreen': (0,100,0),
+    'greenyellow': (173,255,47),
+    'yellowgreen': (154,205,50),
+    'springgreen': (0,255,127),
+    'mediumspringgreen': (0,250,154),
+    'lightgreen': (144,238,144),
+    'palegreen': (152,251,152),
+    'darkseagreen': (143,188,143),
+    'mediumseagreen': (60,179,113),
+    'lightseagreen': (32,178,170),
+    'seagreen': (46,139,87),
+    'olive': (128,128,0),
+    'darkolivegreen': (85,107,47),
+    'olivedrab': (107,142,35),
+
+    # https://www.rapidtables.com/web/color/blue-color.html
+    'aliceblue': (240,248,255),
+    'lavender': (230,230,250),
+    'powderblue': (176,224,230),
+    'lightblue': (173,216,230),
+    'lightskyblue': (135,206,250),
+    'skyblue': (135,206,235),
+    'deepskyblue': (0,191,255),
+    'lightsteelblue': (176,196,222),
+    'dodgerblue': (30,144,255),
+    'cornflowerblue': (100,149,237),
+    'steelblue': (70,130,180),
+    'cadetblue': (95,158,160),
+    'mediumslateblue': (123,104,238),
+    'slateblue': (106,90,205),
+    'darkslateblue': (72,61,139),
+    'royalblue': (65,105,225),
+    'mediumblue': (0,0,205),
+    'darkblue': (0,0,139),
+    'navy': (0,0,128),
+    'midnightblue': (25,25,112),
+    'blueviolet': (138,43,226),
+    'indigo': (75,0,130),
+}
+
+def __getattr__(name):
+    '''Returns the named color, made on first use'''
+    rgb = _RGB.get(name)
+    if rgb is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(
+                             __name__, name))
+    import pygame
+    color = globals()[name] = pygame.Color(*rgb)
+    return color
+
+def __dir__():
+    return sorted(set(globals()) | set(_RGB))
+
+# ----------------------------------------------------------------------
+class GamePalette():
+    '''Colors packed in one array, looked up by name or index
+
+    The red, green and blue of every color are three bytes in one array,
+    instead of a pygame.Color object each. palette[k] and palette['name']
+    return (red, green, blue) tuples, which every pygame function taking
+    a color accepts. colors() and mapped() convert the whole palette at
+    once, and lookup() turns values, like masses or speeds, into palette
+    indices. Lists of values give lists of indices, and NumPy arrays are
+    looked up in one vectorized operation.
+
+        discs = GamePalette.gradient([(25, 25, 255), (250, 250, 255)], 10)
+        pixels = discs.mapped(screen)        # one int per color
+        shade = discs.lookup(masses, 1, 10)  # index per disc
+
+    Args:
+        colors (dict or list): Colors by name, or a list of colors, each
+                               a name, (red, green, blue) or pygame.Color
+                               (optional, default is the named colors)
+
+    Attributes:
+        names (list(str)): Color names, None for colors without a name
+    '''
+    def __init__(self, colors=None):
+        if colors is None:
+            colors = _RGB
+        if isinstance(colors, dict):
+            self.names = list(colors)
+            colors = list(colors.values())
+        else:
+            self.names = [c if isinstance(c, str) else None for c in colors]
+        self._rgb = bytearray()
+        for c in colors:
+            self._rgb.extend(_rgb(c))
+        self._index = {name: k for k, name in enumerate(self.names)
+                       if name is not None}
+
+    def __len__(self):
+        '''Returns the number of colors'''
+        return len(self._rgb) // 3
+
+    def __contains__(self, name):
+        '''Returns True if the palette has a color called name'''
+        return name in self._index
+
+    def __getitem__(self, key):
+        '''Returns the (red, green, blue) of a color by index or name'''
+        k = 3 * self.index(key)
+        return tuple(self._rgb[k:k + 3])
+
+    def __iter__(self):
+        rgb = self._rgb
+        for k in range(0, len(rgb), 3):
+            yield tuple(rgb[k:k + 3])
+
+    def index(self, key):
+        '''Returns the index of a color by name, an index is returned as is'''
+        if isinstance(key, str):
+            return self._index[key]
+        if not -len(self) <= key < len(self):
+            raise IndexError('palette index out of range')
+        return key % len(self)
+
+    def color(self, key):
+        '''Returns a new pygame.Color of a color by index or name'''
+        import pygame
+        return pygame.Color(*self[key])
+
+    def colors(self):
+        '''Returns a list with a new pygame.Color for every color'''
+        import pygame
+        return [pygame.Color(*rgb) for rgb in self]
+
+    def mapped(self, surface):
+        '''Returns the mapped pixel value of every color for surface
+
+        The values are what Surface.map_rgb() returns, for writing
+        pixels directly, e.g. with pygame.surfarray.pixels2d.
+
+        Args:
+            surface (Surface): Surface whose pixel format to use
+        '''
+        return [surface.map_rgb(rgb) for rgb in self]
+
+    def nearest(self, color):
+        '''Returns the index of the color closest to color, needs NumPy
+
+        The distances to all colors are computed at once over the packed
+        array. Of equally close colors the first is returned.
+
+        Args:
+            color: A name, (red, green, blue) or pygame.Color
+        '''
+        if not len(self):
+            raise ValueError('nearest() on an empty palette')
+        import numpy as np
+        difference = self.array().astype(np.int32) - _rgb(color)
+        return int(np.einsum('ij,ij->i', difference, difference).argmin())
+
+    def lookup(self, values, low, high):
+        '''Returns the palette indices of values between low and high
+
+        low gets the first color and high the last, values in between
+        the nearest color of an even spread. Values outside are clamped.
+
+        Args:
+            values (float, list or ndarray): Values to look up
+            low (float): Value of the first color
+            high (float): Value of the last color
+        '''
+        top = len(self) - 1
+        scale = top / float(high - low) if high != low else 0.0
+        if hasattr(values, 'ndim'): # NumPy array
+            import numpy as np
+            k = np.rint((values - low) * scale)
+            return np.clip(k, 0, top).astype(np.intp)
+        found = {} # value -> index, values like masses repeat a lot
+
+        def index(value):
+            k = found[value] = min(max(int(round((value - low) * scale)), 0),
+                                   top)
+            return k
+        if isinstance(values, (int, float)):
+            return index(values)
+        return [found[v] if v in found else index(v) for v in values]
+
+    def array(self):
+        '''Returns the colors as a NumPy array of shape (colors, 3)'''
+        import numpy as np
+        return np.frombuffer(self._rgb, dtype=np.uint8).reshape(-1, 3)
+
+    @classmethod
+    def gradient(cls, stops, steps):
+        '''Returns a palette of steps colors blending through stops
+
+        Args:
+            stops (list): Colors to pass through, evenly spread, each a
+                          name, (red, green, blue) or pygame.Color
+            steps (int): Number of colors, one step is the first stop
+        '''
+        stops = [_rgb(c) for c in stops]
+        if len(stops) == 1 or steps == 1:
+            return cls(stops[:1] * steps)
+        colors = []
+        for k in range(steps):
+            position = k * (len(stops) - 1) / float(steps - 1)
+            n = min(int(position), len(stops) - 2)
+            t = position - n
+            a, b = stops[n], stops[n + 1]
+            colors.append(tuple(int(round(a[i] + (b[i] - a[i]) * t))
+                                for i in range(3)))
+        return cls(colors)
+
+def _rgb(color):
+    '''Returns (red, green, blue) of a name, tuple or pygame.Color'''
+    if isinstance(color, str):
+        return _RGB[color]
+    return tuple(color)[:3]
+
+# The named colors
+palette = GamePalette()
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -12,8 +12,11 @@ import math   # Un-comment if needed
 #import random # Un-comment if needed
 
 # -- Game classes ------------------------------------------------------
+import pygame_template_bootstrap as bootstrap
 import pygame_template_colors as color
 import pygame_template_objects as objects
+import pygame_template_tiles as tiles
+import pygame_template_log as gamelog
 
 # -- Game window properties --------------------------------------------
 DISPLAY_WIDTH = 800   # pixels
@@ -22,9 +25,16 @@ WINDOW_TITLE = 'A bouncing ball'
 SCREEN_BG_COLOR = pygame.Color(196, 225, 178) # RGB color code
 FPS = 60 # Frames per second
 
+# -- Logging -----------------------------------------------------------
+# Set the environment variable PYGAME_TEMPLATE_LOG=INFO to log the hit
+# angles, or PYGAME_TEMPLATE_LOG=DEBUG to log the events as well
+log = gamelog.setup()
+event_log = gamelog.GameEventLog()
+
 # -- Preparing game window ---------------------------------------------
+# Start only the pygame subsystems the game uses, faster than pygame.init()
 # https://www.pygame.org/docs/ref/display.html?highlight=init#pygame.display.init
-pygame.init() 
+bootstrap.init('display')
 # https://www.pygame.org/docs/ref/time.html#pygame.time.Clock
 clock = pygame.time.Clock() 
 # https://www.pygame.org/docs/ref/display.html#pygame.display.set_mode
@@ -44,11 +54,12 @@ ball = objects.GameCircle(radius=r, fill=color.indianred,
                           top=y, left=x,
                           dx=3, dy=2)
 
-# Preparing the background image
-unit_circle = objects.GameImage(imagefile='unit-circle.png')
+# Preparing the background image, cut into tiles that are quick to draw
+background = tiles.GameTileLayer(image='unit-circle.png', 
+                                 fill=SCREEN_BG_COLOR)
 
 def print_hit_angle(a):
-    print('hit angle rad:', round(a, 4), 'deg:', round(180.0*a/math.pi))
+    log.info('hit angle rad: %s deg: %s', round(a, 4), round(180.0*a/math.pi))
 
 while running: # Main loop
     for event in pygame.event.get(): # https://www.pygame.org/docs/ref/event.html
@@ -56,16 +67,16 @@ while running: # Main loop
             running = False # Exiting the main loop
         elif event.type == pygame.KEYDOWN:
             key = pygame.key.get_pressed()
-            print('Key pressed: ', key)
+            log.debug('Key pressed: %s', key)
         elif event.type == pygame.KEYUP:
-            print('Key released')
+            log.debug('Key released')
         elif event.type == pygame.MOUSEMOTION:
             mouse = pygame.mouse.get_pos()
-            print('Mouse pos: ', mouse)
+            event_log.log(event, 'Mouse pos') # summed up once a second
         elif event.type == pygame.MOUSEBUTTONUP:
-            print('Mouse button released')
+            log.debug('Mouse button released')
         else:
-            print('Unhandled event', event)
+            event_log.log(event, 'Unhandled event')
 
     screen.fill(SCREEN_BG_COLOR)  # Blanking the screen
 
@@ -83,7 +94,7 @@ while running: # Main loop
     # -- Drawing game objects ------------------------------------------
     # screen.blit() your game objects here
     # https://www.pygame.org/docs/ref/surface.html?highlight=blit#pygame.Surface.blit
-    screen.blit(unit_circle.image, unit_circle.rect)
+    background.draw(screen)
     screen.blit(ball.image, ball.rect)
 
     # Update the full display Surface to the screen
@@ -0,0 +1,176 @@
+''' Pygame Template Log
+
+Leveled logging for the templates, written by a background thread so the
+main loop never waits for the console. Nothing below WARNING is shown
+unless asked for, e.g. to see every event and created object:
+
+    PYGAME_TEMPLATE_LOG=DEBUG python pygame-template.py
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+import pygame
+
+ROOT = 'pygame_template' # Parent of all template loggers
+
+_listener = None
+
+def get_logger(name=None):
+    '''Returns a template logger, use the module or script name
+
+    Args:
+        name (str): Logger name below pygame_template (optional)
+    '''
+    if name in (None, '__main__'):
+        return logging.getLogger(ROOT)
+    return logging.getLogger(ROOT + '.' + name)
+
+def setup(level=None, **kwargs):
+    '''Send template log records through a queue to a background writer
+
+    Safe to call more than once, only the first call sets up the writer.
+
+    Args:
+        level (int or str): Lowest level to log (optional, default is the
+                            PYGAME_TEMPLATE_LOG environment variable or
+                            WARNING, also used for unknown level names)
+        stream (file): Where to write (optional, default is sys.stderr)
+        rate (float): Max records per second for each message, the rest
+                      are counted and reported (optional, default is 10)
+    '''
+    logger = logging.getLogger(ROOT)
+    if level is None:
+        level = os.environ.get('PYGAME_TEMPLATE_LOG', 'WARNING')
+    unknown = None
+    if isinstance(level, str):
+        unknown, level = level, logging.getLevelName(level.upper())
+        if isinstance(level, int):
+            unknown = None
+        else: # getLevelName returns 'Level X' for names it does not know
+            level = logging.WARNING
+    logger.setLevel(level)
+    if _listener is None:
+        _start(logger, kwargs)
+    if unknown is not None:
+        logger.warning('Unknown log level %r, using WARNING', unknown)
+    return logger
+
+def _start(logger, kwargs):
+    '''Start the background writer of setup()'''
+    global _listener
+    writer = logging.StreamHandler(kwargs.get('stream', sys.stderr))
+    writer.setFormatter(logging.Formatter(
+        '%(relativeCreated)8.0f %(levelname)-7s %(name)s: %(message)s'))
+    records = queue.SimpleQueue()
+    handler = logging.handlers.QueueHandler(records)
+    handler.addFilter(RateLimitFilter(kwargs.get('rate', 10)))
+    logger.addHandler(handler)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(records, writer)
+    _listener.start()
+    atexit.register(shutdown)
+
+def shutdown():
+    '''Write the queued records and stop the background writer'''
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+# ----------------------------------------------------------------------
+class RateLimitFilter(logging.Filter):
+    '''Lets through at most rate records per second for each message
+
+    Messages are told apart by their logger and format string, not by
+    their arguments. The number of dropped records is added to the next
+    record of the same message that gets through.
+
+    Args:
+        rate (float): Max records per second for each message
+    '''
+    def __init__(self, rate=10):
+        super(RateLimitFilter, self).__init__()
+        self.rate = rate
+        self._windows = {} # (logger, msg) -> [window start, count, dropped]
+
+    def filter(self, record):
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= 1.0:
+            dropped = window[2] if window else 0
+            window = self._windows[key] = [now, 0, 0]
+            if dropped:
+                record.msg = '{} ({:d} similar messages dropped)'.format(
+                             record.msg, dropped)
+        if window[1] >= self.rate:
+            window[2] += 1
+            return False
+        window[1] += 1
+        return True
+
+# ----------------------------------------------------------------------
+class GameEventLog():
+    '''Logs pygame events, summing up the frequent ones
+
+    Events of the sampled types, like MOUSEMOTION, are counted instead of
+    logged one by one. Every interval seconds one record sums them up with
+    the number of events and the last one. Other events are logged as
+    they come. All records are DEBUG, so this costs next to nothing when
+    the log level is higher.
+
+    Args:
+        logger (logging.Logger): Logger to use (optional)
+        interval (float): Seconds between summaries (optional, default is 1)
+        sampled (list(int)): Event types to sum up (optional, default is
+                             mouse motion, joystick axis and video expose)
+    '''
+    def __init__(self, **kwargs):
+        self.logger = kwargs.get('logger', get_logger('events'))
+        self.interval = kwargs.get('interval', 1.0)
+        self.sampled = set(kwargs.get('sampled', (pygame.MOUSEMOTION,
+                                                  pygame.JOYAXISMOTION,
+                                                  pygame.VIDEOEXPOSE)))
+        self._counts = {}   # event type -> count since the last summary
+        self._last = {}     # event type -> last event of the type
+        self._since = time.monotonic()
+
+    def log(self, event, message='Event'):
+        '''Log an event, or count it if its type is sampled
+
+        Args:
+            event (pygame.event.Event): The event
+            message (str): Text to log with the event (optional)
+        '''
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if event.type in self.sampled:
+            self._counts[event.type] = self._counts.get(event.type, 0) + 1
+            self._last[event.type] = event
+            if time.monotonic() - self._since >= self.interval:
+                self.flush()
+        else:
+            self.logger.debug('%s: %s', message, event)
+
+    def flush(self):
+        '''Log the summaries of the counted events now'''
+        elapsed = time.monotonic() - self._since
+        for kind, count in self._counts.items():
+            self.logger.debug('%s x%d in %.1f s, last: %s',
+                              pygame.event.event_name(kind), count, elapsed,
+                              self._last[kind])
+        self._counts.clear()
+        self._last.clear()
+        self._since = time.monotonic()
+
+if __name__ == "__main__":
+    pass
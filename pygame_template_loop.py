@@ -0,0 +1,129 @@
+''' Pygame Template Loop
+
+A reusable main loop with fixed simulation steps and interpolated drawing.
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import pygame
+import time
+
+import pygame_template_profiler as profiler
+
+# ----------------------------------------------------------------------
+class GameLoop():
+    '''Main loop with a fixed timestep
+
+    The game is simulated in fixed steps, so objects move by the same dx
+    and dy per step however fast or slow the drawing is. The time since
+    the last frame is added to an accumulator, and update() is called once
+    for every whole step in it. If the game falls far behind, at most
+    max_steps steps are run per frame and the rest of the backlog is
+    dropped. draw() gets how far the loop has come towards the next step,
+    use it with GameObject.interpolate or draw_interpolated() to draw
+    objects between their previous and current positions.
+
+    Args:
+        update (function): Called without arguments for each step
+        draw (function): Called with alpha (float, 0.0 to 1.0) each frame
+        handle_event (function): Called with each event (optional)
+        steps_per_second (int): Simulation rate (optional, default is 60)
+        max_fps (int): Frame rate cap (optional, default is no cap)
+        max_steps (int): Max steps per frame (optional, default is 5)
+        profiler (GameProfiler): Times the 'events', 'update', 'draw' and 
+                                 'wait' parts of each frame (optional)
+        assets (GameAssetLoader): Loaded assets are put in place at the 
+                                  start of each frame, timed as 'assets' 
+                                  (optional)
+
+    Attributes:
+        dt (float): Length of one step (seconds)
+        running (bool): The loop runs as long as this is true
+        steps (int): Number of steps run
+        frames (int): Number of frames drawn
+        dropped (int): Number of steps dropped to catch up
+    '''
+    def __init__(self, **kwargs):
+        self.update = kwargs.get('update', lambda: None)
+        self.draw = kwargs.get('draw', lambda alpha: None)
+        self.handle_event = kwargs.get('handle_event', None)
+        self.dt = 1.0 / kwargs.get('steps_per_second', 60)
+        self.max_fps = kwargs.get('max_fps', 0)
+        self.max_steps = kwargs.get('max_steps', 5)
+        self.profiler = kwargs.get('profiler', None)
+        self.assets = kwargs.get('assets', None)
+        if self.profiler is None:
+            self.profiler = profiler.GameProfiler(enabled=False)
+
+        self.clock = pygame.time.Clock()
+        self.running = False
+        self.steps = 0
+        self.frames = 0
+        self.dropped = 0
+        self._accumulator = 0.0
+        self._last = None
+
+    def run(self):
+        '''Run frames until stop() is called or the window is closed'''
+        self.running = True
+        self._last = time.perf_counter()
+        while self.running:
+            self.frame()
+
+    def stop(self):
+        '''Exit the loop after the current frame'''
+        self.running = False
+
+    def frame(self):
+        '''Handle events, run the steps that are due and draw one frame'''
+        now = time.perf_counter()
+        if self._last is None:
+            self._last = now
+        self._accumulator += now - self._last
+        self._last = now
+
+        scope = self.profiler.scope
+        if self.assets is not None and self.assets.pending:
+            with scope('assets'):
+                self.assets.poll()
+        with scope('events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif self.handle_event:
+                    self.handle_event(event)
+
+        steps = 0
+        with scope('update'):
+            while self._accumulator >= self.dt and steps < self.max_steps:
+                self.update()
+                self._accumulator -= self.dt
+                steps += 1
+        if self._accumulator >= self.dt: # too far behind, drop the backlog
+            self.dropped += int(self._accumulator / self.dt)
+            self._accumulator %= self.dt
+        self.steps += steps
+
+        with scope('draw'):
+            self.draw(self._accumulator / self.dt)
+        self.frames += 1
+
+        if self.max_fps:
+            with scope('wait'):
+                self.clock.tick(self.max_fps)
+        self.profiler.end_frame()
+
+def draw_interpolated(surface, sprites, alpha):
+    '''Blit sprites between their previous and current positions
+
+    Args:
+        surface (Surface): Surface to draw on, usually the screen
+        sprites (list(GameObject)): Objects to draw, e.g. a sprite group
+        alpha (float): 0.0 is the previous position, 1.0 the current
+    '''
+    surface.blits([(s.image, s.interpolate(alpha)) for s in sprites],
+                  doreturn=False)
+
+if __name__ == "__main__":
+    pass
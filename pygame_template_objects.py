@@ -6,6 +6,13 @@ See http://www.gnu.org/licenses/gpl-3.0.html
 '''
 import pygame
 import math
+import logging
+import weakref
+from collections import OrderedDict
+
+import pygame_template_bootstrap as bootstrap
+
+log = logging.getLogger('pygame_template.objects')
 
 # ----------------------------------------------------------------------
 class GameObject(pygame.sprite.Sprite):
@@ -23,24 +30,35 @@ class GameObject(pygame.sprite.Sprite):
         rect  (Rect): object for storing rectangular coordinates
         dx (int): Speed in x direction (pixels)
         dy (int): Speed in y direction (pixels)
+        dirty (int): Redraw flag used by GameDirtyGroup, 1 redraws the 
+                     object once, 2 redraws it every frame
     '''
     def __init__(self, **kwargs):
-        print('GameObject(', kwargs, ')')
+        log.debug('GameObject(%s)', kwargs)
         super(GameObject, self).__init__()
+        self._init_fields(kwargs)
 
-        self.image = pygame.Surface((kwargs.get('width', 1), 
-                                     kwargs.get('height', 1)))
-        self.image.fill(pygame.SRCALPHA)
+    def _init_fields(self, kwargs):
+        '''Set up the image, rect, speed and mass, shared with GameSlotObject'''
+        key = self._surface_key(kwargs)
+        if key is None or not kwargs.get('cache', True):
+            self.image = self._new_surface(kwargs)
+        else:
+            self.image = surface_cache.get(key, 
+                                           lambda: self._new_surface(kwargs))
         self.rect = self.image.get_rect()
 
         self.dx = kwargs.get('dx', 0)
         self.dy = kwargs.get('dy', 0)
 
         # For storing previous position, initialize with start position
-        self._top_prev, self._left_prev = self.rect.top, self.rect.left
+        self._top_prev = kwargs.get('top', 0)
+        self._left_prev = kwargs.get('left', 0)
 
         self.m = kwargs.get('mass', 1.0)
 
+        self.dirty = 1
+
     def __repr__(self):
         '''Returns object representation'''
         return '<{:s} at {:s} x:{:n} y:{:n} dx:{:n} dy:{:n}>'.format(
@@ -51,14 +69,52 @@ class GameObject(pygame.sprite.Sprite):
                 self.dx,
                 self.dy)
 
+    def _new_surface(self, kwargs):
+        '''Returns a new Surface for the object'''
+        surface = pygame.Surface((kwargs.get('width', 1), 
+                                  kwargs.get('height', 1)))
+        surface.fill(pygame.SRCALPHA)
+        if _display_format:
+            surface = display_format(surface)
+        return surface
+
+    def _surface_key(self, kwargs):
+        '''Returns the surface_cache key for the object, None if not shared'''
+        return None
+
+    def convert(self):
+        '''Convert the object Surface to the display pixel format'''
+        self.image = display_format(self.image)
+
     def update(self):
         '''Move the object by dx and dy'''
         self._top_prev, self._left_prev = self.rect.top, self.rect.left
         self.rect.move_ip((self.dx, self.dy))
+        self._relocate()
 
     def rewind(self):
         '''Move object back to previous location'''
         self.rect.top, self.rect.left = self._top_prev, self._left_prev
+        self._relocate()
+
+    def interpolate(self, alpha):
+        '''Returns a rect between the previous and the current position
+
+        Used for drawing between two fixed simulation steps.
+
+        Args:
+            alpha (float): 0.0 is the previous position, 1.0 the current
+        '''
+        rect = self.rect.copy()
+        rect.top = round(self._top_prev + (rect.top - self._top_prev)*alpha)
+        rect.left = round(self._left_prev + (rect.left - self._left_prev)*alpha)
+        return rect
+
+    def _relocate(self):
+        '''Tell spatial groups that the object rect has moved'''
+        for group in self.groups():
+            if isinstance(group, GameSpatialGroup):
+                group.relocate(self)
 
     def transfer_momentum(self, obj):
         '''Transfer momentum between two colliding objects'''
@@ -113,21 +169,30 @@ class GameObject(pygame.sprite.Sprite):
     def collide(self, group, **kwargs):
         '''Checks if object collide with object in another sprite group
 
+        Returns the colliding group members in group order.
+
         Args:
             group  (sprite.Group): Find collision with group member
             dokill (bool): True will remove all sprites that collide from group
             ratio  (float): Scale rects/circles to ratio
+            circle (bool): Use circle instead of rect collisions
+            mask   (bool): Pixel perfect collisions, tested only when the
+                           rects overlap
         '''
         dokill = kwargs.get('dokill', False)
-        ratio = kwargs.get('ratio', 1.0)
-        circle = kwargs.get('circle', False)
-
-        if circle:
-            hitlist = pygame.sprite.spritecollide(self, group, dokill, 
-                            pygame.sprite.collide_circle_ratio(ratio))
+        ratio, circle, mask = _collide_args(kwargs)
+        collided = _collided(ratio, circle, mask)
+
+        if isinstance(group, GameSpatialGroup):
+            # Only test the sprites sharing a grid cell with this object
+            candidates = group.query(group.search_area(self, ratio, circle))
+            hitlist = [s for s in candidates if collided(self, s)]
+            hitlist.sort(key=group._order.get) # group order, as spritecollide
+            if dokill:
+                for s in hitlist:
+                    s.kill()
         else:
-            hitlist = pygame.sprite.spritecollide(self, group, dokill, 
-                            pygame.sprite.collide_rect_ratio(ratio))
+            hitlist = pygame.sprite.spritecollide(self, group, dokill, collided)
 
         return hitlist
 
@@ -146,6 +211,7 @@ class GameObject(pygame.sprite.Sprite):
                 self.rect.right = width
             else:
                 pass
+            self._relocate()
         return collision
 
     def collide_horiz_window_edge(self, height):
@@ -163,8 +229,938 @@ class GameObject(pygame.sprite.Sprite):
                 self.rect.bottom = height
             else:
                 pass
+            self._relocate()
         return collision
-        
+
+# ----------------------------------------------------------------------
+def _collide_args(kwargs):
+    '''Returns ratio, circle and mask from collide() style kwargs'''
+    if kwargs.get('mask', False): # masks are tested inside the rects
+        return 1.0, False, True
+    return kwargs.get('ratio', 1.0), kwargs.get('circle', False), False
+
+def _collided(ratio, circle, mask=False):
+    '''Returns the pygame collided callback for a ratio and shape'''
+    if mask:
+        return _collide_mask
+    if circle:
+        return pygame.sprite.collide_circle_ratio(ratio)
+    return pygame.sprite.collide_rect_ratio(ratio)
+
+def _collide_mask(sprite1, sprite2):
+    '''Returns True if the visible pixels of two sprites overlap'''
+    rect1, rect2 = sprite1.rect, sprite2.rect
+    if not rect1.colliderect(rect2):
+        return False
+    return mask_of(sprite1.image).overlap(mask_of(sprite2.image), 
+                                          (rect2.x - rect1.x, 
+                                           rect2.y - rect1.y)) is not None
+
+_masks = weakref.WeakKeyDictionary() # Surface -> pygame.mask.Mask
+
+def mask_of(surface):
+    '''Returns the collision mask of surface, made once per Surface
+
+    The mask has the pixels that are not transparent, by per-pixel alpha
+    or colorkey. Objects sharing an image, or an image variant from the
+    image cache, share its mask. Do not draw on a Surface after its mask
+    is made.
+
+    Args:
+        surface (Surface): The Surface
+    '''
+    mask = _masks.get(surface)
+    if mask is None:
+        mask = _masks[surface] = pygame.mask.from_surface(surface)
+    return mask
+
+def _collide_radius(sprite):
+    '''Returns the radius pygame.sprite.collide_circle uses for sprite'''
+    radius = getattr(sprite, 'radius', None)
+    if radius is None: # pygame uses half the rect diagonal
+        radius = math.hypot(sprite.rect.width, sprite.rect.height) / 2
+    return radius
+
+def _shape_rect(sprite, ratio, circle):
+    '''Returns a rect enclosing the collision shape of sprite'''
+    if circle:
+        size = int(math.ceil(2 * _collide_radius(sprite) * ratio))
+        area = pygame.Rect(0, 0, size, size)
+        area.center = sprite.rect.center
+        return area.union(sprite.rect)
+    if ratio > 1.0:
+        return sprite.rect.inflate(int(sprite.rect.width * (ratio - 1)) + 1,
+                                   int(sprite.rect.height * (ratio - 1)) + 1)
+    return sprite.rect
+
+# ----------------------------------------------------------------------
+class GameCollisionGroup(pygame.sprite.Group):
+    '''Sprite group that finds and resolves collisions between its members
+
+    Extends the pygame.sprite.Group class. find_contacts() returns every 
+    colliding pair in the group once, and resolve_contacts() bounces each 
+    pair off each other exactly once per frame. This replaces removing 
+    each sprite from the group, calling collide() and adding it back.
+
+    This class tests all pairs, GameSpatialGroup and GameSweepGroup find 
+    the contacts with a broadphase.
+
+    Args:
+        sprites (Sprite): Sprites to add to the group (optional)
+
+    Attributes:
+        tested (int): Number of pairs tested by the last find_contacts()
+    '''
+    def __init__(self, *sprites):
+        self.tested = 0
+        super(GameCollisionGroup, self).__init__(*sprites)
+
+    def find_contacts(self, **kwargs):
+        '''Returns a list with every colliding pair of sprites, once each
+
+        Args:
+            ratio  (float): Scale rects/circles to ratio
+            circle (bool): Use circle instead of rect collisions
+            mask   (bool): Pixel perfect collisions
+        '''
+        collided = _collided(*_collide_args(kwargs))
+        items = self.sprites()
+        contacts = []
+        for k, s in enumerate(items):
+            for other in items[k + 1:]:
+                if collided(s, other):
+                    contacts.append((s, other))
+        self.tested = len(items) * (len(items) - 1) // 2
+        return contacts
+
+    def resolve_contacts(self, contacts=None, **kwargs):
+        '''Move colliding objects back and transfer momentum between them
+
+        Every object in a contact is rewound before any momentum is 
+        transferred, so the result does not depend on the contact order. 
+        Returns the list of contacts.
+
+        Args:
+            contacts (list): Pairs from find_contacts() (optional, will 
+                             call find_contacts() with the other args)
+            ratio  (float): Scale rects/circles to ratio
+            circle (bool): Use circle instead of rect collisions
+            mask   (bool): Pixel perfect collisions
+        '''
+        if contacts is None:
+            contacts = self.find_contacts(**kwargs)
+        rewound = set()
+        for pair in contacts:
+            for obj in pair:
+                if obj not in rewound:
+                    rewound.add(obj)
+                    obj.rewind()
+        for obj1, obj2 in contacts:
+            obj1.transfer_momentum(obj2)
+        return contacts
+
+# ----------------------------------------------------------------------
+class GameSpatialGroup(GameCollisionGroup):
+    '''Sprite group with a uniform grid (spatial hash) broadphase
+
+    Extends the GameCollisionGroup class. Every sprite is stored in the 
+    grid cells covered by its rect, so GameObject.collide and 
+    find_contacts() only have to test the sprites found near each object 
+    instead of the whole group. 
+    GameObject keeps the grid up to date when update(), rewind() or the 
+    window edge checks move its rect. Sprites of other classes must call 
+    relocate() themselves after moving.
+
+    Args:
+        sprites (Sprite): Sprites to add to the group (optional)
+        cell_size (int): Grid cell size in pixels (optional, default is 64)
+
+    Attributes:
+        cell_size (int): Grid cell size in pixels
+        tested (int): Number of pairs tested by the last find_contacts()
+    '''
+    def __init__(self, *sprites, **kwargs):
+        self.cell_size = kwargs.get('cell_size', 64)
+        self._cells = {}        # (column, row) -> set of sprites
+        self._sprite_cells = {} # sprite -> (col_min, row_min, col_max, row_max)
+        self._order = {}        # sprite -> number, increasing as added
+        self._added = 0         # number of sprites added so far
+        self._max_half = 0      # largest half width/height seen in the group
+        self._max_radius = 0    # largest collide_circle radius seen
+        super(GameSpatialGroup, self).__init__(*sprites)
+
+    def add_internal(self, sprite, *args):
+        '''Add sprite to the group and to the grid'''
+        super(GameSpatialGroup, self).add_internal(sprite, *args)
+        self._insert(sprite, self._cell_range(sprite.rect))
+        self._order[sprite] = self._added
+        self._added += 1
+        self._max_half = max(self._max_half, 
+                             max(sprite.rect.width, sprite.rect.height) / 2)
+        self._max_radius = max(self._max_radius, _collide_radius(sprite))
+
+    def remove_internal(self, sprite):
+        '''Remove sprite from the group and from the grid'''
+        super(GameSpatialGroup, self).remove_internal(sprite)
+        self._erase(sprite, self._sprite_cells.pop(sprite))
+        del self._order[sprite]
+
+    def relocate(self, sprite):
+        '''Move sprite to the grid cells covered by its current rect'''
+        old = self._sprite_cells.get(sprite)
+        if old is None:
+            return
+        new = self._cell_range(sprite.rect)
+        if new != old:
+            self._erase(sprite, old)
+            self._insert(sprite, new)
+
+    def margin(self, ratio=1.0, circle=False):
+        '''Returns how far group members may collide outside their rects
+
+        Args:
+            ratio  (float): Scale rects/circles to ratio
+            circle (bool): Use circle instead of rect collisions
+        '''
+        if circle:
+            return int(math.ceil(self._max_radius * ratio))
+        if ratio > 1.0:
+            return int(math.ceil(self._max_half * ratio))
+        return 0
+
+    def search_area(self, sprite, ratio=1.0, circle=False):
+        '''Returns the area where group members may collide with sprite
+
+        Args:
+            sprite (Sprite): The colliding sprite
+            ratio  (float): Scale rects/circles to ratio
+            circle (bool): Use circle instead of rect collisions
+        '''
+        margin = 2 * self.margin(ratio, circle)
+        return _shape_rect(sprite, ratio, circle).inflate(margin, margin)
+
+    def find_contacts(self, **kwargs):
+        '''Returns a list with every colliding pair of sprites, once each
+
+        Args:
+            ratio  (float): Scale rects/circles to ratio
+            circle (bool): Use circle instead of rect collisions
+            mask   (bool): Pixel perfect collisions
+        '''
+        ratio, circle, mask = _collide_args(kwargs)
+        collided = _collided(ratio, circle, mask)
+        items = self.sprites()
+        order = {s: k for k, s in enumerate(items)}
+        contacts = []
+        tested = 0
+        for k, s in enumerate(items):
+            # Test each pair once, from the sprite that comes first
+            others = [o for o in self.query(self.search_area(s, ratio, circle)) 
+                      if order[o] > k]
+            others.sort(key=order.get)
+            tested += len(others)
+            for other in others:
+                if collided(s, other):
+                    contacts.append((s, other))
+        self.tested = tested
+        return contacts
+
+    def query(self, rect):
+        '''Returns a list of sprites stored in the cells covered by rect
+
+        Args:
+            rect (Rect): Area to search
+        '''
+        cells = self._cells
+        found = set()
+        col_min, row_min, col_max, row_max = self._cell_range(rect)
+        for col in range(col_min, col_max + 1):
+            for row in range(row_min, row_max + 1):
+                cell = cells.get((col, row))
+                if cell:
+                    found.update(cell)
+        return list(found)
+
+    def colliding(self, rect):
+        '''Returns the sprites whose rect collides with rect, in group order
+
+        Args:
+            rect (Rect): Area to search
+        '''
+        found = [s for s in self.query(rect) if rect.colliderect(s.rect)]
+        found.sort(key=self._order.get)
+        return found
+
+    def _cell_range(self, rect):
+        '''Returns the first and last grid column and row covered by rect'''
+        size = self.cell_size
+        return (rect.left // size, rect.top // size, 
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _insert(self, sprite, cell_range):
+        col_min, row_min, col_max, row_max = cell_range
+        cells = self._cells
+        for col in range(col_min, col_max + 1):
+            for row in range(row_min, row_max + 1):
+                cells.setdefault((col, row), set()).add(sprite)
+        self._sprite_cells[sprite] = cell_range
+
+    def _erase(self, sprite, cell_range):
+        col_min, row_min, col_max, row_max = cell_range
+        cells = self._cells
+        for col in range(col_min, col_max + 1):
+            for row in range(row_min, row_max + 1):
+                cell = cells[(col, row)]
+                cell.discard(sprite)
+                if not cell:
+                    del cells[(col, row)]
+
+# ----------------------------------------------------------------------
+class GameSweepGroup(GameCollisionGroup):
+    '''Sprite group with a sweep and prune broadphase
+
+    Extends the GameCollisionGroup class. The group keeps its sprites 
+    sorted along the x axis between frames. Objects move only a little 
+    from one frame to the next, so an insertion sort restores the order 
+    in close to linear time, and only sprites whose x extents overlap are 
+    tested for collision.
+
+    Args:
+        sprites (Sprite): Sprites to add to the group (optional)
+
+    Attributes:
+        tested (int): Number of pairs tested by the last find_contacts()
+    '''
+    def __init__(self, *sprites):
+        self._sorted = [] # sprites sorted by the left edge of their extent
+        self._resort = False # sprites added since the last sweep
+        super(GameSweepGroup, self).__init__(*sprites)
+
+    def add_internal(self, sprite, *args):
+        '''Add sprite to the group, it is sorted in by the next sweep'''
+        super(GameSweepGroup, self).add_internal(sprite, *args)
+        self._sorted.append(sprite)
+        self._resort = True
+
+    def remove_internal(self, sprite):
+        '''Remove sprite from the group'''
+        super(GameSweepGroup, self).remove_internal(sprite)
+        self._sorted.remove(sprite)
+
+    def find_contacts(self, **kwargs):
+        '''Returns a list with every colliding pair of sprites, once each
+
+        Args:
+            ratio  (float): Scale rects/circles to ratio
+            circle (bool): Use circle instead of rect collisions
+            mask   (bool): Pixel perfect collisions
+        '''
+        ratio, circle, mask = _collide_args(kwargs)
+
+        collided = _collided(ratio, circle, mask)
+        if circle:
+            half = lambda s: _collide_radius(s) * ratio
+        else:
+            half = lambda s: s.rect.width * ratio / 2
+
+        # x extent of every sprite, padded by a pixel for rounding
+        items = self._sorted
+        lows = []
+        highs = []
+        for s in items:
+            h = half(s) + 1
+            lows.append(s.rect.centerx - h)
+            highs.append(s.rect.centerx + h)
+
+        if self._resort: # new sprites can be anywhere, sort them all
+            self._resort = False
+            order = sorted(range(len(items)), key=lows.__getitem__)
+            items[:] = [items[k] for k in order]
+            lows = [lows[k] for k in order]
+            highs = [highs[k] for k in order]
+
+        # Insertion sort, moving the few sprites that changed order
+        for k in range(1, len(items)):
+            low = lows[k]
+            if lows[k - 1] <= low:
+                continue
+            s, high = items[k], highs[k]
+            n = k
+            while n > 0 and lows[n - 1] > low:
+                items[n], lows[n], highs[n] = items[n - 1], lows[n - 1], highs[n - 1]
+                n -= 1
+            items[n], lows[n], highs[n] = s, low, high
+
+        # Sweep: test only the sprites starting before this one ends
+        pairs = []
+        tested = 0
+        count = len(items)
+        for k in range(count):
+            s, high = items[k], highs[k]
+            n = k + 1
+            while n < count and lows[n] <= high:
+                tested += 1
+                if collided(s, items[n]):
+                    pairs.append((s, items[n]))
+                n += 1
+        self.tested = tested
+        return pairs
+
+# ----------------------------------------------------------------------
+class GameDirtyGroup(pygame.sprite.Group):
+    '''Sprite group that only redraws what has changed
+
+    Extends the pygame.sprite.Group class. draw() finds the sprites that 
+    have moved or got a new image since the last frame, restores the 
+    background under their old and new positions, redraws the sprites in 
+    those areas and returns the merged list of changed rects. Pass the 
+    list to pygame.display.update() instead of calling 
+    pygame.display.flip(), and do not fill the screen every frame.
+
+    Changes made by drawing on a sprite image in place are not detected, 
+    set the sprite dirty attribute to 1 to redraw it once.
+
+    Args:
+        sprites (Sprite): Sprites to add to the group (optional)
+        background (Surface or pygame.Color): Background to restore 
+                                              (optional, default is black)
+
+    Attributes:
+        background (Surface or pygame.Color): Background to restore
+    '''
+    def __init__(self, *sprites, **kwargs):
+        self.background = kwargs.get('background', (0, 0, 0))
+        self._drawn = {}     # sprite -> (rect, image) when last drawn
+        self._lost = []      # rects of sprites removed since last draw
+        self._repaint = True # redraw the whole surface on the next draw
+        super(GameDirtyGroup, self).__init__(*sprites)
+
+    def remove_internal(self, sprite):
+        '''Remove sprite from the group, erasing it on the next draw'''
+        super(GameDirtyGroup, self).remove_internal(sprite)
+        last = self._drawn.pop(sprite, None)
+        if last is not None:
+            self._lost.append(last[0])
+
+    def repaint(self):
+        '''Redraw the whole surface on the next draw, e.g. for a new background'''
+        self._repaint = True
+
+    def draw(self, surface):
+        '''Draw the changes since the last frame, returns the changed rects
+
+        Args:
+            surface (Surface): Surface to draw on, usually the screen
+        '''
+        sprites = self.sprites()
+        drawn = self._drawn
+
+        if self._repaint:
+            self._repaint = False
+            self._lost = []
+            self._restore(surface, surface.get_rect())
+            for s in sprites:
+                surface.blit(s.image, s.rect)
+                drawn[s] = (s.rect.copy(), s.image)
+                if getattr(s, 'dirty', 0) == 1:
+                    s.dirty = 0
+            return [surface.get_rect()]
+
+        dirty = self._lost
+        self._lost = []
+        for s in sprites:
+            last = drawn.get(s)
+            flag = getattr(s, 'dirty', 0)
+            if (flag or last is None or last[1] is not s.image 
+                    or last[0] != s.rect):
+                if last is not None:
+                    dirty.append(last[0])
+                dirty.append(s.rect.copy())
+                drawn[s] = (s.rect.copy(), s.image)
+                if flag == 1:
+                    s.dirty = 0
+        if not dirty:
+            return []
+
+        dirty = _merge_rects(dirty)
+        for area in dirty:
+            self._restore(surface, area)
+        # Redraw every sprite overlapping a changed area, clipped to it
+        for s in sprites:
+            rect = s.rect
+            for k in rect.collidelistall(dirty):
+                clip = rect.clip(dirty[k])
+                surface.blit(s.image, clip, clip.move(-rect.x, -rect.y))
+        return dirty
+
+    def _restore(self, surface, area):
+        '''Draw the background in area'''
+        if isinstance(self.background, pygame.Surface):
+            surface.blit(self.background, area, area)
+        else:
+            surface.fill(self.background, area)
+
+def _merge_rects(rects):
+    '''Returns rects with every group of overlapping rects merged into one'''
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        k = rect.collidelist(merged)
+        while k != -1: # the union can overlap more rects
+            rect.union_ip(merged.pop(k))
+            k = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+# ----------------------------------------------------------------------
+class GameRenderBatch():
+    '''Collects blits and draws them all with one Surface.blits call
+
+    Add the objects and groups to draw each frame, then call draw(). 
+    Objects outside the surface clip area are skipped. With sort=True 
+    the blits are sorted by image so blits of the same Surface follow 
+    each other. This changes the stacking order of overlapping objects, 
+    and pygame's software blitter does not gain from it, so it is off 
+    by default.
+
+        batch.add(discs, spiders)
+        batch.draw(screen)
+
+    Args:
+        sort (bool): Sort the blits by image (optional, default is False)
+    '''
+    def __init__(self, **kwargs):
+        self.sort = kwargs.get('sort', False)
+        self._blits = []
+
+    def __len__(self):
+        return len(self._blits)
+
+    def add(self, *objs):
+        '''Add objects to draw, sprite groups and lists add their members'''
+        for obj in objs:
+            if hasattr(obj, 'image'):
+                self._blits.append((obj.image, obj.rect))
+            else:
+                self._blits.extend([(s.image, s.rect) for s in obj])
+
+    def blit(self, image, rect):
+        '''Add a Surface to draw at rect'''
+        self._blits.append((image, rect))
+
+    def clear(self):
+        '''Remove everything added since the last draw'''
+        self._blits = []
+
+    def draw(self, surface):
+        '''Draw and clear the batch, returns the number of blits
+
+        Args:
+            surface (Surface): Surface to draw on, usually the screen
+        '''
+        blits = self._blits
+        self._blits = []
+        clip = surface.get_clip()
+        visible = [blits[k] for k in 
+                   clip.collidelistall([rect for image, rect in blits])]
+        if self.sort:
+            visible.sort(key=_image_id)
+        surface.blits(visible, doreturn=False)
+        return len(visible)
+
+def _image_id(blit):
+    return id(blit[0])
+
+# ----------------------------------------------------------------------
+class GameCamera():
+    '''A view of a part of a world larger than the window
+
+    Objects keep their rect in world coordinates. draw() blits only the 
+    objects that overlap the view, moved to screen coordinates, and 
+    update() only moves the objects near the view. For a 
+    GameSpatialGroup the objects are found with the grid, so the cost 
+    follows what is visible and not the size of the world. Other groups 
+    are tested object by object.
+
+        camera.rect.center = player.rect.center
+        camera.update(enemies, margin=200)
+        camera.draw(screen, background_things, enemies)
+
+    Args:
+        width (int): View width (optional, default is the display width)
+        height (int): View height (optional, default is the display height)
+        top (int): Top of the view in the world (optional, default is 0)
+        left (int): Left of the view in the world (optional, default is 0)
+
+    Attributes:
+        rect (Rect): The world area seen, move it to scroll
+        drawn (int): Number of objects drawn by the last draw()
+    '''
+    def __init__(self, **kwargs):
+        display = pygame.display.get_surface()
+        width, height = display.get_size() if display else (0, 0)
+        self.rect = pygame.Rect(kwargs.get('left', 0), kwargs.get('top', 0),
+                                kwargs.get('width', width),
+                                kwargs.get('height', height))
+        self.drawn = 0
+
+    def visible(self, group, margin=0):
+        '''Returns the objects in group that overlap the view
+
+        Args:
+            group (sprite.Group): Objects to search
+            margin (int): Also return objects this close to the view 
+                          (optional, default is 0)
+        '''
+        area = self.rect.inflate(2 * margin, 2 * margin)
+        if isinstance(group, GameSpatialGroup):
+            return group.colliding(area)
+        sprites = list(group)
+        return [sprites[k] for k in 
+                area.collidelistall([s.rect for s in sprites])]
+
+    def update(self, group, *args, margin=0, **kwargs):
+        '''Call update() on the objects near the view, returns them
+
+        Objects farther away stand still until the view comes near them.
+
+        Args:
+            group (sprite.Group): Objects to update
+            args, kwargs: Passed on to each update()
+            margin (int): Also update objects this close to the view, 
+                          keyword only (optional, default is 0)
+        '''
+        near = self.visible(group, margin)
+        for s in near:
+            s.update(*args, **kwargs)
+        return near
+
+    def draw(self, surface, *groups):
+        '''Draw the visible objects of each group with one blits call
+
+        Args:
+            surface (Surface): Surface to draw on, usually the screen
+            groups (sprite.Group): Groups to draw, in order
+        '''
+        left, top = self.rect.topleft
+        blits = []
+        for group in groups:
+            blits.extend([(s.image, s.rect.move(-left, -top)) 
+                          for s in self.visible(group)])
+        surface.blits(blits, doreturn=False)
+        self.drawn = len(blits)
+
+    def to_screen(self, pos):
+        '''Returns the screen position of a world position'''
+        return (pos[0] - self.rect.left, pos[1] - self.rect.top)
+
+    def to_world(self, pos):
+        '''Returns the world position of a screen position, e.g. the mouse'''
+        return (pos[0] + self.rect.left, pos[1] + self.rect.top)
+
+# ----------------------------------------------------------------------
+_display_format = False # Convert new object Surfaces to the display format
+
+def use_display_format(enabled=True):
+    '''Create object Surfaces in the display pixel format
+
+    Call after pygame.display.set_mode. Blitting a Surface with the same 
+    pixel format as the display skips converting every pixel on every 
+    blit. Objects created earlier can be converted with GameObject.convert.
+
+    Args:
+        enabled (bool): Turn the display format mode on/off
+    '''
+    global _display_format
+    _display_format = enabled
+    surface_cache.clear() # drop Surfaces made in the old format
+
+def display_format(surface):
+    '''Returns surface converted to the display pixel format
+
+    Surfaces with per-pixel alpha keep it. Returns surface unchanged if 
+    the display has not been set up yet.
+
+    Args:
+        surface (Surface): The Surface to convert
+    '''
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+# ----------------------------------------------------------------------
+class GameSurfaceCache():
+    '''Cache of shared Surfaces with least recently used eviction
+
+    Objects created with the same parameters, like GameCircle discs with 
+    the same radius, fill and border, share one Surface from the cache 
+    instead of drawing their own. Shared Surfaces must not be drawn on, 
+    create the object with cache=False to get a private Surface.
+
+    Args:
+        max_bytes (int): Memory cap for the cached pixels (optional, 
+                         default is 32 MB)
+
+    Attributes:
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that created a new Surface
+        evictions (int): Number of Surfaces dropped to stay below max_bytes
+        nbytes (int): Pixel memory used by the cached Surfaces
+    '''
+    def __init__(self, **kwargs):
+        self.max_bytes = kwargs.get('max_bytes', 32*1024*1024)
+        self._surfaces = OrderedDict() # key -> Surface, most recent last
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def get(self, key, create):
+        '''Returns the Surface stored for key, calls create() if missing
+
+        Args:
+            key (tuple): Hashable description of the Surface
+            create (function): Returns a new Surface for key
+        '''
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = create()
+        self._surfaces[key] = surface
+        self.nbytes += _surface_bytes(surface)
+        while self.nbytes > self.max_bytes and len(self._surfaces) > 1:
+            _, old = self._surfaces.popitem(last=False)
+            self.nbytes -= _surface_bytes(old)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        '''Remove all Surfaces from the cache'''
+        self._surfaces.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        '''Returns a dict with the cache statistics'''
+        return {'hits': self.hits, 'misses': self.misses, 
+                'evictions': self.evictions, 'surfaces': len(self._surfaces), 
+                'nbytes': self.nbytes}
+
+def _surface_bytes(surface):
+    '''Returns the pixel memory used by surface'''
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def _color_key(color):
+    '''Returns a hashable key for a color argument'''
+    return tuple(pygame.Color(color))
+
+# Surfaces shared by GameRectangle, GameEllipse and GameCircle objects
+surface_cache = GameSurfaceCache()
+
+# ----------------------------------------------------------------------
+class GameImageCache():
+    '''Cache of decoded image files and their scaled and rotated variants
+
+    Each image file is loaded from disk once. When the display has been 
+    set up with pygame.display.set_mode, the image is converted to the 
+    display pixel format, keeping per-pixel alpha if the file has it. 
+    Scaled and rotated variants are always made from the original image. 
+    Angles are rounded to one of angle_steps directions, so an object 
+    turning a little every frame reuses a few cached variants instead of 
+    rotating its image every frame. The max_variants most recently used 
+    variants are kept. The cached Surfaces are shared and must not be 
+    drawn on.
+
+    Args:
+        max_variants (int): Max number of variants kept (optional, 
+                            default is 1024)
+        angle_steps (int): Number of directions in a full turn (optional,
+                           default is 72, every 5 degrees)
+
+    Attributes:
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that loaded, scaled or rotated
+                      an image
+        evictions (int): Number of variants dropped to stay within 
+                         max_variants
+    '''
+    def __init__(self, **kwargs):
+        self.max_variants = kwargs.get('max_variants', 1024)
+        self.angle_steps = kwargs.get('angle_steps', 72)
+        self._images = {}             # path -> Surface
+        self._variants = OrderedDict() # (path, size, step) -> Surface, LRU
+        self._raw = set()   # paths loaded before the display was ready
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, path):
+        '''Returns True if the image in path is in the cache'''
+        return path in self._images
+
+    def load(self, path):
+        '''Returns the image in path, loading it on first use
+
+        Args:
+            path (str): Image path/filename
+        '''
+        image = self._images.get(path)
+        if image is None:
+            self.misses += 1
+            self._store(path, pygame.image.load(path))
+        else:
+            self.hits += 1
+            self._refresh(path)
+        return self._images[path]
+
+    def replace(self, path, image):
+        '''Cache image for path, dropping the variants of the old image
+
+        Objects already showing a variant keep it until they are scaled,
+        rotated or loaded again.
+
+        Args:
+            path (str): Image path/filename
+            image (Surface): The new image
+        '''
+        self._store(path, image)
+        for key in [k for k in self._variants if k[0] == path]:
+            del self._variants[key]
+
+    def discard(self, path):
+        '''Remove the image in path and its variants, if cached
+
+        Args:
+            path (str): Image path/filename
+        '''
+        self._images.pop(path, None)
+        self._raw.discard(path)
+        for key in [k for k in self._variants if k[0] == path]:
+            del self._variants[key]
+
+    def scaled(self, path, size):
+        '''Returns the image in path smoothly scaled to size
+
+        Args:
+            path (str): Image path/filename
+            size (tuple(int)): Width and height in pixels
+        '''
+        return self.variant(path, size)
+
+    def variant(self, path, size=None, angle=0.0):
+        '''Returns the image in path scaled to size and rotated by angle
+
+        Args:
+            path (str): Image path/filename
+            size (tuple(int)): Width and height in pixels before rotating
+                               (optional, default is the image size)
+            angle (float): Counterclockwise rotation in radians, rounded 
+                           to the nearest of angle_steps directions 
+                           (optional, default is 0.0)
+        '''
+        if size is None:
+            size = self.load(path).get_size()
+        else:
+            self._refresh(path)
+        step = self.angle_step(angle)
+        key = (path, tuple(size), step)
+        variants = self._variants
+        image = variants.get(key)
+        if image is not None:
+            variants.move_to_end(key)
+            self.hits += 1
+            return image
+
+        if step:
+            image = pygame.transform.rotozoom(self.variant(path, size), 
+                                              360.0 * step / self.angle_steps,
+                                              1.0)
+            image = display_format(image)
+        elif key[1] == self.load(path).get_size():
+            image = self._images[path]
+        else:
+            image = pygame.transform.smoothscale(self._images[path], key[1])
+        self.misses += 1
+        variants[key] = image
+        while len(variants) > self.max_variants:
+            variants.popitem(last=False)
+            self.evictions += 1
+        return image
+
+    def angle_step(self, angle):
+        '''Returns the direction number used for angle (radians)'''
+        return int(round(angle * self.angle_steps / (2*math.pi))) % self.angle_steps
+
+    def precompute(self, path, size=None):
+        '''Make the variants for every direction of the image in path
+
+        Call before the main loop starts, so turning objects never wait 
+        for a rotation.
+
+        Args:
+            path (str): Image path/filename
+            size (tuple(int)): Width and height in pixels before rotating
+                               (optional, default is the image size)
+        '''
+        for step in range(self.angle_steps):
+            self.variant(path, size, 2*math.pi * step / self.angle_steps)
+
+    def preload(self, paths, workers=4):
+        '''Decode a list of image files on a thread pool
+
+        Call before the main loop starts, so the loop never waits for 
+        the disk. Files already in the cache are skipped.
+
+        Args:
+            paths (list(str)): Image paths/filenames
+            workers (int): Number of loader threads (optional, default is 4)
+        '''
+        from concurrent.futures import ThreadPoolExecutor
+        paths = [p for p in dict.fromkeys(paths) if p not in self._images]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            images = list(pool.map(pygame.image.load, paths))
+        # Converting uses the display, keep it on this thread
+        for path, image in zip(paths, images):
+            self.misses += 1
+            self._store(path, image)
+
+    def clear(self):
+        '''Remove all images from the cache'''
+        self._images.clear()
+        self._variants.clear()
+        self._raw.clear()
+
+    def stats(self):
+        '''Returns a dict with the cache statistics'''
+        return {'hits': self.hits, 'misses': self.misses, 
+                'evictions': self.evictions, 'images': len(self._images), 
+                'variants': len(self._variants)}
+
+    def _refresh(self, path):
+        '''Convert an image loaded before set_mode, and drop its variants'''
+        if path in self._raw and pygame.display.get_surface():
+            self.replace(path, self._images[path])
+
+    def _store(self, path, image):
+        '''Convert image to the display format if possible and cache it'''
+        if pygame.display.get_surface():
+            image = display_format(image)
+            self._raw.discard(path)
+        else:
+            self._raw.add(path)
+        self._images[path] = image
+
+# Images shared by GameImage objects
+image_cache = GameImageCache()
+
 # ----------------------------------------------------------------------
 class GameRectangle(GameObject):
     '''Rectangular object
@@ -180,6 +1176,8 @@ class GameRectangle(GameObject):
         dx (int): Speed in x direction (pixels)
         dy (int): Speed in y direction (pixels)
         border (int): Border thickness, default is a filled rectangle
+        cache (bool): Share the Surface with identical rectangles (optional, 
+                      default is True)
 
     Attributes:
         image (Surface): object for representing images
@@ -187,17 +1185,26 @@ class GameRectangle(GameObject):
     '''
 
     def __init__(self, **kwargs):
-        print('GameRectangle(', kwargs, ')')
+        log.debug('GameRectangle(%s)', kwargs)
         super(GameRectangle, self).__init__(**kwargs)
 
-        pygame.draw.rect(self.image, 
+        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
+                                        left=kwargs.get('left', 0))
+
+    def _new_surface(self, kwargs):
+        '''Returns a new Surface with the rectangle drawn on it'''
+        surface = GameObject._new_surface(self, kwargs)
+        pygame.draw.rect(surface, 
                          kwargs.get('fill', pygame.SRCALPHA), 
                          (0, 0, kwargs.get('width', 1), 
                          kwargs.get('height', 1)),
                          kwargs.get('border', 0))
-        
-        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
-                                        left=kwargs.get('left', 0))
+        return surface
+
+    def _surface_key(self, kwargs):
+        return ('rect', kwargs.get('width', 1), kwargs.get('height', 1), 
+                _color_key(kwargs.get('fill', pygame.SRCALPHA)), 
+                kwargs.get('border', 0))
 
 # ----------------------------------------------------------------------
 class GameEllipse(GameObject):
@@ -214,6 +1221,8 @@ class GameEllipse(GameObject):
         dx (int): Speed in x direction (pixels)
         dy (int): Speed in y direction (pixels)
         border (int): Border thickness, default is a filled ellipse
+        cache (bool): Share the Surface with identical ellipses (optional, 
+                      default is True)
 
     Attributes:
         image (Surface): object for representing images
@@ -221,17 +1230,26 @@ class GameEllipse(GameObject):
     '''
 
     def __init__(self, **kwargs):
-        print('GameEllipse(', kwargs, ')')
+        log.debug('GameEllipse(%s)', kwargs)
         super(GameEllipse, self).__init__(**kwargs)
 
-        pygame.draw.ellipse(self.image, 
+        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
+                                        left=kwargs.get('left', 0))
+
+    def _new_surface(self, kwargs):
+        '''Returns a new Surface with the ellipse drawn on it'''
+        surface = GameObject._new_surface(self, kwargs)
+        pygame.draw.ellipse(surface, 
                             kwargs.get('fill', pygame.SRCALPHA), 
                             (0, 0, kwargs.get('width', 1), 
                             kwargs.get('height', 1)),
                             kwargs.get('border', 0))
-        
-        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
-                                        left=kwargs.get('left', 0))
+        return surface
+
+    def _surface_key(self, kwargs):
+        return ('ellipse', kwargs.get('width', 1), kwargs.get('height', 1), 
+                _color_key(kwargs.get('fill', pygame.SRCALPHA)), 
+                kwargs.get('border', 0))
 
 # ----------------------------------------------------------------------
 class GameCircle(GameObject):
@@ -247,6 +1265,8 @@ class GameCircle(GameObject):
         border (int): Border width (optional, default is a filled circle)
         dx (int): Speed in x direction (pixels)
         dy (int): Speed in y direction (pixels)
+        cache (bool): Share the Surface with identical circles (optional, 
+                      default is True)
 
     Attributes:
         image (Surface): object for representing images
@@ -254,17 +1274,27 @@ class GameCircle(GameObject):
     '''
 
     def __init__(self, **kwargs):
-        print('GameCircle(', kwargs, ')')
+        log.debug('GameCircle(%s)', kwargs)
         self.radius = kwargs.get('radius', 1)
         kwargs['width'] = kwargs['height'] = self.radius*2
         super(GameCircle, self).__init__(**kwargs)
 
-        pygame.draw.circle(self.image, 
+        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
+                                        left=kwargs.get('left', 0))
+
+    def _new_surface(self, kwargs):
+        '''Returns a new Surface with the circle drawn on it'''
+        surface = GameObject._new_surface(self, kwargs)
+        pygame.draw.circle(surface, 
                            kwargs.get('fill', pygame.Color(128,128,128)), 
                            (self.radius, self.radius), self.radius, 
                            kwargs.get('border', 0))
-        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
-                                        left=kwargs.get('left', 0))
+        return surface
+
+    def _surface_key(self, kwargs):
+        return ('circle', self.radius, 
+                _color_key(kwargs.get('fill', (128, 128, 128))), 
+                kwargs.get('border', 0))
 
 # ----------------------------------------------------------------------
 class GameLine(GameObject):
@@ -283,22 +1313,33 @@ class GameLine(GameObject):
     Attributes:
         image (Surface): object for representing images
         rect  (Rect): object for storing rectangular coordinates
+        start_pos, end_pos (tuple(int)): Line ends on the image
+        line_width (int): Line width
     '''
 
     def __init__(self, **kwargs):
-        print('GameLine(', kwargs, ')')
+        log.debug('GameLine(%s)', kwargs)
         kwargs['width'] = kwargs['height'] = max(max(kwargs.get('start_pos', (1, 1))), 
                                                  max(kwargs.get('end_pos', (1, 1))))
         super(GameLine, self).__init__(**kwargs)
 
+        self.start_pos = tuple(kwargs.get('start_pos', (0, 0)))
+        self.end_pos = tuple(kwargs.get('end_pos', (1, 1)))
+        self.line_width = kwargs.get('line_width', 1)
         pygame.draw.line(self.image,
                          kwargs.get('fill', pygame.SRCALPHA),
-                         kwargs.get('start_pos', (0, 0)),
-                         kwargs.get('end_pos', (1, 1)),
-                         kwargs.get('line_width', 1))
+                         self.start_pos,
+                         self.end_pos,
+                         self.line_width)
         
         self.rect = self.image.get_rect()
 
+    def segment(self):
+        '''Returns the line ends where the line is now, e.g. for walls'''
+        x, y = self.rect.topleft
+        return ((x + self.start_pos[0], y + self.start_pos[1]),
+                (x + self.end_pos[0], y + self.end_pos[1]))
+
 # ----------------------------------------------------------------------
 class GameImage(GameObject):
     '''Image object
@@ -312,36 +1353,88 @@ class GameImage(GameObject):
         top (int): Top position (optional, default pos is 0)
         left (int): Left position (optional, default pos is 0)
         scale (float): scale image by factor
+        angle (float): Rotate image counterclockwise, radians (optional)
         dx (int): Speed in x direction (pixels)
         dy (int): Speed in y direction (pixels)
+        cache (bool): Share the image with other objects loading the same 
+                      file (optional, default is True)
 
     Attributes:
         image (Surface): object for representing images
         rect  (Rect): object for storing rectangular coordinates
+        angle (float): Rotation of the image, radians
     '''
     
     def __init__(self, **kwargs):
-        print('GameImage(', kwargs, ')')
+        log.debug('GameImage(%s)', kwargs)
         super(GameImage, self).__init__(**kwargs)
-
-        self.image = pygame.image.load(kwargs.get('imagefile', None))
-
-        if kwargs.get('width', False) and kwargs.get('height', False):
-            self.scale(kwargs.get('width'), kwargs.get('height'))
+        self._load(kwargs)
+
+    def _load(self, kwargs, source=None):
+        '''Load, scale and place the image file, or source if given'''
+        self.imagefile = kwargs.get('imagefile', None)
+        self._cache = kwargs.get('cache', True) and source is None
+        if source is not None:
+            self._source = source
+        elif self._cache:
+            self._source = image_cache.load(self.imagefile)
         else:
-            self.rect = self.image.get_rect()
+            self._source = pygame.image.load(self.imagefile)
+            if _display_format:
+                self._source = display_format(self._source)
+        self._size = self._source.get_size()
+        self.angle = kwargs.get('angle', 0.0)
 
+        if kwargs.get('width', False) and kwargs.get('height', False):
+            self._size = (kwargs.get('width'), kwargs.get('height'))
         if kwargs.get('scale', False):
-            self.scale(int(self.rect.width * kwargs.get('scale')), 
-                       int(self.rect.height * kwargs.get('scale')))
-
-        self.rect.top = kwargs.get('top', 0)
-        self.rect.left = kwargs.get('left', 0)
+            self._size = (int(self._size[0] * kwargs.get('scale')), 
+                          int(self._size[1] * kwargs.get('scale')))
+        self.image = self._variant()
+        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
+                                        left=kwargs.get('left', 0))
 
     def scale(self, width, height):
         '''Resizes the object Surface to a new resolution, use original image.'''
-        self.image = pygame.transform.smoothscale(self.image, (width, height))
-        self.rect = self.image.get_rect()
+        self._size = (width, height)
+        self.image = self._variant()
+        self.rect = self.image.get_rect(topleft=self.rect.topleft)
+        self._relocate()
+
+    def rotate(self, angle):
+        '''Turn the image to angle, keeping its center
+
+        With the image cache the angle is rounded to one of 
+        image_cache.angle_steps directions, so calling this every frame
+        costs a cache lookup and not a rotation.
+
+        Args:
+            angle (float): Counterclockwise rotation in radians, e.g. 
+                           get_angle() for an image facing right
+        '''
+        self.angle = angle
+        image = self._variant()
+        if image is not self.image:
+            self.image = image
+            rect = image.get_rect(center=self.rect.center)
+            # Move the previous position along, so rewind() and
+            # interpolate() keep the center and not the top left
+            self._top_prev += rect.top - self.rect.top
+            self._left_prev += rect.left - self.rect.left
+            self.rect = rect
+            self._relocate()
+
+    def _variant(self):
+        '''Returns the image scaled and rotated from the original'''
+        if self._cache:
+            return image_cache.variant(self.imagefile, self._size, self.angle)
+        image = self._source
+        if self._size != image.get_size():
+            image = pygame.transform.smoothscale(image, self._size)
+        if self.angle:
+            image = pygame.transform.rotozoom(image, math.degrees(self.angle),
+                                              1.0)
+        return image
 
 # ----------------------------------------------------------------------
 class GameMousePointer(GameObject):
@@ -355,7 +1448,7 @@ class GameMousePointer(GameObject):
         rect  (Rect): object for storing rectangular coordinates
     '''
     def __init__(self, **kwargs):
-        print('GameMousePointer(', kwargs, ')')
+        log.debug('GameMousePointer(%s)', kwargs)
         super(GameMousePointer, self).__init__(**kwargs)
 
         self.obj = kwargs.get('img', None)
@@ -373,6 +1466,264 @@ class GameMousePointer(GameObject):
         pos = pygame.mouse.get_pos()
         self.obj.move_to(x=pos[0], y=pos[1])
 
+# ----------------------------------------------------------------------
+class GameSlotSprite():
+    '''Sprite without a per-object __dict__
+
+    Has the methods of pygame.sprite.Sprite that sprite groups use, and 
+    keeps its groups in a tuple instead of a set. pygame groups accept 
+    any object with these methods as a sprite. Subclasses must list all 
+    their attributes in __slots__, new attributes can not be added to 
+    an object later.
+
+    Args:
+        groups (Group): Groups to add the sprite to (optional)
+    '''
+    __slots__ = ('_groups',)
+
+    def __init__(self, *groups):
+        self._groups = ()
+        if groups:
+            self.add(*groups)
+
+    def add(self, *groups):
+        '''Add the sprite to groups'''
+        for group in groups:
+            if hasattr(group, '_spritegroup'):
+                if group not in self._groups:
+                    group.add_internal(self)
+                    self.add_internal(group)
+            else:
+                self.add(*group)
+
+    def remove(self, *groups):
+        '''Remove the sprite from groups'''
+        for group in groups:
+            if hasattr(group, '_spritegroup'):
+                if group in self._groups:
+                    group.remove_internal(self)
+                    self.remove_internal(group)
+            else:
+                self.remove(*group)
+
+    def add_internal(self, group):
+        if group not in self._groups:
+            self._groups += (group,)
+
+    def remove_internal(self, group):
+        self._groups = tuple(g for g in self._groups if g is not group)
+
+    def update(self, *args, **kwargs):
+        '''Does nothing, override to control sprite behavior'''
+        pass
+
+    def kill(self):
+        '''Remove the sprite from all groups'''
+        for group in self._groups:
+            group.remove_internal(self)
+        self._groups = ()
+
+    def groups(self):
+        '''Returns a list of the groups that contain the sprite'''
+        return list(self._groups)
+
+    def alive(self):
+        '''Returns True when the sprite belongs to one or more groups'''
+        return bool(self._groups)
+
+class GameSlotObject(GameSlotSprite):
+    '''Base class for slotted game objects
+
+    Same arguments, attributes and methods as GameObject, but without a 
+    per-object __dict__. Each object takes less than half the memory and 
+    attribute lookups are faster, which adds up for many thousands of 
+    particles or bullets. Attributes not listed in __slots__ can not be 
+    set, subclass and add them to __slots__ if needed.
+
+    Slotted variants exist for rectangles, ellipses, circles and images:
+    GameSlotRectangle, GameSlotEllipse, GameSlotCircle and GameSlotImage.
+    '''
+    # radius is set by pygame.sprite.collide_circle and _body by PhysicsWorld
+    __slots__ = ('image', 'rect', 'dx', 'dy', 'm', 'dirty',
+                 '_top_prev', '_left_prev', 'radius', '_body')
+
+    def __init__(self, **kwargs):
+        log.debug('GameSlotObject(%s)', kwargs)
+        super(GameSlotObject, self).__init__()
+        self._init_fields(kwargs)
+
+    # The methods are shared with GameObject
+    _init_fields = GameObject._init_fields
+    __repr__ = GameObject.__repr__
+    _new_surface = GameObject._new_surface
+    _surface_key = GameObject._surface_key
+    convert = GameObject.convert
+    update = GameObject.update
+    rewind = GameObject.rewind
+    interpolate = GameObject.interpolate
+    _relocate = GameObject._relocate
+    transfer_momentum = GameObject.transfer_momentum
+    get_tangent = GameObject.get_tangent
+    get_angle = GameObject.get_angle
+    get_speed = GameObject.get_speed
+    calc_dxdy = GameObject.calc_dxdy
+    collide = GameObject.collide
+    collide_vert_window_edge = GameObject.collide_vert_window_edge
+    collide_horiz_window_edge = GameObject.collide_horiz_window_edge
+
+class GameSlotRectangle(GameSlotObject):
+    '''Slotted GameRectangle, see GameSlotObject'''
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        super(GameSlotRectangle, self).__init__(**kwargs)
+        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
+                                        left=kwargs.get('left', 0))
+
+    _new_surface = GameRectangle._new_surface
+    _surface_key = GameRectangle._surface_key
+
+class GameSlotEllipse(GameSlotObject):
+    '''Slotted GameEllipse, see GameSlotObject'''
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        super(GameSlotEllipse, self).__init__(**kwargs)
+        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
+                                        left=kwargs.get('left', 0))
+
+    _new_surface = GameEllipse._new_surface
+    _surface_key = GameEllipse._surface_key
+
+class GameSlotCircle(GameSlotObject):
+    '''Slotted GameCircle, see GameSlotObject'''
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        self.radius = kwargs.get('radius', 1)
+        kwargs['width'] = kwargs['height'] = self.radius*2
+        super(GameSlotCircle, self).__init__(**kwargs)
+        self.rect = self.image.get_rect(top=kwargs.get('top', 0),
+                                        left=kwargs.get('left', 0))
+
+    _new_surface = GameCircle._new_surface
+    _surface_key = GameCircle._surface_key
+
+class GameSlotImage(GameSlotObject):
+    '''Slotted GameImage, see GameSlotObject'''
+    __slots__ = ('imagefile', 'angle', '_cache', '_source', '_size')
+
+    def __init__(self, **kwargs):
+        super(GameSlotImage, self).__init__(**kwargs)
+        self._load(kwargs)
+
+    _load = GameImage._load
+    scale = GameImage.scale
+    rotate = GameImage.rotate
+    _variant = GameImage._variant
+
+# ----------------------------------------------------------------------
+class GameGlyphAtlas():
+    '''Atlas of pre-rendered glyphs for one font, color and antialias
+
+    Each character is rendered with the font once and packed into a 
+    shared atlas Surface. Strings are then drawn by blitting the glyph 
+    areas from the atlas, with no font rendering at all. Kerning and 
+    ligatures are not applied, each glyph advances by its own width.
+
+    Args:
+        font (pygame.font.Font): Font to render the glyphs with
+        color (pygame.Color): Font color
+        antialias (bool): Turn antialias on/off
+    '''
+    def __init__(self, font, color, antialias):
+        self._font = font
+        self.color = color
+        self.antialias = antialias
+        self.height = font.get_height()
+        self.surface = pygame.Surface((512, self.height), pygame.SRCALPHA, 32)
+        self._glyphs = {} # character -> Rect in the atlas Surface
+        self._x = 0       # where the next glyph goes on the last row
+        self._y = 0
+
+    def __len__(self):
+        return len(self._glyphs)
+
+    def glyph(self, char):
+        '''Returns the atlas area holding char, rendering it on first use'''
+        area = self._glyphs.get(char)
+        if area is None:
+            area = self._add(char)
+        return area
+
+    def size(self, text):
+        '''Returns the width and height needed to draw text'''
+        return (sum(self.glyph(c).width for c in text), self.height)
+
+    def draw(self, surface, text, pos=(0, 0)):
+        '''Blit text to surface from the atlas glyphs
+
+        Copies the glyph pixels including their alpha, so surface should 
+        be cleared to transparent first.
+
+        Args:
+            surface (Surface): Target Surface, with per-pixel alpha
+            text (str): The text to draw
+            pos (tuple(int)): Top left position (optional, default is 0, 0)
+        '''
+        areas = [self.glyph(c) for c in text]
+        atlas = self.surface # after any new glyphs have been added
+        x, y = pos
+        blits = []
+        for area in areas:
+            blits.append((atlas, (x, y), area, pygame.BLEND_RGBA_MAX))
+            x += area.width
+        surface.blits(blits, doreturn=False)
+
+    def _add(self, char):
+        '''Render char into the atlas, returns its area'''
+        rendered = self._font.render(char, self.antialias, self.color)
+        w, h = rendered.get_size()
+        if self._x + w > self.surface.get_width(): # start a new row
+            self._x = 0
+            self._y += self.height
+        if self._y + h > self.surface.get_height():
+            self._grow(max(self._y + h, 2 * self.surface.get_height()))
+        area = pygame.Rect(self._x, self._y, w, h)
+        if rendered.get_flags() & pygame.SRCALPHA:
+            # Copy the antialiased pixels and alpha without blending
+            self.surface.blit(rendered, area, special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            self.surface.blit(rendered, area)
+        self._glyphs[char] = area
+        self._x += w
+        return area
+
+    def _grow(self, height):
+        '''Make the atlas Surface taller, keeping the glyphs'''
+        surface = pygame.Surface((self.surface.get_width(), height), 
+                                 pygame.SRCALPHA, 32)
+        surface.blit(self.surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        self.surface = surface
+
+_glyph_atlases = {} # (fontfile, fontsize, color, antialias) -> GameGlyphAtlas
+
+def glyph_atlas(font, fontfile, fontsize, color, antialias):
+    '''Returns the shared glyph atlas for a font, color and antialias
+
+    Args:
+        font (pygame.font.Font): Font to render the glyphs with
+        fontfile (str): Name of the font file, used in the atlas key
+        fontsize (int): Font size, used in the atlas key
+        color (pygame.Color): Font color
+        antialias (bool): Turn antialias on/off
+    '''
+    key = (fontfile, fontsize, _color_key(color), bool(antialias))
+    atlas = _glyph_atlases.get(key)
+    if atlas is None:
+        atlas = _glyph_atlases[key] = GameGlyphAtlas(font, color, antialias)
+    return atlas
+
 # ----------------------------------------------------------------------
 class GameTextElement(GameObject):
     '''Text element
@@ -389,6 +1740,9 @@ class GameTextElement(GameObject):
         fontcolor (pygame.Color): Font color
         dx (int): Speed in x direction (pixels)
         dy (int): Speed in y direction (pixels)
+        atlas (bool): Draw the text from a shared glyph atlas instead of 
+                      rendering the font, good for text that changes every 
+                      frame (optional, default is False)
 
     Attributes:
         image (Surface): object for representing images
@@ -396,11 +1750,12 @@ class GameTextElement(GameObject):
     '''
 
     def __init__(self, **kwargs):
-        print('GameTextElement(', kwargs, ')')
+        log.debug('GameTextElement(%s)', kwargs)
         super(GameTextElement, self).__init__(**kwargs)
 
         self.fontfile = kwargs.get('fontfile', None)
         self.fontsize = kwargs.get('fontsize', 24)
+        bootstrap.require('font')
         try: 
             self._font = pygame.font.Font(self.fontfile, self.fontsize)
         except OSError as e:
@@ -409,15 +1764,66 @@ class GameTextElement(GameObject):
         self.color = kwargs.get('color', (0,0,0))
         self.text = kwargs.get('text', '')
         self.antialias = kwargs.get('antialias', True)
+        self.atlas = kwargs.get('atlas', False)
+        self._rendered = None # what self.image shows
+        self._canvas = None   # reused Surface for atlas text
+        self._drawn = None    # (atlas, text) drawn on the canvas
         self.render(self.text)
         self.rect = self.image.get_rect(top=kwargs.get('top', 0),
                                        left=kwargs.get('left', 0))
     
     def render(self, text=None):
-        '''TODO'''
+        '''Render the text to the object Surface, if it has changed
+
+        Args:
+            text (str): New text to display (optional)
+        '''
         if text is not None: 
             self.text = text
+        rendered = (self.text, _color_key(self.color), self.antialias, 
+                    self.atlas)
+        if rendered == self._rendered:
+            return
+        self._rendered = rendered
+
+        if self.atlas:
+            self._render_atlas()
+            return
         self.image = self._font.render(self.text, self.antialias, self.color)
+        if _display_format:
+            self.image = display_format(self.image)
+
+    def _render_atlas(self):
+        '''Compose the text from glyph atlas blits
+
+        Only the characters after the part that is unchanged since the 
+        last render are cleared and drawn again.
+        '''
+        atlas = glyph_atlas(self._font, self.fontfile, self.fontsize, 
+                            self.color, self.antialias)
+        text = self.text
+        width, height = atlas.size(text)
+        canvas = self._canvas
+        if (canvas is None or canvas.get_width() < width 
+                or canvas.get_height() < height):
+            canvas = self._canvas = pygame.Surface((max(width, 1), height), 
+                                                   pygame.SRCALPHA, 32)
+            self._drawn = None
+
+        old = ''
+        if self._drawn is not None and self._drawn[0] is atlas:
+            old = self._drawn[1]
+        same = 0
+        for a, b in zip(old, text):
+            if a != b:
+                break
+            same += 1
+        x = atlas.size(text[:same])[0]
+        canvas.fill((0, 0, 0, 0), 
+                    (x, 0, max(width, atlas.size(old)[0]) - x, height))
+        atlas.draw(canvas, text[same:], (x, 0))
+        self._drawn = (atlas, text)
+        self.image = canvas.subsurface((0, 0, max(width, 1), height))
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
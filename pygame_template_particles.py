@@ -0,0 +1,205 @@
+''' Pygame Template Particles
+
+Particle effects with tens of thousands of particles, kept in NumPy
+arrays instead of one sprite each. Requires NumPy:
+
+    pip install numpy
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import math
+
+import numpy as np
+import pygame
+
+import pygame_template_colors as color
+import pygame_template_objects as objects
+
+# ----------------------------------------------------------------------
+class GameParticleEmitter():
+    '''A pool of particles simulated and drawn in batches
+
+    Position, speed, lifetime and color of every particle are kept in
+    NumPy arrays with room for capacity particles. emit() takes slots
+    from a free list and sets up a whole burst at once, step() moves all
+    particles and returns the ones whose lifetime is over to the free
+    list. When the pool is full, emit() spawns as many as it can.
+
+    A particle gets its color from colors by how much of its lifetime is
+    left, the first color when it is new and the last when it dies, so
+    e.g. [yellow, orange, red, gray] looks like fire. Particles of size
+    1 are written straight into the pixels of the surface, bigger ones
+    are drawn with one batched blit call.
+
+        sparks = GameParticleEmitter(colors=[color.white, color.orangered])
+        sparks.emit(200, pos=(400, 300), speed=(1, 4), life=(30, 60))
+        sparks.step()         # once per frame or simulation step
+        sparks.draw(screen)
+
+    Args:
+        capacity (int): Max number of particles (optional, default is 10000)
+        size (int): Particle size in pixels (optional, default is 1)
+        colors (list(pygame.Color) or GamePalette): Colors over the 
+                                                    lifetime (optional, 
+                                                    default is white)
+        gravity (float): Added to the y speed each step (optional,
+                         default is 0.0)
+        drag (float): Fraction of speed lost each step (optional, default
+                      is 0.0)
+        seed (int): Random seed (optional)
+
+    Attributes:
+        x, y (ndarray): Particle positions (pixels), for every slot
+        vx, vy (ndarray): Particle speeds (pixels per step), for every slot
+        life (ndarray): Steps left to live, for every slot
+        alive (ndarray): True for the slots in use
+        palette (GamePalette): The colors over the lifetime
+    '''
+    def __init__(self, **kwargs):
+        self.capacity = kwargs.get('capacity', 10000)
+        self.size = kwargs.get('size', 1)
+        colors = kwargs.get('colors', [(255, 255, 255)])
+        if not isinstance(colors, color.GamePalette):
+            colors = color.GamePalette(colors)
+        self.palette = colors
+        self.gravity = kwargs.get('gravity', 0.0)
+        self.drag = kwargs.get('drag', 0.0)
+        self._random = np.random.default_rng(kwargs.get('seed', None))
+
+        n = self.capacity
+        self.x = np.zeros(n, dtype=np.float32)
+        self.y = np.zeros(n, dtype=np.float32)
+        self.vx = np.zeros(n, dtype=np.float32)
+        self.vy = np.zeros(n, dtype=np.float32)
+        self.life = np.zeros(n, dtype=np.int32)
+        self.lifespan = np.ones(n, dtype=np.int32)
+        self.alive = np.zeros(n, dtype=bool)
+        # Stack of free slots, the next one to use is on top
+        self._free = np.arange(n - 1, -1, -1, dtype=np.intp)
+        self._nfree = n
+        self._dots = {} # color -> Surface, for drawing with blits
+
+    def __len__(self):
+        '''Returns the number of live particles'''
+        return self.capacity - self._nfree
+
+    def emit(self, count, pos, **kwargs):
+        '''Spawn a burst of particles, returns the number spawned
+
+        Speed, angle and lifetime are drawn at random between the given
+        limits for each particle.
+
+        Args:
+            count (int): Number of particles
+            pos (tuple(float)): Where they start, (x, y)
+            speed (tuple(float)): Min and max speed in pixels per step
+                                  (optional, default is (0.5, 2))
+            angle (tuple(float)): Min and max direction in radians, 0 is
+                                  right and pi/2 up (optional, default is
+                                  all directions)
+            life (tuple(int)): Min and max lifetime in steps (optional,
+                               default is (30, 90))
+        '''
+        count = min(count, self._nfree)
+        if count <= 0:
+            return 0
+        speed = kwargs.get('speed', (0.5, 2.0))
+        angle = kwargs.get('angle', (0.0, 2*math.pi))
+        life = kwargs.get('life', (30, 90))
+
+        slots = self._free[self._nfree - count:self._nfree]
+        self._nfree -= count
+        v = self._random.uniform(speed[0], speed[1], count)
+        a = self._random.uniform(angle[0], angle[1], count)
+        self.x[slots] = pos[0]
+        self.y[slots] = pos[1]
+        self.vx[slots] = v * np.cos(a)
+        self.vy[slots] = -v * np.sin(a) # positive y is downward
+        self.lifespan[slots] = self._random.integers(life[0], life[1],
+                                                     count, endpoint=True)
+        self.life[slots] = self.lifespan[slots]
+        self.alive[slots] = True
+        return count
+
+    def step(self):
+        '''Move every particle one step and retire the dead ones'''
+        # The whole arrays are updated, it is faster than picking the
+        # live slots and the free ones are overwritten by emit() anyway
+        self.x += self.vx
+        self.y += self.vy
+        if self.drag:
+            self.vx *= 1.0 - self.drag
+            self.vy *= 1.0 - self.drag
+        if self.gravity:
+            self.vy += self.gravity
+        self.life -= 1
+        self._retire(self.alive & (self.life <= 0))
+
+    def clear(self):
+        '''Retire all particles'''
+        self._retire(self.alive)
+
+    def _retire(self, dead):
+        '''Return the slots marked in the bool array dead to the free list'''
+        slots = np.flatnonzero(dead)
+        if len(slots):
+            self.alive[slots] = False
+            self._free[self._nfree:self._nfree + len(slots)] = slots
+            self._nfree += len(slots)
+
+    def draw(self, surface):
+        '''Draw the live particles on surface
+
+        Args:
+            surface (Surface): Surface to draw on, usually the screen
+        '''
+        width, height = surface.get_size()
+        xs = self.x.astype(np.intp)
+        ys = self.y.astype(np.intp)
+        visible = (self.alive & (xs >= 0) & (ys >= 0) &
+                   (xs < width) & (ys < height))
+        slots = np.flatnonzero(visible)
+        if not len(slots):
+            return
+        xs, ys = xs[slots], ys[slots]
+        shade = self._shades(slots)
+
+        if self.size == 1 and surface.get_bytesize() in (1, 2, 4):
+            # Write the pixels directly, the surface is locked meanwhile
+            mapped = np.array(self.palette.mapped(surface))
+            pixels = pygame.surfarray.pixels2d(surface)
+            pixels[xs, ys] = mapped[shade].astype(pixels.dtype)
+            del pixels
+            return
+
+        dots = [self._dot(c) for c in self.palette]
+        blits = getattr(surface, 'fblits', None) # only in some pygame versions
+        sequence = zip([dots[k] for k in shade.tolist()],
+                       zip(xs.tolist(), ys.tolist()))
+        if blits:
+            blits(sequence)
+        else:
+            surface.blits(sequence, doreturn=False)
+
+    def _shades(self, slots):
+        '''Returns the colors index of each particle in slots'''
+        n = len(self.palette)
+        if n == 1:
+            return np.zeros(len(slots), dtype=np.intp)
+        spent = 1.0 - self.life[slots] / self.lifespan[slots]
+        return np.minimum((spent * n).astype(np.intp), n - 1)
+
+    def _dot(self, color):
+        '''Returns a particle Surface of the given color'''
+        key = objects._color_key(color)
+        dot = self._dots.get(key)
+        if dot is None:
+            dot = pygame.Surface((self.size, self.size))
+            dot.fill(color)
+            dot = self._dots[key] = objects.display_format(dot)
+        return dot
+
+if __name__ == "__main__":
+    pass
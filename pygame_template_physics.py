@@ -0,0 +1,222 @@
+''' Pygame Template Physics
+
+Vectorized physics for large numbers of moving objects. Requires NumPy:
+
+    pip install numpy
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import numpy as np
+
+# ----------------------------------------------------------------------
+class PhysicsWorld():
+    '''A world of circular bodies simulated in NumPy arrays
+
+    Positions, velocities, masses and radii of all bodies are kept in
+    contiguous arrays. step() moves every body, bounces it off the window
+    edges and resolves all elastic collisions in one batch, replacing
+    per-sprite calls to GameObject.update, rewind and transfer_momentum.
+    The GameObject sprites added to the world are views: sync() writes
+    the simulated positions and speeds back to their rect, dx and dy, so
+    call it before drawing. Do not call update() on sprites in a world.
+
+    Args:
+        width (int): World width in pixels (optional, no edges if missing)
+        height (int): World height in pixels (optional, no edges if missing)
+        cell_size (int): Broadphase grid cell size in pixels (optional,
+                         default is twice the largest body radius, a
+                         smaller size is raised to that or pairs would
+                         be missed)
+
+    Attributes:
+        x, y (ndarray): Body center positions (pixels)
+        vx, vy (ndarray): Body speeds (pixels per step)
+        m (ndarray): Body masses
+        r (ndarray): Body radii (pixels)
+        sprites (list): The GameObject for each body
+    '''
+    def __init__(self, **kwargs):
+        self.width = kwargs.get('width', None)
+        self.height = kwargs.get('height', None)
+        self.cell_size = kwargs.get('cell_size', None)
+        self.sprites = []
+        self._n = 0
+        self._alloc(64)
+
+    def __len__(self):
+        return self._n
+
+    def _alloc(self, capacity):
+        '''Grow the body arrays to capacity, keeping existing bodies'''
+        for name in ('_x', '_y', '_vx', '_vy', '_m', '_r'):
+            new = np.zeros(capacity, dtype=np.float64)
+            if hasattr(self, name):
+                new[:self._n] = getattr(self, name)[:self._n]
+            setattr(self, name, new)
+
+    # Views of the arrays holding the bodies currently in the world
+    x = property(lambda self: self._x[:self._n])
+    y = property(lambda self: self._y[:self._n])
+    vx = property(lambda self: self._vx[:self._n])
+    vy = property(lambda self: self._vy[:self._n])
+    m = property(lambda self: self._m[:self._n])
+    r = property(lambda self: self._r[:self._n])
+
+    def add(self, obj, radius=None):
+        '''Add a GameObject to the world, returns its body index
+
+        Args:
+            obj (GameObject): Object to simulate
+            radius (float): Collision radius (optional, default is the
+                            object radius or half its smallest side)
+        '''
+        if radius is None:
+            radius = getattr(obj, 'radius',
+                             min(obj.rect.width, obj.rect.height) / 2)
+        if self._n == len(self._x):
+            self._alloc(2 * len(self._x))
+        i = self._n
+        self._x[i], self._y[i] = obj.rect.center
+        self._vx[i], self._vy[i] = obj.dx, obj.dy
+        self._m[i] = obj.m
+        self._r[i] = radius
+        self._n += 1
+        self.sprites.append(obj)
+        obj._body = i
+        return i
+
+    def remove(self, obj):
+        '''Remove a GameObject from the world'''
+        i = obj._body
+        last = self._n - 1
+        if i != last: # move the last body into the free slot
+            for a in (self._x, self._y, self._vx, self._vy, self._m, self._r):
+                a[i] = a[last]
+            self.sprites[i] = self.sprites[last]
+            self.sprites[i]._body = i
+        self.sprites.pop()
+        self._n -= 1
+        del obj._body
+
+    def step(self):
+        '''Advance the simulation one step, returns the colliding pairs'''
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        prev = (x.copy(), y.copy())
+        x += vx
+        y += vy
+        self._bounce_edges()
+        i, j = self.find_pairs()
+        if len(i):
+            self._resolve(i, j, prev)
+        return i, j
+
+    def sync(self):
+        '''Write body positions and speeds back to the sprites'''
+        xs = np.rint(self.x).astype(int).tolist()
+        ys = np.rint(self.y).astype(int).tolist()
+        vxs, vys = self.vx.tolist(), self.vy.tolist()
+        for k, obj in enumerate(self.sprites):
+            obj.rect.center = (xs[k], ys[k])
+            obj.dx, obj.dy = vxs[k], vys[k]
+
+    def find_pairs(self):
+        '''Returns two index arrays with every overlapping pair once'''
+        n = self._n
+        empty = np.zeros(0, dtype=np.intp)
+        if n < 2:
+            return empty, empty
+        x, y, r = self.x, self.y, self.r
+        # Cells smaller than the largest body would miss pairs, the 3x3
+        # cells searched around a body must reach every body touching it
+        size = max(self.cell_size or 0, 2.0 * r.max(), 1.0)
+
+        # Sort bodies by grid cell, one integer key per cell
+        col = np.floor(x / size).astype(np.int64)
+        row = np.floor(y / size).astype(np.int64)
+        col -= col.min() - 1
+        row -= row.min() - 1
+        stride = row.max() + 2
+        keys = col * stride + row
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        pairs_i, pairs_j = [], []
+        for dc in (-1, 0, 1):
+            for dr in (-1, 0, 1):
+                target = keys + (dc * stride + dr)
+                start = np.searchsorted(sorted_keys, target, 'left')
+                count = np.searchsorted(sorted_keys, target, 'right') - start
+                total = count.sum()
+                if total == 0:
+                    continue
+                # Expand each body into one row per body in the target cell
+                a = np.repeat(np.arange(n), count)
+                offset = np.arange(total) - np.repeat(np.cumsum(count) - count,
+                                                      count)
+                b = order[np.repeat(start, count) + offset]
+                keep = a < b
+                pairs_i.append(a[keep])
+                pairs_j.append(b[keep])
+        if not pairs_i:
+            return empty, empty
+        i = np.concatenate(pairs_i)
+        j = np.concatenate(pairs_j)
+
+        # Narrowphase: circles overlap
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        reach = r[i] + r[j]
+        hit = dx*dx + dy*dy < reach*reach
+        return i[hit], j[hit]
+
+    def _bounce_edges(self):
+        '''Clamp bodies to the world edges and flip their speed'''
+        x, y, vx, vy, r = self.x, self.y, self.vx, self.vy, self.r
+        if self.width is not None:
+            low, high = x - r < 0, x + r > self.width
+            x[low] = r[low]
+            x[high] = self.width - r[high]
+            vx[low | high] *= -1
+        if self.height is not None:
+            low, high = y - r < 0, y + r > self.height
+            y[low] = r[low]
+            y[high] = self.height - r[high]
+            vy[low | high] *= -1
+
+    def _resolve(self, i, j, prev):
+        '''Elastic collision response for the pairs i, j'''
+        x, y, vx, vy, m = self.x, self.y, self.vx, self.vy, self.m
+
+        # Contact normal and relative speed along it
+        nx = x[i] - x[j]
+        ny = y[i] - y[j]
+        dist = np.hypot(nx, ny)
+        dist[dist == 0] = 1.0
+        nx /= dist
+        ny /= dist
+        vn = (vx[i] - vx[j])*nx + (vy[i] - vy[j])*ny
+        approaching = vn < 0
+        if not approaching.any():
+            return
+        i, j = i[approaching], j[approaching]
+        nx, ny, vn = nx[approaching], ny[approaching], vn[approaching]
+
+        # Move colliding bodies back to where they were, as rewind() does
+        hit = np.unique(np.concatenate((i, j)))
+        x[hit] = prev[0][hit]
+        y[hit] = prev[1][hit]
+
+        # Elastic collision along the contact normal, see
+        # https://en.wikipedia.org/wiki/Elastic_collision#Two-dimensional_collision_with_two_moving_objects
+        total = m[i] + m[j]
+        ki = 2*m[j]/total * vn
+        kj = 2*m[i]/total * vn
+        np.add.at(vx, i, -ki*nx)
+        np.add.at(vy, i, -ki*ny)
+        np.add.at(vx, j, kj*nx)
+        np.add.at(vy, j, kj*ny)
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,212 @@
+''' Pygame Template Profiler
+
+Per-frame timing scopes, counters, an on-screen overlay and trace files
+for finding out where each frame goes.
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import os
+import time
+from collections import deque
+
+import pygame_template_objects as objects
+
+# ----------------------------------------------------------------------
+class _NullScope():
+    '''Timing scope that does nothing, used when profiling is off'''
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_null_scope = _NullScope()
+
+class _Scope():
+    '''Timing scope, adds its duration to the profiler when it exits'''
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler._add(self._name, self._start, time.perf_counter())
+        return False
+
+# ----------------------------------------------------------------------
+class GameProfiler():
+    '''Collects named timings and counters for each frame
+
+    Wrap the parts of the main loop in scopes and call end_frame() once
+    per frame, GameLoop does this when given a profiler. The samples of
+    the last frames are kept in a ring buffer. When the profiler is not
+    enabled, scope() returns a shared scope that does nothing and count()
+    returns at once, so the calls can stay in the code.
+
+        with profiler.scope('update'):
+            balls.update()
+        profiler.count('blits', len(balls))
+        profiler.end_frame()
+
+    Args:
+        enabled (bool): Collect samples (optional, default is True)
+        history (int): Number of frames to keep (optional, default is 120)
+        trace (bool): Keep every scope as a trace event for dump_trace()
+                      (optional, default is False)
+
+    Attributes:
+        enabled (bool): Collect samples
+        frames (deque): Samples of the last frames, each a dict with
+                        'frame_ms', 'scopes' and 'counters'
+    '''
+    def __init__(self, **kwargs):
+        self.enabled = kwargs.get('enabled', True)
+        history = kwargs.get('history', 120)
+        self.frames = deque(maxlen=history)
+        self.trace = kwargs.get('trace', False)
+        # Scope events of the last frames, in Chrome trace format
+        self._events = deque(maxlen=64 * history)
+        self._scopes = {}
+        self._counters = {}
+        self._frame_start = time.perf_counter()
+        self._epoch = self._frame_start
+
+    def scope(self, name):
+        '''Returns a context manager timing the code in its with block
+
+        Args:
+            name (str): Scope name, times are summed per name and frame
+        '''
+        if not self.enabled:
+            return _null_scope
+        return _Scope(self, name)
+
+    def count(self, name, n=1):
+        '''Add n to a counter for this frame
+
+        Args:
+            name (str): Counter name, e.g. 'collisions hit' or 'blits'
+            n (int): Number to add (optional, default is 1)
+        '''
+        if not self.enabled:
+            return
+        self._counters[name] = self._counters.get(name, 0) + n
+
+    def end_frame(self):
+        '''Store the samples of this frame and start the next one'''
+        now = time.perf_counter()
+        if self.enabled:
+            self.frames.append({'frame_ms': 1e3 * (now - self._frame_start),
+                                'scopes': self._scopes,
+                                'counters': self._counters})
+            if self.trace:
+                self._event('frame', self._frame_start, now)
+            self._scopes = {}
+            self._counters = {}
+        self._frame_start = now
+
+    def stats(self):
+        '''Returns mean and max per scope and counter over the kept frames
+
+        The result has a 'scopes' and a 'counters' dict, mapping each name
+        to a (mean, max) tuple. Timings are in milliseconds, the whole
+        frame is the 'frame' scope. Frames where a scope did not run or a
+        counter was not used count as 0.
+        '''
+        frames = list(self.frames)
+        result = {'scopes': {}, 'counters': {}}
+        if not frames:
+            return result
+        result['scopes']['frame'] = _mean_max([f['frame_ms'] for f in frames])
+        for key in ('scopes', 'counters'):
+            for name in set().union(*(f[key] for f in frames)):
+                result[key][name] = _mean_max([f[key].get(name, 0)
+                                               for f in frames])
+        return result
+
+    def dump_trace(self, filename):
+        '''Write the kept scope events to a Chrome trace JSON file
+
+        Open the file in chrome://tracing, https://ui.perfetto.dev or
+        https://www.speedscope.app. Needs trace=True.
+
+        Args:
+            filename (str): Path of the JSON file to write
+        '''
+        import json # only needed here, keeps the import of this module fast
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': list(self._events),
+                       'displayTimeUnit': 'ms'}, f)
+
+    def _add(self, name, start, end):
+        self._scopes[name] = self._scopes.get(name, 0.0) + 1e3 * (end - start)
+        if self.trace:
+            self._event(name, start, end)
+
+    def _event(self, name, start, end):
+        self._events.append({'name': name, 'ph': 'X', 'pid': os.getpid(),
+                             'tid': 0,
+                             'ts': 1e6 * (start - self._epoch),
+                             'dur': 1e6 * (end - start)})
+
+def _mean_max(values):
+    return (sum(values) / len(values), max(values))
+
+# ----------------------------------------------------------------------
+class GameProfileOverlay():
+    '''On-screen table of the profiler timings and counters
+
+    Uses one GameTextElement per line. The text is only updated every
+    interval frames, so the overlay itself costs a few blits per frame.
+
+    Args:
+        profiler (GameProfiler): Profiler to show
+        top (int): Top position (optional, default pos is 0)
+        left (int): Left position (optional, default pos is 0)
+        fontsize (int): Font size (optional, default is 18)
+        color (pygame.Color): Font color (optional, default is white)
+        interval (int): Frames between updates (optional, default is 30)
+    '''
+    def __init__(self, profiler, **kwargs):
+        self.profiler = profiler
+        self.top = kwargs.get('top', 0)
+        self.left = kwargs.get('left', 0)
+        self.fontsize = kwargs.get('fontsize', 18)
+        self.color = kwargs.get('color', (255, 255, 255))
+        self.interval = kwargs.get('interval', 30)
+        self._lines = []
+        self._frame = 0
+
+    def draw(self, surface):
+        '''Blit the overlay to surface, updating the text when it is due'''
+        if self._frame % self.interval == 0:
+            self._update()
+        self._frame += 1
+        for line in self._lines:
+            surface.blit(line.image, line.rect)
+
+    def _update(self):
+        stats = self.profiler.stats()
+        scopes, counters = stats['scopes'], stats['counters']
+        texts = []
+        for name in sorted(scopes, key=lambda n: (n != 'frame', n)):
+            texts.append('{:s}: {:.2f} ms (max {:.2f})'.format(
+                         name, *scopes[name]))
+        for name in sorted(counters):
+            texts.append('{:s}: {:.1f} (max {:.0f})'.format(
+                         name, *counters[name]))
+        while len(self._lines) < len(texts):
+            self._lines.append(objects.GameTextElement(
+                fontsize=self.fontsize, color=self.color, left=self.left,
+                top=self.top + len(self._lines) * self.fontsize))
+        del self._lines[len(texts):]
+        for line, text in zip(self._lines, texts):
+            line.render(text)
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,307 @@
+''' Pygame Template Shards
+
+Simulation of very large worlds on several CPU cores. The world is split
+into a grid of regions, and the bodies of each region are moved by a
+worker process with the GameObject physics. Requires NumPy:
+
+    pip install numpy
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+import pygame_template_objects as objects
+
+# Body fields, one row each in the shared arrays
+FIELDS = ('left', 'top', 'width', 'height', 'dx', 'dy', 'm', 'radius',
+          'region')
+_F = {name: k for k, name in enumerate(FIELDS)}
+
+DEAD = -1 # region of an empty slot
+
+# ----------------------------------------------------------------------
+class ShardedWorld():
+    '''A world of bodies split into regions simulated in worker processes
+
+    The bodies are kept in two arrays in shared memory, one with the state
+    before the step and one for the state after it, so the workers never
+    wait for each other. In step() every worker moves the bodies of one
+    region with GameObject.update, the window edge checks and
+    GameSpatialGroup.resolve_contacts, exactly as the demos do in one
+    process. Bodies of the neighbouring regions within halo pixels of
+    the region are simulated along with them, so contacts across the
+    border are found on both sides, but only the region's own bodies are
+    written back. Bodies that have moved into another region are then
+    handed over to it. The main process only reads the positions, with
+    sync() or positions().
+
+    Contacts are resolved from the same state on both sides of a border,
+    so the result differs only when a chain of contacts reaches further
+    than the halo. Start a process for each CPU core and use more regions
+    than processes, so a crowded region does not hold up the step.
+
+        with ShardedWorld(width=8000, height=6000, regions=(4, 4)) as world:
+            for ball in balls:
+                world.add(ball)
+            for step in range(10000):
+                world.step()
+            world.sync() # write positions back to the balls
+
+    On platforms that start processes with spawn (Windows, macOS), create
+    the world below if __name__ == "__main__".
+
+    Args:
+        width (int): World width in pixels, bodies bounce off the edges
+        height (int): World height in pixels
+        regions (tuple(int)): Columns and rows of regions (optional,
+                              default is (2, 2))
+        processes (int): Worker processes (optional, default is the
+                         number of CPU cores)
+        capacity (int): Max number of bodies (optional, default is 100000)
+        circle (bool): Collide bodies as circles instead of rects
+                       (optional, default is False)
+        halo (int): How far into the neighbour regions to look, in pixels
+                    (optional, default is the size of the largest body
+                    plus twice the fastest speed, found each step)
+
+    Attributes:
+        sprites (list): The GameObject for each slot, None for empty slots
+        contacts (int): Number of contacts resolved by the last step
+    '''
+    def __init__(self, **kwargs):
+        self.width = kwargs['width']
+        self.height = kwargs['height']
+        self.columns, self.rows = kwargs.get('regions', (2, 2))
+        self.capacity = kwargs.get('capacity', 100000)
+        self.circle = kwargs.get('circle', False)
+        self.halo = kwargs.get('halo', None)
+        self.sprites = [None] * self.capacity
+        self.contacts = 0
+        self._free = list(range(self.capacity - 1, -1, -1))
+        self._n = 0
+
+        shape = (2, len(FIELDS), self.capacity)
+        size = int(np.prod(shape)) * np.dtype(np.float64).itemsize
+        self._memory = shared_memory.SharedMemory(create=True, size=size)
+        self._state = np.ndarray(shape, dtype=np.float64,
+                                 buffer=self._memory.buf)
+        self._state[:, _F['region']] = DEAD
+        self._current = 0 # which of the two arrays holds the state
+
+        config = {'memory': self._memory.name, 'shape': shape,
+                  'width': self.width, 'height': self.height,
+                  'columns': self.columns, 'rows': self.rows,
+                  'circle': self.circle}
+        try:
+            self._pool = multiprocessing.Pool(kwargs.get('processes', None),
+                                              initializer=_attach,
+                                              initargs=(config,))
+        except BaseException:
+            # close() is never called, do not leave the segment behind
+            del self._state
+            self._memory.close()
+            self._memory.unlink()
+            raise
+
+    def __len__(self):
+        '''Returns the number of bodies in the world'''
+        return self._n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def state(self):
+        '''The current body arrays, one row per name in FIELDS'''
+        return self._state[self._current]
+
+    def add(self, obj):
+        '''Add a GameObject to the world, returns its slot
+
+        Args:
+            obj (GameObject): Object to simulate, its rect, dx, dy, mass
+                              and radius are copied into the world, 
+                              objects without a radius get half their 
+                              diagonal as pygame.sprite.collide_circle
+        '''
+        if not self._free:
+            raise ValueError('ShardedWorld is full, capacity {:d}'.format(
+                             self.capacity))
+        i = self._free.pop()
+        rect = obj.rect
+        radius = getattr(obj, 'radius', None) or 0.5 * math.hypot(*rect.size)
+        row = self.state[:, i]
+        row[:] = (rect.left, rect.top, rect.width, rect.height,
+                  obj.dx, obj.dy, obj.m, radius,
+                  self._region(rect.centerx, rect.centery))
+        self.sprites[i] = obj
+        self._n += 1
+        return i
+
+    def remove(self, i):
+        '''Remove the body in slot i from the world'''
+        self.state[_F['region'], i] = DEAD
+        self.sprites[i] = None
+        self._free.append(i)
+        self._n -= 1
+
+    def step(self):
+        '''Advance the simulation one step in the worker processes'''
+        state = self.state
+        live = state[_F['region']] != DEAD
+        halo = self.halo
+        if halo is None:
+            size = np.maximum(state[_F['width']], state[_F['height']])[live]
+            speed = np.maximum(np.abs(state[_F['dx']]),
+                               np.abs(state[_F['dy']]))[live]
+            halo = 0
+            if len(size):
+                halo = int(math.ceil(size.max() + 2 * speed.max()))
+
+        tasks = [(region, self._current, halo)
+                 for region in range(self.columns * self.rows)]
+        self.contacts = sum(self._pool.map(_step_region, tasks))
+        self._current = 1 - self._current
+
+        # Hand the bodies that have crossed a border over to their new region
+        regions = state[_F['region']]
+        state = self.state
+        state[_F['region']] = regions # slots added or removed since last step
+        live = state[_F['region']] != DEAD
+        centerx = state[_F['left']] + state[_F['width']] // 2
+        centery = state[_F['top']] + state[_F['height']] // 2
+        state[_F['region'], live] = self._region(centerx[live], centery[live])
+
+    def positions(self):
+        '''Returns the left and top arrays of all slots, see sprites'''
+        state = self.state
+        return state[_F['left']], state[_F['top']]
+
+    def sync(self):
+        '''Write body positions and speeds back to the sprites'''
+        state = self.state
+        lefts, tops = state[_F['left']].tolist(), state[_F['top']].tolist()
+        dxs, dys = state[_F['dx']].tolist(), state[_F['dy']].tolist()
+        for i, obj in enumerate(self.sprites):
+            if obj is not None:
+                obj.rect.topleft = (int(lefts[i]), int(tops[i]))
+                obj.dx, obj.dy = dxs[i], dys[i]
+
+    def close(self):
+        '''Stop the worker processes and free the shared memory'''
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            del self._state
+            self._memory.close()
+            self._memory.unlink()
+
+    def _region(self, x, y):
+        '''Returns the region number at a world position (or arrays)'''
+        col = np.clip(np.floor_divide(x * self.columns, self.width),
+                      0, self.columns - 1)
+        row = np.clip(np.floor_divide(y * self.rows, self.height),
+                      0, self.rows - 1)
+        return row * self.columns + col
+
+# ----------------------------------------------------------------------
+# Worker process side. Each worker attaches to the shared memory once and
+# keeps a body object for every slot it has simulated.
+
+class _Body(objects.GameSlotObject):
+    '''A body simulated in a worker, a GameSlotObject without an image'''
+    __slots__ = ('slot',)
+
+    def __init__(self, slot):
+        objects.GameSlotSprite.__init__(self)
+        self.image = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.dx = self.dy = 0
+        self.m = 1.0
+        self.radius = 0.0
+        self.slot = slot
+        self.dirty = 0
+        self._top_prev = self._left_prev = 0
+
+_worker = {}
+
+def _attach(config):
+    '''Pool initializer, attaches the worker to the shared body arrays'''
+    memory = shared_memory.SharedMemory(name=config['memory'])
+    _worker.update(config)
+    _worker['shared'] = memory # keep the mapping open
+    _worker['state'] = np.ndarray(config['shape'], dtype=np.float64,
+                                  buffer=memory.buf)
+    _worker['bodies'] = {}
+
+def _step_region(task):
+    '''Move the bodies of one region, returns the contacts resolved'''
+    region, current, halo = task
+    src = _worker['state'][current]
+    dst = _worker['state'][1 - current]
+    width, height = _worker['width'], _worker['height']
+    columns, rows = _worker['columns'], _worker['rows']
+
+    col, row = region % columns, region // columns
+    x0, x1 = col * width / columns, (col + 1) * width / columns
+    y0, y1 = row * height / rows, (row + 1) * height / rows
+    regions = src[_F['region']]
+    left, top = src[_F['left']], src[_F['top']]
+    right, bottom = left + src[_F['width']], top + src[_F['height']]
+    own = np.flatnonzero(regions == region)
+    near = np.flatnonzero((regions != region) & (regions != DEAD) &
+                          (right > x0 - halo) & (left < x1 + halo) &
+                          (bottom > y0 - halo) & (top < y1 + halo))
+
+    bodies = _worker['bodies']
+    rows_ = src[:, np.concatenate((own, near))].T.tolist()
+    group = objects.GameSpatialGroup()
+    members = []
+    for i, values in zip(own.tolist() + near.tolist(), rows_):
+        body = bodies.get(i)
+        if body is None:
+            body = bodies[i] = _Body(i)
+        body.rect.update(int(values[0]), int(values[1]),
+                         int(values[2]), int(values[3]))
+        body.dx, body.dy, body.m = values[4], values[5], values[6]
+        body.radius = values[7]
+        members.append(body)
+    group.add(*members)
+
+    # The same steps as the demos, see pygame_template_demo_ball.py
+    for body in members:
+        body.update()
+        if body.collide_horiz_window_edge(height):
+            body.dy *= -1
+        if body.collide_vert_window_edge(width):
+            body.dx *= -1
+    contacts = group.resolve_contacts(circle=_worker['circle'])
+    group.empty()
+
+    # Write back the region's own bodies, the rest is done by their regions
+    dst[:, own] = src[:, own]
+    if len(own):
+        moved = np.array([(b.rect.left, b.rect.top, b.dx, b.dy)
+                          for b in members[:len(own)]], dtype=np.float64).T
+        dst[_F['left'], own] = moved[0]
+        dst[_F['top'], own] = moved[1]
+        dst[_F['dx'], own] = moved[2]
+        dst[_F['dy'], own] = moved[3]
+    # A contact across the border is found on both sides, count it once
+    owned = set(members[:len(own)])
+    return sum(1 for a, b in contacts
+               if (a if a.slot < b.slot else b) in owned)
+
+if __name__ == "__main__":
+    pass
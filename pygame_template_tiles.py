@@ -0,0 +1,204 @@
+''' Pygame Template Tiles
+
+Tiled background layers for worlds larger than the window. Only the tiles
+in view are drawn, and they are loaded when they first come into view.
+
+Copyright (C) 2020 BITJUNGLE Rune Mathisen
+This code is licensed under a GPLv3 license
+See http://www.gnu.org/licenses/gpl-3.0.html
+'''
+import os
+import re
+from collections import OrderedDict
+
+import pygame
+
+import pygame_template_objects as objects
+
+TILE_FILE = '{:d}_{:d}.png' # column, row
+
+def split_image(path, directory, tile_size=256):
+    '''Cut an image file into tile files for GameTileLayer
+
+    Tiles that are completely transparent are not written. Returns the
+    number of columns and rows.
+
+    Args:
+        path (str): Image path/filename
+        directory (str): Where to write the tiles, created if missing
+        tile_size (int): Tile width and height (optional, default is 256)
+    '''
+    image = pygame.image.load(path)
+    columns = -(-image.get_width() // tile_size)
+    rows = -(-image.get_height() // tile_size)
+    os.makedirs(directory, exist_ok=True)
+    for col in range(columns):
+        for row in range(rows):
+            area = pygame.Rect(col * tile_size, row * tile_size,
+                               tile_size, tile_size).clip(image.get_rect())
+            tile = image.subsurface(area)
+            if tile.get_bounding_rect().width:
+                pygame.image.save(tile, os.path.join(directory,
+                                                     TILE_FILE.format(col, row)))
+    return columns, rows
+
+# ----------------------------------------------------------------------
+class GameTileLayer():
+    '''A background made of tiles, drawn through a GameCamera
+
+    The tiles come from one of three sources: a directory of tile files
+    made by split_image(), an image cut into tiles in memory, or a
+    function returning the tile at a column and row. Tiles are loaded
+    the first time they are in view, converted to the display format,
+    and kept in an LRU cache of max_tiles tiles. The least recently
+    drawn tiles are dropped from memory and loaded again when they come
+    back into view, so a world of tile files can be larger than memory.
+
+        layer = GameTileLayer(directory='world_tiles')
+        camera = objects.GameCamera()
+        ...
+        camera.rect.move_ip(dx, dy) # scroll
+        layer.draw(screen, camera)
+
+    Args:
+        directory (str): Directory of tile files (optional)
+        image (str or Surface): Image to cut into tiles (optional)
+        load (function): Called with column and row, returns a Surface or
+                         None for no tile (optional)
+        tile_size (int): Tile width and height (optional, default is 256)
+        columns, rows (int): Size in tiles (optional, found from the
+                             directory or image, else no limit)
+        top (int): Top of the layer in the world (optional, default is 0)
+        left (int): Left of the layer in the world (optional, default is 0)
+        fill (pygame.Color): Flatten transparent tiles onto this color,
+                             opaque tiles are faster to blit (optional)
+        repeat (bool): Repeat the tiles in every direction (optional,
+                       default is False)
+        max_tiles (int): Tiles kept in memory, more than fit in the view
+                         (optional, default is 64)
+
+    Attributes:
+        columns, rows (int): Size in tiles, None if unknown
+        loads (int): Number of tiles loaded
+        evictions (int): Number of tiles dropped from memory
+    '''
+    def __init__(self, **kwargs):
+        self.tile_size = kwargs.get('tile_size', 256)
+        self.top = kwargs.get('top', 0)
+        self.left = kwargs.get('left', 0)
+        self.fill = kwargs.get('fill', None)
+        self.repeat = kwargs.get('repeat', False)
+        self.max_tiles = kwargs.get('max_tiles', 64)
+        self.columns = kwargs.get('columns', None)
+        self.rows = kwargs.get('rows', None)
+        self.loads = 0
+        self.evictions = 0
+        self._tiles = OrderedDict() # (column, row) -> Surface or None
+
+        if 'directory' in kwargs:
+            self._directory = kwargs['directory']
+            self._load = self._load_file
+            if self.columns is None or self.rows is None:
+                self._find_size()
+        elif 'image' in kwargs:
+            image = kwargs['image']
+            if not isinstance(image, pygame.Surface):
+                image = pygame.image.load(image)
+            self._image = image
+            self._load = self._load_part
+            self.columns = -(-image.get_width() // self.tile_size)
+            self.rows = -(-image.get_height() // self.tile_size)
+        else:
+            self._load = kwargs['load']
+
+    def __len__(self):
+        '''Returns the number of tiles in memory'''
+        return len(self._tiles)
+
+    def tile(self, col, row):
+        '''Returns the tile Surface at a column and row, None if empty'''
+        if self.repeat and self.columns and self.rows:
+            col, row = col % self.columns, row % self.rows
+        key = (col, row)
+        tiles = self._tiles
+        if key in tiles:
+            tiles.move_to_end(key)
+            return tiles[key]
+        tile = self._prepare(self._load(col, row))
+        self.loads += 1
+        tiles[key] = tile
+        while len(tiles) > self.max_tiles:
+            tiles.popitem(last=False)
+            self.evictions += 1
+        return tile
+
+    def draw(self, surface, camera=None):
+        '''Draw the tiles in view, returns the number of tiles drawn
+
+        Args:
+            surface (Surface): Surface to draw on, usually the screen
+            camera (GameCamera): The view (optional, default is the world
+                                 area at the top left of surface)
+        '''
+        view = camera.rect if camera else surface.get_rect()
+        size = self.tile_size
+        left, top = view.left - self.left, view.top - self.top
+        col_min, col_max = left // size, (left + view.width - 1) // size
+        row_min, row_max = top // size, (top + view.height - 1) // size
+        if not self.repeat:
+            if self.columns is not None:
+                col_min, col_max = max(col_min, 0), min(col_max, self.columns - 1)
+            if self.rows is not None:
+                row_min, row_max = max(row_min, 0), min(row_max, self.rows - 1)
+
+        blits = []
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                tile = self.tile(col, row)
+                if tile is not None:
+                    blits.append((tile, (col * size - left, row * size - top)))
+        surface.blits(blits, doreturn=False)
+        return len(blits)
+
+    def clear(self):
+        '''Drop all tiles from memory'''
+        self._tiles.clear()
+
+    def _prepare(self, tile):
+        '''Returns a loaded tile ready to blit, None if it is empty'''
+        if tile is None:
+            return None
+        if tile.get_flags() & pygame.SRCALPHA:
+            if not tile.get_bounding_rect().width:
+                return None # fully transparent
+            if self.fill is not None:
+                flat = pygame.Surface(tile.get_size())
+                flat.fill(self.fill)
+                flat.blit(tile, (0, 0))
+                tile = flat
+        return objects.display_format(tile)
+
+    def _load_file(self, col, row):
+        path = os.path.join(self._directory, TILE_FILE.format(col, row))
+        if not os.path.exists(path):
+            return None
+        return pygame.image.load(path)
+
+    def _load_part(self, col, row):
+        if not (0 <= col < self.columns and 0 <= row < self.rows):
+            return None
+        size = self.tile_size
+        area = pygame.Rect(col * size, row * size, size, size)
+        return self._image.subsurface(area.clip(self._image.get_rect())).copy()
+
+    def _find_size(self):
+        '''Set columns and rows from the names of the tile files'''
+        pattern = re.compile(r'^(\d+)_(\d+)\.png$')
+        found = [pattern.match(name) for name in os.listdir(self._directory)]
+        found = [m for m in found if m]
+        if found:
+            self.columns = 1 + max(int(m.group(1)) for m in found)
+            self.rows = 1 + max(int(m.group(2)) for m in found)
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,30 @@
+''' Shared setup for the pygame template tests
+
+The tests run headless with SDL's dummy video and audio drivers, from any
+working directory.
+'''
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+import pytest
+
+@pytest.fixture
+def screen():
+    '''A display Surface, the display is closed after the test'''
+    pygame.display.init()
+    surface = pygame.display.set_mode((800, 600))
+    yield surface
+    pygame.display.quit()
+
+@pytest.fixture
+def in_root(monkeypatch):
+    '''Run the test in the repository root, where the image files are'''
+    monkeypatch.chdir(ROOT)
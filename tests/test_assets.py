@@ -0,0 +1,49 @@
+''' GameAssetLoader placeholders and the shared image cache '''
+import pygame
+import pytest
+
+import pygame_template_objects as objects
+import pygame_template_assets as assets
+
+@pytest.fixture
+def loader(screen, in_root):
+    objects.image_cache.clear()
+    loader = assets.GameAssetLoader(placeholder=(255, 0, 0, 255))
+    yield loader
+    loader.close()
+    objects.image_cache.clear()
+
+def test_placeholders_stay_out_of_the_image_cache(loader):
+    small = loader.image_object(imagefile='snake.png', width=10, height=12,
+                                top=5, left=6)
+    large = loader.image_object(imagefile='snake.png', width=40, height=30)
+    # Each object has a placeholder of its own size, the cache has nothing
+    assert small.image.get_size() == (10, 12)
+    assert large.image.get_size() == (40, 30)
+    assert small.rect.topleft == (6, 5)
+    assert 'snake.png' not in objects.image_cache
+
+    loader.wait()
+    original = pygame.image.load('snake.png')
+    assert objects.image_cache.load('snake.png').get_size() == original.get_size()
+    assert small.image is objects.image_cache.scaled('snake.png', (10, 12))
+    assert small.rect.topleft == (6, 5)
+    assert large.image.get_size() == (40, 30)
+    assert objects.GameImage(imagefile='snake.png').image.get_size() == \
+        original.get_size()
+
+def test_failed_load_leaves_no_cache_entry(loader):
+    obj = loader.image_object(imagefile='no-such-file.png', width=8, height=8)
+    handle = loader.image('no-such-file.png')
+    loader.wait()
+    assert handle.error is not None and not handle.ready
+    assert 'no-such-file.png' not in objects.image_cache
+    assert obj.image.get_size() == (8, 8) # keeps showing the placeholder
+    with pytest.raises((FileNotFoundError, pygame.error)):
+        objects.GameImage(imagefile='no-such-file.png')
+
+def test_ready_image_makes_a_plain_object(loader):
+    loader.image('snake.png')
+    loader.wait()
+    obj = loader.image_object(imagefile='snake.png', scale=0.5)
+    assert obj.image is objects.image_cache.variant('snake.png', obj._size)
@@ -0,0 +1,18 @@
+''' GameCamera tests '''
+import pygame
+
+import pygame_template_objects as objects
+
+class Recorder(objects.GameRectangle):
+    def update(self, *args, **kwargs):
+        self.called = (args, kwargs)
+
+def test_update_passes_arguments_and_margin():
+    camera = objects.GameCamera(width=100, height=100)
+    near = Recorder(width=10, height=10, top=120, left=50)
+    far = Recorder(width=10, height=10, top=500, left=500)
+    group = pygame.sprite.Group(near, far)
+    assert camera.update(group, 0.5, margin=30, dt=2) == [near]
+    assert near.called == ((0.5,), {'dt': 2})
+    assert not hasattr(far, 'called')
+    assert camera.update(group, 0.5) == []
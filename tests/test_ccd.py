@@ -0,0 +1,111 @@
+''' Swept collision tests against analytic and sampled cases '''
+import math
+import random
+
+import pygame
+import pytest
+
+import pygame_template_objects as objects
+import pygame_template_ccd as ccd
+
+def test_circle_toi_moving_into_still_circle():
+    t, normal = ccd.circle_toi((0, 0), (10, 0), 1, (5, 0), (0, 0), 1)
+    assert t == pytest.approx(0.3) # gap 3 closed at 10 per step
+    assert normal == pytest.approx((-1, 0))
+
+def test_circle_toi_head_on():
+    t, normal = ccd.circle_toi((0, 0), (10, 0), 1, (10, 0), (-10, 0), 1)
+    assert t == pytest.approx(0.4) # gap 8 closed at 20 per step
+    assert normal == pytest.approx((-1, 0))
+
+@pytest.mark.parametrize('p, v, q, u', [
+    ((0, 0), (10, 0), (5, 3), (0, 0)),      # passes by
+    ((0, 0), (-10, 0), (5, 0), (0, 0)),     # moving apart
+    ((0, 0), (2, 0), (10, 0), (0, 0)),      # too slow to reach
+    ((0, 0), (5, 5), (3, 0), (5, 5)),       # moving together
+])
+def test_circle_toi_misses(p, v, q, u):
+    assert ccd.circle_toi(p, v, 1, q, u, 1) is None
+
+def test_circle_toi_overlapping_is_zero():
+    assert ccd.circle_toi((0, 0), (0, 0), 2, (3, 0), (0, 0), 2)[0] == 0.0
+
+def test_circle_toi_matches_sampling():
+    rng = random.Random(21)
+    for k in range(200):
+        p = (rng.uniform(-50, 50), rng.uniform(-50, 50))
+        q = (rng.uniform(-50, 50), rng.uniform(-50, 50))
+        v = (rng.uniform(-80, 80), rng.uniform(-80, 80))
+        u = (rng.uniform(-80, 80), rng.uniform(-80, 80))
+        r, s = rng.uniform(1, 10), rng.uniform(1, 10)
+        first = None
+        for step in range(2001):
+            t = step / 2000
+            if math.hypot(p[0] + v[0]*t - q[0] - u[0]*t,
+                          p[1] + v[1]*t - q[1] - u[1]*t) <= r + s:
+                first = t
+                break
+        hit = ccd.circle_toi(p, v, r, q, u, s)
+        if first is None:
+            assert hit is None or hit[0] > 0.999
+        else:
+            assert hit is not None
+            assert hit[0] == pytest.approx(first, abs=1e-3)
+
+def test_rect_toi_horizontal_and_vertical():
+    rect = pygame.Rect(0, 0, 10, 10)
+    t, normal = ccd.rect_toi(rect, (20, 0), pygame.Rect(25, 0, 10, 10), (0, 0))
+    assert t == pytest.approx(0.75) and normal == (-1.0, 0.0)
+    t, normal = ccd.rect_toi(rect, (0, 0), pygame.Rect(0, 30, 10, 10), (0, -40))
+    assert t == pytest.approx(0.5) and normal == (0.0, -1.0)
+
+def test_rect_toi_misses_and_overlap():
+    rect = pygame.Rect(0, 0, 10, 10)
+    assert ccd.rect_toi(rect, (20, 0), pygame.Rect(25, 20, 10, 10), (0, 0)) is None
+    assert ccd.rect_toi(rect, (10, 0), pygame.Rect(25, 0, 10, 10), (0, 0)) is None
+    t, normal = ccd.rect_toi(rect, (0, 0), pygame.Rect(8, 2, 10, 10), (0, 0))
+    assert t == 0.0 and normal == (-1.0, 0.0)
+
+def test_segment_toi_side_and_end():
+    t, normal = ccd.segment_toi((0, 0), (0, 10), 1, (-5, 5), (5, 5))
+    assert t == pytest.approx(0.4) and normal == pytest.approx((0, -1))
+    # Past the end of the segment the rounded end is hit
+    t, normal = ccd.segment_toi((8, 0), (-10, 0), 1, (0, -5), (0, 5))
+    assert t == pytest.approx(0.7) and normal == pytest.approx((1, 0))
+    t, normal = ccd.segment_toi((10, 0), (-10, 0), 1, (0, 0.5), (0, 10))
+    assert t == pytest.approx(1 - math.sqrt(0.75) / 10) # the end (0, 0.5)
+    assert ccd.segment_toi((0, 0), (10, 0), 1, (-5, 5), (5, 5)) is None
+
+def test_substeps():
+    assert ccd.substeps(objects.GameCircle(radius=5, dx=3, dy=4)) == 1
+    assert ccd.substeps(objects.GameCircle(radius=5, dx=25)) == 3
+    assert ccd.substeps(objects.GameRectangle(width=4, height=20, dy=-9)) == 3
+
+def test_substeps_scheduled_per_object():
+    fast = objects.GameCircle(radius=5, left=0, top=0, dx=50)
+    slow = objects.GameCircle(radius=5, left=0, top=100, dx=3)
+    group = pygame.sprite.Group(fast, slow)
+    stepper = ccd.GameSubstepper(max_substeps=4)
+    stepper.step(group)
+    assert stepper.substeps == 4 # 5 needed, capped
+    assert fast.rect.centerx == 55 and slow.rect.centerx == 8
+    assert (fast._left_prev, slow._left_prev) == (0, 0)
+
+@pytest.mark.parametrize('circle', [False, True])
+def test_fast_head_on_does_not_tunnel(circle):
+    a = objects.GameCircle(radius=5, left=0, top=0, dx=100)
+    b = objects.GameCircle(radius=5, left=60, top=0, dx=-100)
+    stepper = ccd.GameSubstepper(circle=circle)
+    stepper.step(pygame.sprite.Group(a, b))
+    assert stepper.contacts
+    assert a.rect.centerx < b.rect.centerx
+    assert a.dx < 0 < b.dx
+
+def test_fast_ball_does_not_pass_thin_wall():
+    wall = objects.GameLine(start_pos=(0, 0), end_pos=(0, 200), line_width=2)
+    wall.rect.topleft = (100, 0)
+    ball = objects.GameCircle(radius=5, left=45, top=95, dx=200)
+    stepper = ccd.GameSubstepper(walls=[wall])
+    stepper.step(pygame.sprite.Group(ball))
+    assert ball.rect.centerx < 100
+    assert ball.dx == -200
@@ -0,0 +1,30 @@
+''' GamePalette tests '''
+import random
+
+import pytest
+
+import pygame_template_colors as colors
+
+def brute_force_nearest(palette, rgb):
+    distances = [sum((a - b)**2 for a, b in zip(c, rgb)) for c in palette]
+    return distances.index(min(distances)) # the first of equally close
+
+def test_nearest_matches_brute_force():
+    pytest.importorskip('numpy')
+    rng = random.Random(25)
+    for palette in (colors.palette,
+                    colors.GamePalette.gradient(['red', 'blue'], 7)):
+        for k in range(300):
+            rgb = tuple(rng.randint(0, 255) for i in range(3))
+            assert palette.nearest(rgb) == brute_force_nearest(palette, rgb)
+    assert colors.palette.nearest('red') == colors.palette.index('red')
+
+def test_nearest_on_empty_palette():
+    with pytest.raises(ValueError):
+        colors.GamePalette([]).nearest('red')
+
+def test_gradient_steps():
+    assert list(colors.GamePalette.gradient(['red', 'blue'], 1)) == [(255, 0, 0)]
+    assert len(colors.GamePalette.gradient(['red', 'blue'], 0)) == 0
+    three = colors.GamePalette.gradient([(0, 0, 0), (100, 50, 200)], 3)
+    assert list(three) == [(0, 0, 0), (50, 25, 100), (100, 50, 200)]
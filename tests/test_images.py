@@ -0,0 +1,40 @@
+''' GameImage and GameImageCache tests '''
+import pygame
+
+import pygame_template_objects as objects
+
+def test_scale_without_cache_uses_original(screen, in_root):
+    original = pygame.image.load('snake.png')
+    obj = objects.GameImage(imagefile='snake.png', cache=False)
+    obj.scale(4, 4)
+    obj.scale(*original.get_size())
+    # Scaled back from the original, not from the 4x4 image
+    assert obj.image.get_size() == original.get_size()
+    assert (pygame.image.tostring(obj.image.convert_alpha(), 'RGBA') ==
+            pygame.image.tostring(original.convert_alpha(), 'RGBA'))
+
+def test_scaled_hit_converts_image_loaded_before_set_mode(in_root):
+    cache = objects.GameImageCache()
+    pygame.display.init()
+    try:
+        raw = cache.scaled('snake.png', (10, 10)) # no display yet
+        assert 'snake.png' in cache._raw
+        screen = pygame.display.set_mode((100, 100))
+        image = cache.scaled('snake.png', (10, 10))
+        assert image is not raw
+        assert 'snake.png' not in cache._raw
+        assert cache.load('snake.png').get_bitsize() == screen.get_bitsize()
+        assert cache.scaled('snake.png', (10, 10)) is image
+    finally:
+        pygame.display.quit()
+
+def test_rewind_after_rotate_keeps_center(screen, in_root):
+    obj = objects.GameImage(imagefile='snake.png', scale=0.5, top=100,
+                            left=100, dx=3, dy=4)
+    start = obj.rect.center
+    obj.update()
+    obj.rotate(0.7) # a bigger image, centered where the object is
+    assert obj.image.get_size() != obj._size
+    obj.rewind()
+    assert obj.rect.center == start
+    assert obj.interpolate(0.0).center == start
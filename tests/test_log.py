@@ -0,0 +1,30 @@
+''' Template log setup tests '''
+import io
+import logging
+
+import pytest
+
+import pygame_template_log as templatelog
+
+@pytest.fixture
+def stream():
+    '''Log to a string, the writer is stopped after the test'''
+    templatelog.shutdown()
+    logger = logging.getLogger(templatelog.ROOT)
+    handlers = list(logger.handlers)
+    out = io.StringIO()
+    yield out
+    templatelog.shutdown()
+    logger.handlers = handlers
+    logger.setLevel(logging.NOTSET)
+
+def test_level_from_environment(monkeypatch, stream):
+    monkeypatch.setenv('PYGAME_TEMPLATE_LOG', 'debug')
+    assert templatelog.setup(stream=stream).level == logging.DEBUG
+
+def test_unknown_level_falls_back_to_warning(monkeypatch, stream):
+    monkeypatch.setenv('PYGAME_TEMPLATE_LOG', 'verbose')
+    logger = templatelog.setup(stream=stream)
+    assert logger.level == logging.WARNING
+    templatelog.shutdown() # writes the queued records
+    assert "Unknown log level 'verbose'" in stream.getvalue()
@@ -0,0 +1,36 @@
+''' PhysicsWorld broadphase against brute force '''
+import random
+
+import numpy as np
+import pytest
+
+import pygame_template_objects as objects
+import pygame_template_physics as physics
+
+def brute_force_pairs(world):
+    x, y, r = world.x, world.y, world.r
+    return {(i, j) for i in range(len(world)) for j in range(i + 1, len(world))
+            if (x[i] - x[j])**2 + (y[i] - y[j])**2 < (r[i] + r[j])**2}
+
+@pytest.mark.parametrize('cell_size', [None, 1, 8, 40, 500])
+def test_find_pairs_matches_brute_force(cell_size):
+    rng = random.Random(7)
+    world = physics.PhysicsWorld(width=800, height=600, cell_size=cell_size)
+    for k in range(300):
+        world.add(objects.GameCircle(radius=rng.randint(2, 30),
+                                     top=rng.randint(0, 560),
+                                     left=rng.randint(0, 760)))
+    i, j = world.find_pairs()
+    found = {(min(a, b), max(a, b)) for a, b in zip(i.tolist(), j.tolist())}
+    assert found == brute_force_pairs(world)
+    assert len(found) == len(i) # every pair once
+
+def test_small_cell_size_still_bounces():
+    world = physics.PhysicsWorld(cell_size=4)
+    a = objects.GameCircle(radius=20, top=0, left=0, dx=5)
+    b = objects.GameCircle(radius=20, top=0, left=30, dx=-5)
+    world.add(a)
+    world.add(b)
+    i, j = world.step()
+    assert len(i) == 1
+    assert world.vx[0] < 0 < world.vx[1]
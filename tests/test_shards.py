@@ -0,0 +1,98 @@
+''' ShardedWorld against the same steps in one process '''
+import random
+
+import pytest
+
+import pygame_template_objects as objects
+
+shards = pytest.importorskip('pygame_template_shards')
+
+WIDTH, HEIGHT = 600, 400
+
+def make_objects(count, seed):
+    '''Returns a few spread out rectangles and circles'''
+    rng = random.Random(seed)
+    made = []
+    for k in range(count):
+        kwargs = {'top': rng.randint(0, HEIGHT - 20),
+                  'left': rng.randint(0, WIDTH - 20),
+                  'dx': rng.randint(-6, 6), 'dy': rng.randint(-6, 6)}
+        if k % 2:
+            made.append(objects.GameCircle(radius=rng.randint(3, 8), **kwargs))
+        else:
+            made.append(objects.GameRectangle(width=rng.randint(4, 16),
+                                              height=rng.randint(4, 16),
+                                              **kwargs))
+    return made
+
+def reference_steps(items, steps, circle):
+    '''The steps of a worker, for all bodies in one group'''
+    group = objects.GameSpatialGroup(*items)
+    for step in range(steps):
+        for body in group:
+            body.update()
+            if body.collide_horiz_window_edge(HEIGHT):
+                body.dy *= -1
+            if body.collide_vert_window_edge(WIDTH):
+                body.dx *= -1
+        group.resolve_contacts(circle=circle)
+    return [(o.rect.topleft, o.dx, o.dy) for o in items]
+
+@pytest.mark.parametrize('circle', [False, True])
+def test_regions_match_one_process(circle):
+    # Few bodies, so no chain of contacts reaches past the halo
+    expected = reference_steps(make_objects(20, seed=5), 60, circle)
+    items = make_objects(20, seed=5)
+    with shards.ShardedWorld(width=WIDTH, height=HEIGHT, regions=(3, 2),
+                             processes=1, capacity=64, circle=circle) as world:
+        for obj in items:
+            world.add(obj)
+        for step in range(60):
+            world.step()
+        world.sync()
+    assert [(o.rect.topleft, o.dx, o.dy) for o in items] == expected
+
+def test_body_handed_over_to_next_region():
+    ball = objects.GameCircle(radius=5, top=100, left=80, dx=10)
+    with shards.ShardedWorld(width=WIDTH, height=HEIGHT, regions=(3, 1),
+                             processes=1, capacity=8) as world:
+        slot = world.add(ball)
+        regions = []
+        for step in range(35):
+            world.step()
+            regions.append(int(world.state[shards._F['region'], slot]))
+        world.sync()
+    # Crosses the borders at x 200 and 400 without stopping or jumping
+    assert ball.rect.left == 430
+    assert regions[0] == 0 and regions[-1] == 2
+    assert regions == sorted(regions)
+
+def test_circle_collisions_of_bodies_without_radius():
+    a = objects.GameRectangle(width=20, height=20, top=100, left=100, dx=5)
+    b = objects.GameRectangle(width=20, height=20, top=100, left=135, dx=-5)
+    with shards.ShardedWorld(width=WIDTH, height=HEIGHT, regions=(2, 2),
+                             processes=1, capacity=8, circle=True) as world:
+        world.add(a)
+        world.add(b)
+        assert world.state[shards._F['radius'], 0] == pytest.approx(14.142, abs=1e-3)
+        contacts = 0
+        for step in range(4):
+            world.step()
+            contacts += world.contacts
+        world.sync()
+    assert contacts == 1
+    assert a.dx < 0 < b.dx
+
+def test_failed_pool_frees_shared_memory(monkeypatch):
+    created = []
+    original = shards.shared_memory.SharedMemory
+
+    def record(*args, **kwargs):
+        created.append(original(*args, **kwargs))
+        return created[-1]
+    monkeypatch.setattr(shards.shared_memory, 'SharedMemory', record)
+    with pytest.raises(ValueError):
+        shards.ShardedWorld(width=WIDTH, height=HEIGHT, processes=0,
+                            capacity=8)
+    with pytest.raises(FileNotFoundError):
+        original(name=created[0].name) # unlinked
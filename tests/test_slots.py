@@ -0,0 +1,52 @@
+''' Slotted game objects behave like the GameObject classes '''
+import random
+
+import pygame
+import pytest
+
+import pygame_template_objects as objects
+import pygame_template_physics as physics
+
+PAIRS = [(objects.GameRectangle, objects.GameSlotRectangle, {}),
+         (objects.GameEllipse, objects.GameSlotEllipse, {}),
+         (objects.GameCircle, objects.GameSlotCircle, {'radius': 12})]
+
+def make_slotted(count, seed):
+    rng = random.Random(seed)
+    return [objects.GameSlotRectangle(width=rng.randint(4, 60),
+                                      height=rng.randint(4, 60),
+                                      top=rng.randint(0, 400),
+                                      left=rng.randint(0, 400))
+            for k in range(count)]
+
+@pytest.mark.parametrize('plain, slotted, kwargs', PAIRS)
+def test_same_fields_as_game_object(plain, slotted, kwargs):
+    kwargs = dict(kwargs, width=20, height=10, top=5, left=7, dx=2, dy=-3,
+                  mass=2.5)
+    a, b = plain(**kwargs), slotted(**kwargs)
+    for name in ('rect', 'dx', 'dy', 'm', 'dirty', '_top_prev', '_left_prev'):
+        assert getattr(a, name) == getattr(b, name), name
+    assert a.image.get_size() == b.image.get_size()
+    assert not hasattr(b, '__dict__')
+
+@pytest.mark.parametrize('kwargs', [{'circle': True},
+                                    {'circle': True, 'ratio': 0.8}])
+def test_circle_collisions(kwargs):
+    items = make_slotted(80, seed=1)
+    group = objects.GameSpatialGroup(*items[1:], cell_size=32)
+    plain = pygame.sprite.Group(*items[1:])
+    collided = objects._collided(*objects._collide_args(kwargs))
+    assert (items[0].collide(group, **kwargs) ==
+            pygame.sprite.spritecollide(items[0], plain, False, collided))
+    assert group.find_contacts(**kwargs)
+
+def test_physics_world_add_and_remove():
+    items = make_slotted(10, seed=2)
+    world = physics.PhysicsWorld(width=800, height=600)
+    for obj in items:
+        world.add(obj)
+    world.step()
+    world.remove(items[3])
+    assert len(world) == 9
+    assert all(world.sprites[k]._body == k for k in range(len(world)))
+    world.sync()
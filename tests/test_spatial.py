@@ -0,0 +1,89 @@
+''' GameSpatialGroup against brute force pygame collision tests '''
+import random
+
+import pygame
+import pytest
+
+import pygame_template_objects as objects
+
+def make_objects(count, seed, size=(800, 600)):
+    '''Returns circles and rectangles of mixed sizes, many overlapping'''
+    rng = random.Random(seed)
+    made = []
+    for k in range(count):
+        top, left = rng.randint(0, size[1]), rng.randint(0, size[0])
+        dx, dy = rng.randint(-8, 8), rng.randint(-8, 8)
+        if k % 2:
+            made.append(objects.GameCircle(radius=rng.randint(2, 40),
+                                           top=top, left=left, dx=dx, dy=dy))
+        else:
+            made.append(objects.GameRectangle(width=rng.randint(2, 90),
+                                              height=rng.randint(2, 90),
+                                              top=top, left=left,
+                                              dx=dx, dy=dy))
+    return made
+
+def brute_force_contacts(items, collided):
+    return {(a, b) for k, a in enumerate(items) for b in items[k + 1:]
+            if collided(a, b)}
+
+COLLIDE_ARGS = [{}, {'circle': True}, {'ratio': 1.5},
+                {'ratio': 0.5, 'circle': True}]
+
+@pytest.mark.parametrize('kwargs', COLLIDE_ARGS)
+@pytest.mark.parametrize('cell_size', [16, 64, 256])
+def test_collide_matches_spritecollide(kwargs, cell_size):
+    items = make_objects(150, seed=cell_size)
+    spatial = objects.GameSpatialGroup(*items[1:], cell_size=cell_size)
+    plain = pygame.sprite.Group(*items[1:])
+    collided = objects._collided(*objects._collide_args(kwargs))
+    for obj in items:
+        expected = pygame.sprite.spritecollide(obj, plain, False, collided)
+        # Same sprites in the same order, the group order
+        assert obj.collide(spatial, **kwargs) == expected
+
+@pytest.mark.parametrize('kwargs', COLLIDE_ARGS)
+def test_find_contacts_matches_brute_force(kwargs):
+    items = make_objects(200, seed=2)
+    group = objects.GameSpatialGroup(*items, cell_size=32)
+    collided = objects._collided(*objects._collide_args(kwargs))
+    contacts = group.find_contacts(**kwargs)
+    assert len(contacts) == len(set(contacts)) # every pair once
+    assert set(contacts) == brute_force_contacts(group.sprites(), collided)
+    assert group.tested < len(items) * (len(items) - 1) // 2
+
+def test_grid_follows_moving_objects():
+    items = make_objects(120, seed=3)
+    group = objects.GameSpatialGroup(*items, cell_size=48)
+    for step in range(30):
+        group.update() # moves every object, the grid must keep up
+        for obj in group:
+            if obj.collide_horiz_window_edge(600):
+                obj.dy *= -1
+            if obj.collide_vert_window_edge(800):
+                obj.dx *= -1
+        if step % 10 == 9:
+            group.resolve_contacts() # rewinds objects
+        collided = objects._collided(1.0, False)
+        assert (set(group.find_contacts()) ==
+                brute_force_contacts(group.sprites(), collided))
+
+def test_query_and_colliding_after_remove():
+    items = make_objects(60, seed=4)
+    group = objects.GameSpatialGroup(*items, cell_size=40)
+    for obj in items[::3]:
+        group.remove(obj)
+    area = pygame.Rect(200, 150, 300, 200)
+    members = group.sprites()
+    assert group.colliding(area) == [s for s in members
+                                     if area.colliderect(s.rect)]
+    assert not set(group.query(area)) - set(members)
+
+def test_collide_dokill_removes_hits():
+    items = make_objects(80, seed=5)
+    group = objects.GameSpatialGroup(*items[1:], cell_size=32)
+    probe = objects.GameRectangle(width=300, height=300, top=100, left=100)
+    hits = probe.collide(group, dokill=True)
+    assert hits
+    assert not any(s.alive() for s in hits)
+    assert not probe.collide(group)
@@ -0,0 +1,71 @@
+''' GameSweepGroup against brute force pygame collision tests '''
+import random
+
+import pygame
+import pytest
+
+import pygame_template_objects as objects
+
+def make_objects(count, seed):
+    '''Returns moving circles and rectangles, many overlapping'''
+    rng = random.Random(seed)
+    made = []
+    for k in range(count):
+        kwargs = {'top': rng.randint(0, 600), 'left': rng.randint(0, 800),
+                  'dx': rng.randint(-12, 12), 'dy': rng.randint(-12, 12)}
+        if k % 3:
+            made.append(objects.GameCircle(radius=rng.randint(2, 30), **kwargs))
+        else:
+            made.append(objects.GameRectangle(width=rng.randint(2, 80),
+                                              height=rng.randint(2, 80),
+                                              **kwargs))
+    return made
+
+def brute_force_contacts(items, collided):
+    return {frozenset((a, b)) for k, a in enumerate(items)
+            for b in items[k + 1:] if collided(a, b)}
+
+@pytest.mark.parametrize('kwargs', [{}, {'circle': True}, {'ratio': 1.4},
+                                    {'ratio': 0.6, 'circle': True}])
+def test_contacts_match_brute_force_while_moving(kwargs):
+    items = make_objects(150, seed=11)
+    group = objects.GameSweepGroup(*items)
+    collided = objects._collided(*objects._collide_args(kwargs))
+    for step in range(25):
+        contacts = group.find_contacts(**kwargs)
+        found = [frozenset(pair) for pair in contacts]
+        assert len(found) == len(set(found)) # every pair once
+        assert set(found) == brute_force_contacts(items, collided)
+        group.update() # the order along x changes a little every step
+        for obj in group:
+            if obj.collide_horiz_window_edge(600):
+                obj.dy *= -1
+            if obj.collide_vert_window_edge(800):
+                obj.dx *= -1
+
+def test_sorted_by_left_edge_after_sweep():
+    items = make_objects(100, seed=12)
+    group = objects.GameSweepGroup(*items)
+    for step in range(10):
+        group.find_contacts()
+        lefts = [s.rect.centerx - s.rect.width / 2 for s in group._sorted]
+        assert lefts == sorted(lefts)
+        group.update()
+
+def test_add_and_remove_between_sweeps():
+    items = make_objects(120, seed=13)
+    group = objects.GameSweepGroup(*items[:60])
+    collided = objects._collided(1.0, False)
+    group.find_contacts()
+    group.add(*items[60:])
+    group.remove(*items[:20])
+    members = group.sprites()
+    assert sorted(group._sorted, key=id) == sorted(members, key=id)
+    assert ({frozenset(p) for p in group.find_contacts()} ==
+            brute_force_contacts(members, collided))
+
+def test_tests_fewer_pairs_than_all():
+    items = make_objects(200, seed=14)
+    group = objects.GameSweepGroup(*items)
+    group.find_contacts()
+    assert group.tested < len(items) * (len(items) - 1) // 2